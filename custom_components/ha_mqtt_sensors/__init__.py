@@ -1,23 +1,138 @@
 from __future__ import annotations
+from collections import deque
 from datetime import datetime, timedelta
+import heapq
+import itertools
 import logging
+import threading
+from time import perf_counter_ns
+from typing import Callable
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components import mqtt
-from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers import entity_registry as er, restore_state
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
 from .const import (
     DOMAIN,
     PLATFORMS,
     CONF_SENSOR_ID,
+    CONF_NAME,
     CONF_PREFIX,
     DEFAULT_PREFIX,
+    CONF_DEVICE_TYPE,
+    DEFAULT_DEVICE_TYPE,
+    CONF_SENSOR_SOURCE,
+    CONF_ENTRY_TYPE,
+    ENTRY_TYPE_RECEIVER,
+    CONF_SENSORS,
     SIG_UPDATE,
     SUFFIX_AVAILABILITY,
+    SUFFIX_PACKET,
+    SUFFIX_STATS,
+    SUFFIX_OPTIONS,
+    HOT_OPTIONS,
+    STATS_PUSH_SECONDS,
+    TOPIC_TIME,
+    TOPIC_EVENT,
+    TOPIC_CHANNEL,
+    TOPIC_HEARTBEAT,
+    TOPIC_RSSI,
+    TOPIC_STATE,
+    TOPIC_MIC,
+    TOPIC_ID,
+    TOPIC_TAMPER,
+    TOPIC_ALARM,
+    RESTORE_SUFFIXES,
+    PACKET_QUIET_SECONDS,
+    SUBSCRIBE_RETRY_SECONDS,
     CONF_AVAIL_TICK,
     DEFAULT_AVAIL_TICK,
+    CONF_AVAIL_MINUTES,
+    DEFAULT_AVAIL_MINUTES,
+    CONF_INGEST_MODE,
+    DEFAULT_INGEST_MODE,
+    INGEST_MODE_EVENTS,
+    CONF_EVENTS_TOPIC,
+    DEFAULT_EVENTS_TOPIC,
+    EVENT_FIELDS,
+    CONF_DEDUP_WINDOW,
+    DEFAULT_DEDUP_WINDOW,
+    DEDUP_IGNORED_FIELDS,
+    CONF_DIRECT_DISPATCH,
+    DEFAULT_DIRECT_DISPATCH,
+    CONF_DISCOVERY,
+    DEFAULT_DISCOVERY,
+    CONF_FUSION_PREFIXES,
+    DEFAULT_FUSION_PREFIXES,
+    CONF_FUSION_WINDOW,
+    DEFAULT_FUSION_WINDOW,
+    CONF_CAPTURE,
+    DEFAULT_CAPTURE,
+    CONF_ENTITY_PROFILE,
+    DEFAULT_ENTITY_PROFILE,
+    PROFILE_DROPPED,
+    SUFFIX_DETAILS,
+    DETAIL_FIELDS,
+    INGEST_MODE_FIELDS,
+    DATA_ROUTERS,
+    DATA_SCHEDULER,
+)
+from .capture import CaptureWriter, async_get_capture
+from .discovery import DiscoveryTracker
+from .snapshot import SnapshotStore, async_get_snapshot
+from .models import SensorRecord
+from .stats import HubCounters, LinkStats
+from .util import split_prefixes
+
+_LOGGER = logging.getLogger(__name__)
+
+_AVAILABILITY_CHANGED = frozenset((SUFFIX_AVAILABILITY,))
+
+
+def _packet_key(packet: dict) -> frozenset:
+    """Packet content that identifies a transmission, ignoring per-reception fields."""
+    return frozenset(item for item in packet.items() if item[0] not in DEDUP_IGNORED_FIELDS)
+
+
+def _packet_rssi(packet: dict) -> float:
+    try:
+        return float(packet[TOPIC_RSSI])
+    except (KeyError, TypeError, ValueError):
+        return float("-inf")
+
+
+class _Burst:
+    """Fields buffered for the packet being received on one prefix."""
+    __slots__ = ("prefix", "fields", "rx", "handle")
+
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+        self.fields: dict[str, str] = {}
+        self.rx = 0.0  # loop time of the last buffered field
+        self.handle = None  # quiet-window timer
+
+# Value an entry without the option behaves as, for options that force a reload
+_RELOAD_DEFAULTS = {
+    CONF_DEVICE_TYPE: DEFAULT_DEVICE_TYPE,
+    CONF_INGEST_MODE: DEFAULT_INGEST_MODE,
+    CONF_EVENTS_TOPIC: DEFAULT_EVENTS_TOPIC,
+    CONF_DIRECT_DISPATCH: DEFAULT_DIRECT_DISPATCH,
+    CONF_DISCOVERY: DEFAULT_DISCOVERY,
+    CONF_FUSION_PREFIXES: DEFAULT_FUSION_PREFIXES,
+    CONF_CAPTURE: DEFAULT_CAPTURE,
+    CONF_ENTITY_PROFILE: DEFAULT_ENTITY_PROFILE,
+}
+
+# Numeric fields; ``None`` after a commit that carried one means it did not parse
+_NUMERIC_FIELDS = (TOPIC_CHANNEL, TOPIC_EVENT, TOPIC_HEARTBEAT, TOPIC_RSSI)
+
+# Sensor entities whose stored state is the field value itself
+_RESTORED_FIELDS = (
+    TOPIC_CHANNEL, TOPIC_HEARTBEAT, TOPIC_RSSI, TOPIC_STATE, TOPIC_MIC, TOPIC_ID, TOPIC_EVENT,
 )
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
@@ -25,7 +140,10 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
-    hub = MqttHub(hass, entry)
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_RECEIVER:
+        hub = ReceiverHub(hass, entry)
+    else:
+        hub = MqttHub(hass, entry)
     await hub.async_setup()
     hass.data[DOMAIN][entry.entry_id] = hub
     entry.async_on_unload(entry.add_update_listener(_update_listener))
@@ -37,81 +155,845 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unloaded and entry.entry_id in hass.data.get(DOMAIN, {}):
         await hass.data[DOMAIN][entry.entry_id].async_unload()
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        if not hass.data[DOMAIN] and DATA_SCHEDULER in hass.data:
+            hass.data.pop(DATA_SCHEDULER).async_shutdown()
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the saved snapshot of the entry's sensors."""
+    prefix = entry.options.get(CONF_PREFIX) or entry.data.get(CONF_PREFIX, DEFAULT_PREFIX)
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_RECEIVER:
+        sensor_ids = [sensor[CONF_SENSOR_ID] for sensor in entry.options.get(CONF_SENSORS, [])]
+    else:
+        sensor_ids = [entry.data[CONF_SENSOR_ID]]
+    snapshot = await async_get_snapshot(hass)
+    snapshot.async_remove(f"{prefix}_{sensor_id}" for sensor_id in sensor_ids)
+
+
 async def _update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle config entry updates by reloading entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Apply changed options in place; reload only when subscriptions or entities change."""
+    runtime = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if runtime is None or _needs_reload(entry, runtime.data, runtime.options):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    runtime.async_apply_options()
+
+
+def _needs_reload(entry: ConfigEntry, data: dict, options: dict) -> bool:
+    """Whether ``entry`` changed anything but ``HOT_OPTIONS`` since ``data``/``options``."""
+    if dict(entry.data) != data:
+        return True
+    defaults = {**_RELOAD_DEFAULTS, CONF_PREFIX: entry.data.get(CONF_PREFIX, DEFAULT_PREFIX)}
+    new = entry.options
+    if _sensor_layout(options) != _sensor_layout(new):
+        return True
+    return any(
+        options.get(key, defaults.get(key)) != new.get(key, defaults.get(key))
+        for key in options.keys() | new.keys()
+        if key not in HOT_OPTIONS and key != CONF_SENSORS
+    )
+
+
+def _sensor_layout(options: dict) -> list[dict]:
+    """A receiver's sensor list without the per-sensor settings applied in place."""
+    return [
+        {key: value for key, value in sensor.items() if key not in HOT_OPTIONS}
+        for sensor in options.get(CONF_SENSORS, [])
+    ]
+
+@callback
+def async_entry_hubs(hass: HomeAssistant, entry: ConfigEntry) -> list[MqttHub]:
+    """Return the sensor hubs set up for ``entry``."""
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    if isinstance(runtime, ReceiverHub):
+        return runtime.hubs
+    return [runtime]
+
+@callback
+def async_profile_entities(hass: HomeAssistant, hub: MqttHub, platform: str, entities: list) -> list:
+    """Return the ``entities`` the hub's profile keeps; registry entries of the others are removed."""
+    dropped = hub.dropped_entities
+    registry = er.async_get(hass)
+    kept = []
+    for entity in entities:
+        if entity.unique_id[len(hub.combined_id) + 1:] not in dropped:
+            kept.append(entity)
+            continue
+        # Left behind by a previous profile
+        entity_id = registry.async_get_entity_id(platform, DOMAIN, entity.unique_id)
+        if entity_id is not None:
+            registry.async_remove(entity_id)
+    return kept
+
+@callback
+def async_get_router(
+    hass: HomeAssistant, topic: str, router_cls: type[MqttRouter] | None = None
+) -> MqttRouter:
+    """Return the shared router for ``topic``, creating it on first use."""
+    routers = hass.data.setdefault(DATA_ROUTERS, {})
+    router = routers.get(topic)
+    if router is None:
+        router = routers[topic] = (router_cls or MqttRouter)(hass, topic)
+    return router
+
+class MqttRouter:
+    """Own one <prefix>/+/+ subscription and hand messages to hubs by sensor id."""
+    def __init__(self, hass: HomeAssistant, topic: str) -> None:
+        self.hass = hass
+        self.topic = topic
+        self._hubs: dict[str, MqttHub] = {}
+        self._unsub_mqtt = None
+        self._unsub_status = None
+        self._subscribed = False  # subscription made or in flight
+        self._retry_handle = None
+        self._discovery_hubs: set[MqttHub] = set()
+        self.discovery: DiscoveryTracker | None = None
+
+    @callback
+    def async_register(self, hub: MqttHub) -> None:
+        """Route messages for ``hub.sensor_id`` to ``hub``; subscribe on first use.
+
+        The subscription is made in a background task so config entry setup
+        never waits for the MQTT client.  Retained messages are delivered
+        once it completes; a failed attempt is retried while hubs remain.
+        """
+        if hub.sensor_id in self._hubs and self._hubs[hub.sensor_id] is not hub:
+            _LOGGER.warning(
+                "Sensor %s already registered on %s; replacing", hub.sensor_id, self.topic
+            )
+        self._hubs[hub.sensor_id] = hub
+        if hub.discovery:
+            self._discovery_hubs.add(hub)
+            if self.discovery is None:
+                self.discovery = DiscoveryTracker(self.hass, self.topic.rsplit("/", 2)[0])
+        self._async_start_subscribe()
+
+    @callback
+    def _async_start_subscribe(self) -> None:
+        self._retry_handle = None
+        if self._subscribed or not self._hubs:
+            return
+        self._subscribed = True
+        self.hass.async_create_background_task(
+            self._async_subscribe(), f"{DOMAIN} subscribe {self.topic}", eager_start=True
+        )
+
+    async def _async_subscribe(self) -> None:
+        unsub = None
+        try:
+            if not await mqtt.async_wait_for_mqtt_client(self.hass):
+                _LOGGER.warning(
+                    "MQTT is not available; retrying the subscription to %s in %s s",
+                    self.topic, SUBSCRIBE_RETRY_SECONDS,
+                )
+            else:
+                unsub = await mqtt.async_subscribe(
+                    self.hass, self.topic, self._cb, qos=0, encoding=None
+                )
+        except HomeAssistantError as err:
+            _LOGGER.warning(
+                "Subscribing to %s failed: %s; retrying in %s s",
+                self.topic, err, SUBSCRIBE_RETRY_SECONDS,
+            )
+        finally:
+            if unsub is None:
+                self._subscribed = False
+        if unsub is None:
+            if self._hubs:
+                self._retry_handle = self.hass.loop.call_later(
+                    SUBSCRIBE_RETRY_SECONDS, self._async_start_subscribe
+                )
+            return
+        if not self._subscribed:
+            # Every hub unregistered while the subscription was in flight
+            unsub()
+            return
+        self._unsub_mqtt = unsub
+        self._async_connection_changed(True)
+        self._unsub_status = mqtt.async_subscribe_connection_status(
+            self.hass, self._async_connection_changed
+        )
+
+    @callback
+    def _async_connection_changed(self, connected: bool) -> None:
+        """Expect retained copies of the last packets once MQTT (re)connects."""
+        if connected:
+            for hub in self._hubs.values():
+                hub._replay_expected = True
+
+    @callback
+    def async_unregister(self, hub: MqttHub) -> None:
+        """Stop routing to ``hub``; drop the subscription once no hub is left."""
+        if self._hubs.get(hub.sensor_id) is hub:
+            del self._hubs[hub.sensor_id]
+        self._discovery_hubs.discard(hub)
+        if not self._discovery_hubs:
+            self.discovery = None
+        if not self._hubs:
+            self._async_close()
+
+    @callback
+    def _async_close(self) -> None:
+        for unsub in (self._unsub_mqtt, self._unsub_status):
+            if unsub:
+                unsub()
+        self._unsub_mqtt = self._unsub_status = None
+        if self._retry_handle:
+            self._retry_handle.cancel()
+            self._retry_handle = None
+        self._subscribed = False
+        routers = self.hass.data.get(DATA_ROUTERS, {})
+        if routers.get(self.topic) is self:
+            routers.pop(self.topic)
+
+    @callback
+    def _cb(self, msg) -> None:
+        try:
+            _prefix, sensor_id, suffix = msg.topic.rsplit("/", 2)
+        except ValueError:
+            return
+        hub = self._hubs.get(sensor_id)
+        if hub is not None:
+            hub._cb(msg)
+        elif self.discovery is not None:
+            self.discovery.async_seen(sensor_id, suffix, msg.payload)
+
+class EventsRouter(MqttRouter):
+    """Own one rtl_433 events subscription; decode each JSON packet once and route by ``id``."""
+    @callback
+    def _cb(self, msg) -> None:
+        try:
+            doc = json_loads(msg.payload)
+        except ValueError:
+            _LOGGER.debug("Ignoring non-JSON payload on topic %s", msg.topic)
+            return
+        if not isinstance(doc, dict):
+            return
+        sensor_id = doc.get("id")
+        if sensor_id is None:
+            return
+        hub = self._hubs.get(str(sensor_id))
+        if hub is not None:
+            hub._event_cb(msg, doc)
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> AvailabilityScheduler:
+    """Return the integration-wide availability scheduler."""
+    scheduler = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = AvailabilityScheduler(hass)
+    return scheduler
+
+class AvailabilityScheduler:
+    """Flip hubs offline at their exact expiry using one timer for all hubs.
+
+    Deadlines live in a min-heap with at most one live entry per hub.  Packets
+    only move ``hub._expires`` forward; when an entry comes due for a hub that
+    has been heard since, it is pushed again at the new expiry instead of
+    firing, so wakeups follow real deadlines rather than the number of hubs.
+    """
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._heap: list[tuple[float, int, MqttHub]] = []
+        self._seq = itertools.count()
+        self._timer = None
+        self._timer_when: float | None = None
+
+    @callback
+    def async_schedule(self, hub: MqttHub) -> None:
+        """Make sure ``hub`` is checked no later than its current expiry."""
+        if self._push(hub) and (self._timer_when is None or hub._expires < self._timer_when):
+            self._arm(hub._expires)
+
+    @callback
+    def async_shutdown(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+        self._timer = None
+        self._timer_when = None
+        self._heap.clear()
+
+    def _push(self, hub: MqttHub) -> bool:
+        when = hub._expires
+        if when is None or (hub._heap_when is not None and hub._heap_when <= when):
+            return False
+        hub._heap_when = when
+        heapq.heappush(self._heap, (when, next(self._seq), hub))
+        return True
+
+    def _arm(self, when: float) -> None:
+        if self._timer:
+            self._timer.cancel()
+        self._timer_when = when
+        delay = max(0.0, when - dt_util.utcnow().timestamp())
+        self._timer = self.hass.loop.call_later(delay, self._fire)
+
+    @callback
+    def _fire(self) -> None:
+        self._timer = None
+        self._timer_when = None
+        now = dt_util.utcnow().timestamp()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            when, _seq, hub = heapq.heappop(heap)
+            if hub._heap_when != when:
+                continue  # superseded by an earlier entry for the same hub
+            hub._heap_when = None
+            if hub._expires is None:
+                continue  # hub unloaded
+            if hub._expires > now:
+                self._push(hub)
+            else:
+                hub._async_update_availability()
+        if heap:
+            self._arm(heap[0][0])
 
 class MqttHub:
-    """Subscribe to <prefix>/<id>/+ and cache latest values; track availability."""
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Receive <prefix>/<id>/+ via the shared router, cache latest values; track availability.
+
+    rtl_433 publishes every decoded field of a radio packet as its own message.
+    Fields are buffered until the burst is complete -- the next packet's
+    ``time`` field arrives or the topic stays quiet for ``PACKET_QUIET_SECONDS``
+    -- and then committed to the typed ``record`` together, followed by a single
+    ``SUFFIX_PACKET`` dispatch carrying the set of suffixes whose value
+    changed; entities backed only by unchanged fields are not written.  With
+    ``direct_dispatch`` the dispatcher is bypassed and listeners registered
+    through ``async_listen`` are called from a per-suffix map.
+    In ``events`` ingest mode each rtl_433 JSON document is already a whole
+    packet and is committed directly.  With ``capture`` every raw message is
+    also appended to the entry's capture file (see ``capture.py``).
+
+    Honeywell transmitters repeat every packet several times.  A packet whose
+    content (ignoring ``DEDUP_IGNORED_FIELDS``) matches the previously
+    accepted one within ``dedup_window_seconds`` only refreshes last-seen;
+    ``packets_accepted``/``packets_suppressed`` count both outcomes.
+
+    With ``fusion_prefixes`` the hub also listens for its sensor id under
+    further receiver prefixes.  Bursts are assembled per prefix; copies of the
+    same packet completed within ``fusion_window_ms`` are merged into one
+    commit that keeps the copy with the strongest RSSI.  ``receiver`` names
+    the prefix whose copy was kept and ``packets_fused`` counts the dropped
+    copies.  Any receiver hearing the sensor keeps it available.
+
+    Availability is edge-triggered: ``SUFFIX_AVAILABILITY`` is reported as
+    changed when the online/offline state flips, and otherwise at most once per
+    ``availability_tick_seconds`` to refresh the last-seen attribute.  Going
+    offline is detected by the shared ``AvailabilityScheduler``.
+
+    All processing runs on the event loop.  Messages delivered on the loop
+    thread (Home Assistant runs ``@callback`` MQTT handlers there) are handled
+    inline; messages from any other thread are queued and drained with a
+    single ``call_soon_threadsafe`` per burst.
+    """
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, sensor: dict | None = None
+    ) -> None:
         self.hass = hass
         self.entry = entry
-        self.sensor_id: str = entry.data[CONF_SENSOR_ID]
+        # What the hub was built from; see ``_update_listener``
+        self.data = dict(entry.data)
+        self.options = dict(entry.options)
+        self._sensor = sensor
+        if sensor is None:
+            self.sensor_id: str = entry.data[CONF_SENSOR_ID]
+            self.name: str = entry.data.get(CONF_NAME) or f"Sensor {self.sensor_id}"
+            conf = entry.options
+            signal_key = entry.entry_id
+        else:
+            # One sensor of a receiver entry; its own settings override the shared ones
+            self.sensor_id = sensor[CONF_SENSOR_ID]
+            self.name = sensor.get(CONF_NAME) or f"Sensor {self.sensor_id}"
+            conf = {**entry.options, **sensor}
+            signal_key = f"{entry.entry_id}_{self.sensor_id}"
+        self.device_type: str = conf.get(CONF_DEVICE_TYPE, DEFAULT_DEVICE_TYPE)
+        self.sensor_source: str | None = conf.get(CONF_SENSOR_SOURCE)
+        self.entity_profile: str = conf.get(CONF_ENTITY_PROFILE, DEFAULT_ENTITY_PROFILE)
+        self.dropped_entities: frozenset[str] = PROFILE_DROPPED.get(
+            self.entity_profile, PROFILE_DROPPED[DEFAULT_ENTITY_PROFILE]
+        )
         self.prefix: str = entry.options.get(CONF_PREFIX) or entry.data.get(CONF_PREFIX, DEFAULT_PREFIX)
         self.combined_id: str = f"{self.prefix}_{self.sensor_id}"
         self._base = f"{self.prefix}/{self.sensor_id}"
-        self.states: dict[str, str | None] = {}
-        self._unsub_mqtt = None
-        self._unsub_timer = None
+        self.record = SensorRecord()
+        self._routers: list[MqttRouter] = []
+        self._loop_thread_id: int | None = getattr(hass, "loop_thread_id", None)
+        # One dispatcher signal per hub carries the set of changed suffixes
+        self._update_signal = f"{SIG_UPDATE}_{signal_key}_{SUFFIX_PACKET}"
+        # Per-suffix listeners when bypassing the dispatcher, else None
+        self._listeners: dict[str, list[Callable[[], None]]] | None = (
+            {} if entry.options.get(CONF_DIRECT_DISPATCH, DEFAULT_DIRECT_DISPATCH) else None
+        )
+        self._inbox: deque = deque()
+        self._drain_scheduled = False
+        self._scheduler: AvailabilityScheduler | None = None
         self._last_seen_utc = None  # datetime
+        self._expires: float | None = None  # POSIX time the sensor goes offline
+        self._heap_when: float | None = None  # deadline of the hub's live heap entry
         self._tick_seconds = entry.options.get(CONF_AVAIL_TICK, DEFAULT_AVAIL_TICK)
+        self._avail_window = timedelta(
+            minutes=entry.options.get(CONF_AVAIL_MINUTES, DEFAULT_AVAIL_MINUTES)
+        )
+        self._online: bool | None = None  # last value signalled to entities
+        self._avail_pushed = float("-inf")  # loop time of the last availability signal
+        self.ingest_mode: str = entry.options.get(CONF_INGEST_MODE, DEFAULT_INGEST_MODE)
+        self.events_topic: str = entry.options.get(CONF_EVENTS_TOPIC) or DEFAULT_EVENTS_TOPIC
+        self.prefixes: tuple[str, ...] = (self.prefix,)
+        if self.ingest_mode == INGEST_MODE_FIELDS:
+            self.prefixes += tuple(
+                prefix for prefix in split_prefixes(conf.get(CONF_FUSION_PREFIXES))
+                if prefix != self.prefix
+            )
+        self._bursts: dict[str, _Burst] = {
+            f"{prefix}/{self.sensor_id}": _Burst(prefix) for prefix in self.prefixes
+        }
+        self._fusion_window: float = conf.get(CONF_FUSION_WINDOW, DEFAULT_FUSION_WINDOW) / 1000
+        self._fused: dict | None = None  # strongest copy of the packet being fused
+        self._fused_key: frozenset | None = None
+        self._fused_rssi = float("-inf")
+        self._fused_prefix: str | None = None
+        self._fusion_handle = None
+        self.receiver: str | None = None  # prefix whose copy of the last packet was kept
+        self.receivers_last_seen: dict[str, datetime] = {}
+        self.packets_fused = 0
+        # Unknown ids are only visible to the per-field prefix subscription
+        self.discovery: bool = self.ingest_mode == INGEST_MODE_FIELDS and entry.options.get(
+            CONF_DISCOVERY, DEFAULT_DISCOVERY
+        )
+        self._dedup_window: float = entry.options.get(CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW)
+        self._last_packet_key: frozenset | None = None
+        self._last_packet_at = float("-inf")  # loop time of the last accepted packet
+        # The next packet may be the broker's retained copy (snapshot loaded or MQTT connected)
+        self._replay_expected = False
+        self.packets_accepted = 0
+        self.event_seen = False  # an ``event`` field was received since setup
+        self.packets_suppressed = 0
+        self.packets_replayed = 0
+        self.stats = LinkStats()
+        self.counters = HubCounters()
+        self._capture_enabled: bool = conf.get(CONF_CAPTURE, DEFAULT_CAPTURE)
+        self._capture: CaptureWriter | None = None
+        self._stats_pushed = float("-inf")  # loop time of the last statistics signal
+        self._snapshot: SnapshotStore | None = None
 
     async def async_setup(self) -> None:
-        await mqtt.async_wait_for_mqtt_client(self.hass)
-        topic = f"{self._base}/+"
+        self._snapshot = await async_get_snapshot(self.hass)
+        saved = self._snapshot.get(self.combined_id)
+        if saved is not None:
+            self.async_load_snapshot(saved)
+        else:
+            self.async_restore()
+        self._snapshot.async_register(self)
+        if self.ingest_mode == INGEST_MODE_EVENTS:
+            self._routers = [async_get_router(self.hass, self.events_topic, EventsRouter)]
+        else:
+            self._routers = [
+                async_get_router(self.hass, f"{prefix}/+/+") for prefix in self.prefixes
+            ]
+        self._scheduler = async_get_scheduler(self.hass)
+        if self._expires is not None:
+            self._scheduler.async_schedule(self)
+        if self._capture_enabled:
+            self._capture = async_get_capture(self.hass, self.entry)
+        for router in self._routers:
+            router.async_register(self)
 
-        def _cb(msg):
-            suffix = msg.topic.split("/")[-1]
-            if not suffix:
-                logging.getLogger(__name__).warning("Received MQTT message with empty suffix on topic %s", msg.topic)
-                return
-            try:
-                payload = msg.payload.decode("utf-8", "ignore") if isinstance(msg.payload, bytes) else str(msg.payload)
-            except Exception:
-                logging.getLogger(__name__).warning("Unable to decode payload on topic %s", msg.topic)
+    async def async_unload(self) -> None:
+        for router in self._routers:
+            router.async_unregister(self)
+        self._routers = []
+        if self._capture:
+            self._capture.async_release()
+            self._capture = None
+        if self._snapshot:
+            self._snapshot.async_unregister(self)
+            self._snapshot = None
+        self._scheduler = None
+        self._expires = None
+        for burst in self._bursts.values():
+            if burst.handle:
+                burst.handle.cancel()
+                burst.handle = None
+            burst.fields.clear()
+        if self._fusion_handle:
+            self._fusion_handle.cancel()
+            self._fusion_handle = None
+        self._fused = self._fused_key = None
+        self._inbox.clear()
+
+    def snapshot(self) -> dict:
+        """Return the typed field store, last-seen time and dedup state for saving."""
+        last_seen = self._last_seen_utc
+        return {
+            "fields": self.record.snapshot(),
+            "event_seen": self.event_seen,
+            "last_seen": last_seen.isoformat() if last_seen else None,
+            "packet": [list(item) for item in self._last_packet_key or ()],
+        }
+
+    @callback
+    def async_load_snapshot(self, data: dict) -> None:
+        """Seed the hub from a saved ``snapshot``; used instead of entity restore."""
+        self.event_seen = data.get("event_seen", False)
+        self.record.load_snapshot(data.get("fields", {}), decode_flags=self.event_seen)
+        if self.record.event is None:
+            self.record.event = 128
+        if data.get("packet"):
+            self._last_packet_key = frozenset(tuple(item) for item in data["packet"])
+            self._replay_expected = True
+        last_seen = data.get("last_seen")
+        parsed = dt_util.parse_datetime(last_seen) if last_seen else None
+        if parsed is not None:
+            self.async_set_last_seen(dt_util.as_utc(parsed))
+
+    @callback
+    def async_restore(self) -> None:
+        """Seed the record from the stored states of this sensor's entities.
+
+        Runs once before the platforms are set up, so every entity's first
+        state write already reflects the restored values.
+        """
+        registry = er.async_get(self.hass)
+        last_states = restore_state.async_get(self.hass).last_states
+        states: dict[str, str] = {}
+        for platform, suffixes in RESTORE_SUFFIXES.items():
+            for suffix in suffixes:
+                entity_id = registry.async_get_entity_id(
+                    platform, DOMAIN, f"{self.combined_id}_{suffix}"
+                )
+                stored = last_states.get(entity_id) if entity_id else None
+                if stored is not None:
+                    states[suffix] = stored.state.state
+        entity_id = registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{self.combined_id}_{SUFFIX_DETAILS}"
+        )
+        stored = last_states.get(entity_id) if entity_id else None
+        if stored is not None:
+            # Fields folded into the details entity by a smaller profile
+            attributes = getattr(stored.state, "attributes", None) or {}
+            for suffix in DETAIL_FIELDS:
+                value = attributes.get(suffix)
+                if value is not None and suffix not in states:
+                    states[suffix] = ("on" if value else "off") if isinstance(value, bool) else str(value)
+            states.setdefault("last_seen", stored.state.state)
+        self.async_seed(states)
+
+    @callback
+    def async_seed(self, states: dict[str, str]) -> None:
+        """Write restored entity states, keyed by unique-id suffix, as typed values."""
+        record = self.record
+        contact = states.get("contact")
+        if contact in ("on", "off"):
+            # Stand-in codes; flags are only decoded from received events
+            record.event = 160 if contact == "on" else 128
+        for suffix in _RESTORED_FIELDS:
+            value = states.get(suffix)
+            if value is not None and value not in ("unknown", "unavailable"):
+                record.set(suffix, value)
+        if record.event is None:
+            # Default to a closed contact so it has a sensible initial value
+            record.event = 128
+        for suffix in (TOPIC_TAMPER, TOPIC_ALARM):
+            if states.get(suffix) in ("on", "off"):
+                setattr(record, suffix, states[suffix] == "on")
+        if states.get("battery") in ("on", "off"):
+            record.battery_ok = states["battery"] == "off"
+
+        last_seen = states.get("last_seen")
+        if last_seen is not None and last_seen not in ("unknown", "unavailable"):
+            record.set(TOPIC_TIME, last_seen)
+            parsed = record.time_utc(self.hass)
+            if parsed is not None:
+                self.async_set_last_seen(parsed)
                 return
-            payload = payload.strip()
-            self.states[suffix] = payload
-            self._last_seen_utc = dt_util.utcnow()
-            self.hass.loop.call_soon_threadsafe(
-                async_dispatcher_send,
-                self.hass,
-                self._signal_name(suffix),
-                payload,
-            )
-            self.hass.loop.call_soon_threadsafe(
-                async_dispatcher_send,
-                self.hass,
-                self._signal_name(SUFFIX_AVAILABILITY),
-                "tick",
-            )
+        # Without a usable timestamp fall back to the stored connectivity
+        available = states.get("availability")
+        if available == "on":
+            self.async_set_last_seen(dt_util.utcnow())
+        elif available == "off":
+            self.async_set_last_seen(dt_util.utcnow() - 2 * self._avail_window)
+
+    @callback
+    def async_apply_options(self) -> None:
+        """Apply changed ``HOT_OPTIONS`` of the entry without resubscribing.
+
+        Entities that depend on options listen for ``SUFFIX_OPTIONS``.
+        """
+        options = self.options = dict(self.entry.options)
+        conf = options if self._sensor is None else {**options, **self._sensor}
+        self.sensor_source = conf.get(CONF_SENSOR_SOURCE)
+        self._tick_seconds = options.get(CONF_AVAIL_TICK, DEFAULT_AVAIL_TICK)
+        self._dedup_window = options.get(CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW)
+        self._fusion_window = conf.get(CONF_FUSION_WINDOW, DEFAULT_FUSION_WINDOW) / 1000
+        window = timedelta(minutes=options.get(CONF_AVAIL_MINUTES, DEFAULT_AVAIL_MINUTES))
+        if window != self._avail_window:
+            self._avail_window = window
+            if self._last_seen_utc is not None:
+                # Recompute the expiry and reschedule it
+                self.async_set_last_seen(self._last_seen_utc)
+        changed = {SUFFIX_OPTIONS}
+        if self._availability_due(seen=False):
+            changed.add(SUFFIX_AVAILABILITY)
+        self._async_notify(changed)
+
+    def _cb(self, msg) -> None:
+        if threading.get_ident() != self._loop_thread_id:
+            self._queue(self._async_ingest, msg)
+            return
+        start = perf_counter_ns()
+        self._async_ingest(msg)
+        self.counters.observe_cb(perf_counter_ns() - start)
+
+    def _event_cb(self, msg, doc: dict) -> None:
+        """Like ``_cb`` for an rtl_433 JSON event already decoded by the router."""
+        if threading.get_ident() != self._loop_thread_id:
+            self._queue(self._ingest_event, msg, doc)
+            return
+        start = perf_counter_ns()
+        self._ingest_event(msg, doc)
+        self.counters.observe_cb(perf_counter_ns() - start)
 
-        self._unsub_mqtt = await mqtt.async_subscribe(self.hass, topic, _cb, qos=0, encoding=None)
-        self._unsub_timer = async_track_time_interval(
-            self.hass, self._availability_tick, timedelta(seconds=self._tick_seconds)
+    def _queue(self, handler: Callable[..., None], *args) -> None:
+        """Hand a message received off the loop to ``_drain_inbox``."""
+        self._inbox.append((handler, args))
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.hass.loop.call_soon_threadsafe(self._drain_inbox)
+
+    @callback
+    def _drain_inbox(self) -> None:
+        """Handle every message queued from other threads in one loop pass."""
+        self._drain_scheduled = False
+        inbox = self._inbox
+        counters = self.counters
+        while inbox:
+            handler, args = inbox.popleft()
+            start = perf_counter_ns()
+            handler(*args)
+            counters.observe_cb(perf_counter_ns() - start)
+
+    @callback
+    def _async_ingest(self, msg) -> None:
+        if self._capture is not None:
+            self._capture.append(msg.topic, msg.payload)
+        base, _sep, suffix = msg.topic.rpartition("/")
+        counters = self.counters
+        if not suffix:
+            counters.empty_suffix += 1
+            _LOGGER.warning("Received MQTT message with empty suffix on topic %s", msg.topic)
+            return
+        loop = self.hass.loop
+        now = loop.time()
+        counters.count_message(suffix, now)
+        burst = self._bursts.get(base)
+        if burst is None:
+            return
+        try:
+            payload = msg.payload.decode("utf-8", "ignore") if isinstance(msg.payload, bytes) else str(msg.payload)
+        except Exception:
+            counters.decode_failures += 1
+            _LOGGER.warning("Unable to decode payload on topic %s", msg.topic)
+            return
+        payload = payload.strip()
+        if suffix == TOPIC_TIME and burst.fields:
+            # ``time`` leads every rtl_433 burst, so it closes the previous packet
+            self._flush_packet(burst)
+        burst.fields[suffix] = payload
+        burst.rx = now
+        if burst.handle is None:
+            burst.handle = loop.call_later(PACKET_QUIET_SECONDS, self._on_quiet, burst)
+
+    @callback
+    def _on_quiet(self, burst: _Burst) -> None:
+        """Commit the pending packet once no field arrived for the quiet window."""
+        burst.handle = None
+        remaining = burst.rx + PACKET_QUIET_SECONDS - self.hass.loop.time()
+        if remaining > 0:
+            burst.handle = self.hass.loop.call_later(remaining, self._on_quiet, burst)
+            return
+        self._flush_packet(burst)
+
+    @callback
+    def _ingest_event(self, msg, doc: dict) -> None:
+        """Commit one decoded rtl_433 JSON event as a complete packet."""
+        if self._capture is not None:
+            self._capture.append(msg.topic, msg.payload)
+        self.counters.count_message("json", self.hass.loop.time())
+        packet = {}
+        for key in EVENT_FIELDS:
+            value = doc.get(key)
+            if value is not None:
+                packet[key] = value
+        if packet:
+            self._commit(packet)
+
+    @callback
+    def _flush_packet(self, burst: _Burst) -> None:
+        """Commit all buffered fields at once and notify entities."""
+        if burst.handle:
+            burst.handle.cancel()
+            burst.handle = None
+        if not burst.fields:
+            return
+        packet, burst.fields = burst.fields, {}
+        if len(self.prefixes) == 1:
+            self._commit(packet)
+        else:
+            self._async_fuse(burst.prefix, packet)
+
+    @callback
+    def _async_fuse(self, prefix: str, packet: dict) -> None:
+        """Merge copies of one packet from several receivers, keeping the strongest."""
+        self.receivers_last_seen[prefix] = dt_util.utcnow()
+        key = _packet_key(packet)
+        rssi = _packet_rssi(packet)
+        if self._fused is not None:
+            if key == self._fused_key:
+                self.packets_fused += 1
+                if rssi > self._fused_rssi:
+                    self._fused, self._fused_rssi, self._fused_prefix = packet, rssi, prefix
+                return
+            # A different packet closes the window of the previous one
+            self._async_commit_fused()
+        self._fused, self._fused_key = packet, key
+        self._fused_rssi, self._fused_prefix = rssi, prefix
+        self._fusion_handle = self.hass.loop.call_later(
+            self._fusion_window, self._async_commit_fused
         )
 
-    async def async_unload(self) -> None:
-        if self._unsub_mqtt:
-            self._unsub_mqtt()
-            self._unsub_mqtt = None
-        if self._unsub_timer:
-            self._unsub_timer()
-            self._unsub_timer = None
+    @callback
+    def _async_commit_fused(self) -> None:
+        if self._fusion_handle:
+            self._fusion_handle.cancel()
+            self._fusion_handle = None
+        packet, prefix = self._fused, self._fused_prefix
+        if packet is None:
+            return
+        self._fused = self._fused_key = None
+        previous, self.receiver = self.receiver, prefix
+        self._commit(packet)
+        if previous is not None and previous != prefix:
+            # The receiver attribute lives on the connectivity entity
+            self._async_notify(_AVAILABILITY_CHANGED)
+
+    @callback
+    def _commit(self, packet: dict) -> None:
+        now = self.hass.loop.time()
+        replay_expected, self._replay_expected = self._replay_expected, False
+        if self._dedup_window > 0:
+            key = _packet_key(packet)
+            if key == self._last_packet_key:
+                in_window = now - self._last_packet_at < self._dedup_window
+                time = packet.get(TOPIC_TIME)
+                # ``time`` has one-second resolution, so retransmissions share it;
+                # only a copy outside the window or right after (re)connecting is stale
+                if (
+                    (replay_expected or not in_window)
+                    and time is not None and str(time) == self.record.time
+                ):
+                    self.packets_replayed += 1
+                    return
+                if in_window:
+                    self.packets_suppressed += 1
+                    self.async_set_last_seen(dt_util.utcnow())
+                    self._async_update_availability(seen=True)
+                    return
+            self._last_packet_key = key
+            self._last_packet_at = now
+        self.packets_accepted += 1
+        if self._snapshot is not None:
+            self._snapshot.async_schedule_save()
+        record = self.record
+        changed = {suffix for suffix, raw in packet.items() if record.set(suffix, raw)}
+        for suffix in _NUMERIC_FIELDS:
+            if suffix in packet and getattr(record, suffix) is None:
+                self.counters.decode_failures += 1
+        if TOPIC_EVENT in packet and not self.event_seen:
+            # The first real event outranks restored or state-text values
+            self.event_seen = True
+            changed.add(TOPIC_EVENT)
+        if TOPIC_TIME in changed:
+            record.time_utc(self.hass)
+        if TOPIC_HEARTBEAT in packet:
+            heartbeat = record.heartbeat == 1
+        else:
+            flags = record.event_flags
+            heartbeat = TOPIC_EVENT in packet and flags is not None and flags.heartbeat
+        self.stats.add_packet(now, record.rssi if TOPIC_RSSI in packet else None, heartbeat)
+        if now - self._stats_pushed >= STATS_PUSH_SECONDS:
+            self._stats_pushed = now
+            changed.add(SUFFIX_STATS)
+        self.async_set_last_seen(dt_util.utcnow())
+        if self._availability_due(seen=True):
+            changed.add(SUFFIX_AVAILABILITY)
+        if changed:
+            self._async_notify(changed)
+
+    @callback
+    def _async_notify(self, changed: set[str] | frozenset[str]) -> None:
+        """Tell listeners which suffixes changed, calling each listener once."""
+        self.counters.dispatches += 1
+        listeners = self._listeners
+        if listeners is None:
+            async_dispatcher_send(self.hass, self._update_signal, changed)
+            return
+        called = set()
+        for suffix in changed:
+            for action in listeners.get(suffix, ()):
+                if action not in called:
+                    called.add(action)
+                    action()
 
     @callback
-    def _availability_tick(self, _now) -> None:
-        """Periodic callback to update availability state."""
-        async_dispatcher_send(self.hass, self._signal_name(SUFFIX_AVAILABILITY), "tick")
+    def async_listen(
+        self, suffixes: tuple[str, ...], action: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Call ``action`` once for every update that changes one of ``suffixes``.
+
+        ``SUFFIX_AVAILABILITY`` is notified like a field suffix.  Returns a
+        callable that removes the listener.
+        """
+        listeners = self._listeners
+        if listeners is None:
+            wanted = frozenset(suffixes)
+            @callback
+            def _on_update(changed: frozenset[str]) -> None:
+                if not wanted.isdisjoint(changed):
+                    action()
+            return async_dispatcher_connect(self.hass, self._update_signal, _on_update)
 
-    def _signal_name(self, suffix: str) -> str:
-        return f"{SIG_UPDATE}_{self.entry.entry_id}_{suffix}"
+        for suffix in suffixes:
+            listeners.setdefault(suffix, []).append(action)
 
-    def signal_for(self, suffix: str) -> str:
-        return self._signal_name(suffix)
+        @callback
+        def _remove() -> None:
+            for suffix in suffixes:
+                listeners[suffix].remove(action)
+        return _remove
+
+    @callback
+    def async_set_last_seen(self, when: datetime) -> None:
+        """Record when the sensor was last heard and reschedule its expiry."""
+        self._last_seen_utc = when
+        self._expires = when.timestamp() + self._avail_window.total_seconds()
+        if self._scheduler is not None:
+            self._scheduler.async_schedule(self)
+
+    @callback
+    def _availability_due(self, seen: bool) -> bool:
+        """Whether availability flipped, or its attribute refresh is due after a packet."""
+        online = self.online
+        now = self.hass.loop.time()
+        if online == self._online and (not seen or now - self._avail_pushed < self._tick_seconds):
+            return False
+        self._online = online
+        self._avail_pushed = now
+        return True
+
+    @callback
+    def _async_update_availability(self, seen: bool = False) -> None:
+        if self._availability_due(seen):
+            self._async_notify(_AVAILABILITY_CHANGED)
 
     @property
     def base_topic(self) -> str:
@@ -120,3 +1002,43 @@ class MqttHub:
     @property
     def last_seen_utc(self) -> datetime | None:
         return self._last_seen_utc
+
+    @property
+    def online(self) -> bool | None:
+        """Whether the sensor was heard within the availability window."""
+        last = self._last_seen_utc
+        if last is None:
+            return None
+        return (dt_util.utcnow() - last) < self._avail_window
+
+class ReceiverHub:
+    """Sensor hubs for every sensor listed on a receiver entry.
+
+    The hubs are set up and unloaded together.  They share the router of the
+    prefix, so a receiver costs one MQTT subscription and one wait for the
+    client no matter how many sensors it lists.
+    """
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        self.hass = hass
+        self.entry = entry
+        self.data = dict(entry.data)
+        self.options = dict(entry.options)
+        self.hubs: list[MqttHub] = [
+            MqttHub(hass, entry, sensor) for sensor in entry.options.get(CONF_SENSORS, [])
+        ]
+
+    async def async_setup(self) -> None:
+        for hub in self.hubs:
+            await hub.async_setup()
+
+    async def async_unload(self) -> None:
+        for hub in self.hubs:
+            await hub.async_unload()
+
+    @callback
+    def async_apply_options(self) -> None:
+        self.options = dict(self.entry.options)
+        # Same sensors in the same order; only their hot settings may differ
+        for hub, sensor in zip(self.hubs, self.options.get(CONF_SENSORS, [])):
+            hub._sensor = sensor
+            hub.async_apply_options()
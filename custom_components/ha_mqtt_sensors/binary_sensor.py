@@ -1,17 +1,16 @@
 from __future__ import annotations
-from datetime import timedelta
 import logging
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.restore_state import RestoreEntity
-from homeassistant.util import dt as dt_util
+
+from . import async_entry_hubs, async_profile_entities
+from .util import decode_event
 
 from .const import (
     DOMAIN,
-    CONF_NAME,
     TOPIC_CONTACT,
     TOPIC_REED,
     TOPIC_STATE,
@@ -20,51 +19,51 @@ from .const import (
     TOPIC_ALARM,
     TOPIC_EVENT,
     SUFFIX_AVAILABILITY,
-    CONF_DEVICE_TYPE,
-    DEFAULT_DEVICE_TYPE,
-    CONF_AVAIL_MINUTES,
-    DEFAULT_AVAIL_MINUTES,
-    CONTACT_OPEN_STATES,
-    CONTACT_CLOSED_STATES,
-    CONTACT_OPEN_EVENTS,
-    CONTACT_CLOSED_EVENTS,
-    CONF_SENSOR_SOURCE,
+    SUFFIX_OPTIONS,
     SENSOR_SOURCE_EXTERNAL,
     SENSOR_SOURCE_INTERNAL,
 )
 
+_LOGGER = logging.getLogger(__name__)
+_logged_unknown_events: set[int] = set()
+
 async def async_setup_entry(hass, entry: ConfigEntry, async_add_entities):
-    hub = hass.data[DOMAIN][entry.entry_id]
-    base_name = entry.data[CONF_NAME]
-
-    dev_info = DeviceInfo(
-        identifiers={(DOMAIN, hub.combined_id)},
-        name=base_name,
-        manufacturer="345MHz Receiver",
-        model="Honeywell/345 Contact",
-    )
-
-    dtype = entry.options.get(CONF_DEVICE_TYPE, DEFAULT_DEVICE_TYPE).lower()
-    if dtype == "door":
-        main_name = f"{base_name} Door"
-        main_class = BinarySensorDeviceClass.DOOR
-    elif dtype == "leak":
-        main_name = f"{base_name} Leak"
-        main_class = BinarySensorDeviceClass.MOISTURE
-    else:
-        main_name = f"{base_name} Window"
-        main_class = BinarySensorDeviceClass.WINDOW
-
-    entities = [
-        ContactEntity(hub, entry, dev_info, main_name, main_class),
-        TamperEntity(hub, entry, dev_info, f"{base_name} Tamper"),
-        BatteryLowEntity(hub, entry, dev_info, f"{base_name} Battery"),
-        AlarmEntity(hub, entry, dev_info, f"{base_name} Alarm"),
-        AvailabilityEntity(hub, entry, dev_info, f"{base_name} Connectivity"),
-    ]
+    entities = []
+    for hub in async_entry_hubs(hass, entry):
+        base_name = hub.name
+        dev_info = DeviceInfo(
+            identifiers={(DOMAIN, hub.combined_id)},
+            name=base_name,
+            manufacturer="345MHz Receiver",
+            model="Honeywell/345 Contact",
+        )
+
+        dtype = hub.device_type.lower()
+        if dtype == "door":
+            main_name = f"{base_name} Door"
+            main_class = BinarySensorDeviceClass.DOOR
+        elif dtype == "leak":
+            main_name = f"{base_name} Leak"
+            main_class = BinarySensorDeviceClass.MOISTURE
+        else:
+            main_name = f"{base_name} Window"
+            main_class = BinarySensorDeviceClass.WINDOW
+
+        entities += async_profile_entities(hass, hub, "binary_sensor", [
+            ContactEntity(hub, entry, dev_info, main_name, main_class),
+            TamperEntity(hub, entry, dev_info, f"{base_name} Tamper"),
+            BatteryLowEntity(hub, entry, dev_info, f"{base_name} Battery"),
+            AlarmEntity(hub, entry, dev_info, f"{base_name} Alarm"),
+            AvailabilityEntity(hub, entry, dev_info, f"{base_name} Connectivity"),
+        ])
     async_add_entities(entities)
 
 class _BaseBin(RestoreEntity, BinarySensorEntity):
+    """Binary sensor backed by the hub record.
+
+    ``RestoreEntity`` keeps the state stored across restarts; the hub reads
+    it back in ``MqttHub.async_restore`` before the entity is added.
+    """
     _attr_should_poll = False
 
     def __init__(self, hub, entry, dev_info: DeviceInfo, name: str, unique_suffix: str):
@@ -80,65 +79,45 @@ class _BaseBin(RestoreEntity, BinarySensorEntity):
             r()
         self._removers.clear()
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._hub.counters.state_writes += 1
+        super().async_write_ha_state()
+
+    def _async_listen(self, *suffixes: str) -> None:
+        """Write state once for every packet that changed one of ``suffixes``."""
+        @callback
+        def _on():
+            self.async_write_ha_state()
+        self._removers.append(self._hub.async_listen(suffixes, _on))
+
 class ContactEntity(_BaseBin):
     def __init__(self, hub, entry, dev_info, name, device_class):
         super().__init__(hub, entry, dev_info, name, "contact")
         self._attr_device_class = device_class
-        self._event_seen = False
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        last = await self.async_get_last_state()
-        if last and last.state in ("on", "off"):
-            self._hub.states[TOPIC_EVENT] = "160" if last.state == "on" else "128"
-        else:
-            # Default to a closed state so the entity has a sensible initial value
-            self._hub.states.setdefault(TOPIC_EVENT, "128")
-        @callback
-        def _poke(_payload: str):
-            self.async_write_ha_state()
-        @callback
-        def _on_event(_payload: str):
-            self._event_seen = True
-            self.async_write_ha_state()
-        for suffix in (TOPIC_CONTACT, TOPIC_REED, TOPIC_STATE):
-            self._removers.append(async_dispatcher_connect(self.hass, self._hub.signal_for(suffix), _poke))
-        self._removers.append(async_dispatcher_connect(self.hass, self._hub.signal_for(TOPIC_EVENT), _on_event))
-        self.async_write_ha_state()
+        self._async_listen(TOPIC_CONTACT, TOPIC_REED, TOPIC_STATE, TOPIC_EVENT, SUFFIX_OPTIONS)
 
     @property
     def is_on(self):
-        source = self._entry.options.get(CONF_SENSOR_SOURCE)
-        if source == SENSOR_SOURCE_EXTERNAL:
-            contact = self._hub.states.get(TOPIC_CONTACT)
-            if contact is not None:
-                return str(contact) == "1"
-        if source == SENSOR_SOURCE_INTERNAL:
-            reed = self._hub.states.get(TOPIC_REED)
-            if reed is not None:
-                return str(reed) == "1"
-        event_raw = self._hub.states.get(TOPIC_EVENT)
-        event_val = None
-        if event_raw is not None:
-            try:
-                code = int(event_raw, 0)
-            except ValueError:
-                code = None
-            if code in CONTACT_OPEN_EVENTS:
-                event_val = True
-            elif code in CONTACT_CLOSED_EVENTS:
-                event_val = False
-            elif code is not None:
-                logging.getLogger(__name__).debug("Unknown event code %s", code)
-
-        state_text = (self._hub.states.get(TOPIC_STATE) or "").lower()
-        state_val = None
-        if state_text in CONTACT_OPEN_STATES:
-            state_val = True
-        elif state_text in CONTACT_CLOSED_STATES:
-            state_val = False
-
-        if self._event_seen:
+        record = self._hub.record
+        source = self._hub.sensor_source
+        if source == SENSOR_SOURCE_EXTERNAL and record.contact_open is not None:
+            return record.contact_open
+        if source == SENSOR_SOURCE_INTERNAL and record.reed_open is not None:
+            return record.reed_open
+        code = record.event
+        flags = decode_event(code)
+        event_val = None if flags is None else flags.contact
+        if event_val is None and code is not None and code not in _logged_unknown_events:
+            _logged_unknown_events.add(code)
+            _LOGGER.debug("Unknown event code %s", code)
+
+        state_val = record.state_open
+
+        if self._hub.event_seen:
             return event_val if event_val is not None else state_val
         return state_val if state_val is not None else event_val
 
@@ -150,19 +129,15 @@ class TamperEntity(_BaseBin):
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        last = await self.async_get_last_state()
-        if last and last.state in ("on", "off"):
-            self._hub.states[TOPIC_TAMPER] = "1" if last.state == "on" else "0"
-        @callback
-        def _on(_payload: str):
-            self.async_write_ha_state()
-        self._removers.append(async_dispatcher_connect(self.hass, self._hub.signal_for(TOPIC_TAMPER), _on))
-        self.async_write_ha_state()
+        self._async_listen(TOPIC_TAMPER, TOPIC_EVENT)
 
     @property
     def is_on(self):
-        v = self._hub.states.get(TOPIC_TAMPER)
-        return None if v is None else str(v) == "1"
+        record = self._hub.record
+        if record.tamper is not None:
+            return record.tamper
+        flags = record.event_flags
+        return None if flags is None else flags.tamper
 
 class BatteryLowEntity(_BaseBin):
     _attr_device_class = BinarySensorDeviceClass.BATTERY
@@ -172,19 +147,15 @@ class BatteryLowEntity(_BaseBin):
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        last = await self.async_get_last_state()
-        if last and last.state in ("on", "off"):
-            self._hub.states[TOPIC_BATTOK] = "0" if last.state == "on" else "1"
-        @callback
-        def _on(_payload: str):
-            self.async_write_ha_state()
-        self._removers.append(async_dispatcher_connect(self.hass, self._hub.signal_for(TOPIC_BATTOK), _on))
-        self.async_write_ha_state()
+        self._async_listen(TOPIC_BATTOK, TOPIC_EVENT)
 
     @property
     def is_on(self):
-        v = self._hub.states.get(TOPIC_BATTOK)
-        return None if v is None else str(v) == "0"  # battery_ok == 0 => low
+        record = self._hub.record
+        if record.battery_ok is not None:
+            return not record.battery_ok
+        flags = record.event_flags
+        return None if flags is None else flags.battery_low
 
 class AlarmEntity(_BaseBin):
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
@@ -194,19 +165,15 @@ class AlarmEntity(_BaseBin):
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        last = await self.async_get_last_state()
-        if last and last.state in ("on", "off"):
-            self._hub.states[TOPIC_ALARM] = "1" if last.state == "on" else "0"
-        @callback
-        def _on(_payload: str):
-            self.async_write_ha_state()
-        self._removers.append(async_dispatcher_connect(self.hass, self._hub.signal_for(TOPIC_ALARM), _on))
-        self.async_write_ha_state()
+        self._async_listen(TOPIC_ALARM, TOPIC_EVENT)
 
     @property
     def is_on(self):
-        v = self._hub.states.get(TOPIC_ALARM)
-        return None if v is None else str(v) == "1"
+        record = self._hub.record
+        if record.alarm is not None:
+            return record.alarm
+        flags = record.event_flags
+        return None if flags is None else flags.alarm
 
 class AvailabilityEntity(_BaseBin):
     _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
@@ -217,23 +184,26 @@ class AvailabilityEntity(_BaseBin):
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        last = await self.async_get_last_state()
-        if last and last.state in ("on", "off"):
-            if last.state == "on":
-                self._hub._last_seen_utc = dt_util.utcnow()
-            else:
-                minutes = self._entry.options.get(CONF_AVAIL_MINUTES, DEFAULT_AVAIL_MINUTES)
-                self._hub._last_seen_utc = dt_util.utcnow() - timedelta(minutes=minutes * 2)
-        @callback
-        def _tick(_payload: str):
-            self.async_write_ha_state()
-        self._removers.append(async_dispatcher_connect(self.hass, self._hub.signal_for(SUFFIX_AVAILABILITY), _tick))
-        self.async_write_ha_state()
+        self._async_listen(SUFFIX_AVAILABILITY)
 
     @property
     def is_on(self):
-        minutes = self._entry.options.get(CONF_AVAIL_MINUTES, DEFAULT_AVAIL_MINUTES)
-        last = self._hub.last_seen_utc
-        if not last:
-            return None
-        return (dt_util.utcnow() - last) < timedelta(minutes=minutes)
+        return self._hub.online
+
+    @property
+    def extra_state_attributes(self):
+        hub = self._hub
+        last = hub.last_seen_utc
+        attrs = {
+            "last_seen_utc": last.isoformat() if last else None,
+            "packets_accepted": hub.packets_accepted,
+            "packets_suppressed": hub.packets_suppressed,
+            "packets_replayed": hub.packets_replayed,
+        }
+        if len(hub.prefixes) > 1:
+            attrs["receiver"] = hub.receiver
+            attrs["receivers_last_seen"] = {
+                prefix: seen.isoformat() for prefix, seen in hub.receivers_last_seen.items()
+            }
+            attrs["packets_fused"] = hub.packets_fused
+        return attrs
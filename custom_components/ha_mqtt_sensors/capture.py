@@ -0,0 +1,232 @@
+"""Raw MQTT capture files and a replay driver for load tests.
+
+A capture starts with ``CAPTURE_MAGIC`` followed by records of a
+little-endian header ``<dHI`` (wall-clock time, topic length, payload
+length) and the UTF-8 topic and raw payload bytes.  Files rotate to
+``.1``, ``.2``, ... at ``CAPTURE_MAX_BYTES``, always on a record boundary.
+"""
+from __future__ import annotations
+from collections.abc import Callable, Iterable, Iterator
+import logging
+import os
+from pathlib import Path
+import struct
+import time
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    DATA_CAPTURES,
+    CAPTURE_MAX_BYTES,
+    CAPTURE_BACKUPS,
+    CAPTURE_FLUSH_SECONDS,
+    CAPTURE_BUFFER_BYTES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"HAMQCAP1"
+_HEADER = struct.Struct("<dHI")
+
+
+@callback
+def async_get_capture(hass: HomeAssistant, entry: ConfigEntry) -> CaptureWriter:
+    """Return the capture writer of ``entry``, shared by all of its hubs."""
+    captures = hass.data.setdefault(DATA_CAPTURES, {})
+    writer = captures.get(entry.entry_id)
+    if writer is None:
+        path = Path(hass.config.path(DOMAIN, "captures", f"{entry.entry_id}.cap"))
+        writer = captures[entry.entry_id] = CaptureWriter(hass, path)
+    writer.users += 1
+    return writer
+
+
+class CaptureWriter:
+    """Append raw messages to a rotating capture file without blocking the loop.
+
+    ``append`` packs a record into an in-memory buffer.  The buffer is handed
+    to the executor after ``CAPTURE_FLUSH_SECONDS`` or once it holds
+    ``CAPTURE_BUFFER_BYTES``, with at most one write in flight so records
+    stay in order.  Stopping Home Assistant writes the buffer out as well.
+    """
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: Path,
+        max_bytes: int = CAPTURE_MAX_BYTES,
+        backups: int = CAPTURE_BACKUPS,
+    ) -> None:
+        self.hass = hass
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.users = 0
+        self.records = 0
+        self._buffer = bytearray()
+        self._flush_handle = None
+        self._writing = False
+        self._write_task = None
+        self._unsub_stop = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
+    @callback
+    def append(self, topic: str, payload: str | bytes) -> None:
+        topic_bytes = topic.encode()
+        if not isinstance(payload, bytes):
+            payload = str(payload).encode()
+        self._buffer += _HEADER.pack(time.time(), len(topic_bytes), len(payload))
+        self._buffer += topic_bytes
+        self._buffer += payload
+        self.records += 1
+        if len(self._buffer) >= CAPTURE_BUFFER_BYTES:
+            self._async_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(CAPTURE_FLUSH_SECONDS, self._async_flush)
+
+    @callback
+    def async_release(self) -> None:
+        """Drop one user; the last one writes what is buffered."""
+        self.users -= 1
+        if self.users > 0:
+            return
+        captures = self.hass.data.get(DATA_CAPTURES, {})
+        for entry_id, writer in list(captures.items()):
+            if writer is self:
+                del captures[entry_id]
+        if self._unsub_stop:
+            self._unsub_stop()
+            self._unsub_stop = None
+        self._async_flush()
+
+    async def _async_stop(self, _event) -> None:
+        """Write the buffer before shutdown; background writes are not waited for."""
+        self._unsub_stop = None
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._writing:
+            if self._write_task is not None:
+                # Its loop also writes what was buffered meanwhile
+                await self._write_task
+        elif self._buffer:
+            self._writing = True
+            await self._async_write()
+
+    @callback
+    def _async_flush(self) -> None:
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._writing or not self._buffer:
+            return
+        self._writing = True
+        self._write_task = self.hass.async_create_background_task(
+            self._async_write(), f"{DOMAIN} capture {self.path.name}"
+        )
+
+    async def _async_write(self) -> None:
+        """Write the buffer, including records appended while a write runs."""
+        try:
+            while self._buffer:
+                data = bytes(self._buffer)
+                self._buffer.clear()
+                try:
+                    await self.hass.async_add_executor_job(self._write, data)
+                except OSError as err:
+                    _LOGGER.warning("Unable to write capture %s: %s", self.path, err)
+        finally:
+            self._writing = False
+            self._write_task = None
+
+    def _write(self, data: bytes) -> None:
+        path = self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+            size = 0
+        with path.open("ab") as file:
+            if not size:
+                file.write(CAPTURE_MAGIC)
+            file.write(data)
+
+    def _rotate(self) -> None:
+        path = self.path
+        if not self.backups:
+            path.unlink()
+            return
+        for index in range(self.backups - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{index}")
+            if older.exists():
+                os.replace(older, path.with_name(f"{path.name}.{index + 1}"))
+        os.replace(path, path.with_name(f"{path.name}.1"))
+
+
+def capture_files(path: str | Path) -> list[Path]:
+    """Return ``path`` and its rotated files, oldest first."""
+    path = Path(path)
+    rotated = sorted(
+        (p for p in path.parent.glob(f"{path.name}.*") if p.suffix[1:].isdigit()),
+        key=lambda p: int(p.suffix[1:]),
+        reverse=True,
+    )
+    return [*rotated, path] if path.exists() else rotated
+
+
+def read_capture(path: str | Path) -> Iterator[tuple[float, str, bytes]]:
+    """Yield ``(timestamp, topic, payload)`` for every record in one capture file."""
+    data = Path(path).read_bytes()
+    if not data.startswith(CAPTURE_MAGIC):
+        raise ValueError(f"{path} is not a capture file")
+    offset = len(CAPTURE_MAGIC)
+    end = len(data)
+    while offset + _HEADER.size <= end:
+        stamp, topic_len, payload_len = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        topic = data[offset:offset + topic_len].decode()
+        offset += topic_len
+        payload = data[offset:offset + payload_len]
+        offset += payload_len
+        if len(payload) < payload_len:
+            break  # truncated final record
+        yield stamp, topic, payload
+
+
+class ReplayMessage:
+    """Stand-in for the MQTT ``ReceiveMessage`` handed to subscription callbacks."""
+    __slots__ = ("topic", "payload", "qos", "retain")
+
+    def __init__(self, topic: str, payload: bytes) -> None:
+        self.topic = topic
+        self.payload = payload
+        self.qos = 0
+        self.retain = False
+
+
+def replay(
+    records: Iterable[tuple[float, str, bytes]],
+    deliver: Callable[[ReplayMessage], None],
+    wait: Callable[[float], None] | None = None,
+) -> int:
+    """Feed captured records to ``deliver`` (e.g. a router or hub ``_cb``).
+
+    Records are delivered as fast as possible, or at their original spacing
+    when ``wait`` is given: it is called with each gap in seconds, e.g.
+    ``time.sleep`` or a test loop's ``advance``.  This is a test and
+    benchmark driver; it blocks and must not run on Home Assistant's loop.
+    Returns the number of messages delivered.
+    """
+    count = 0
+    previous = None
+    for stamp, topic, payload in records:
+        if wait is not None and previous is not None and stamp > previous:
+            wait(stamp - previous)
+        previous = stamp
+        deliver(ReplayMessage(topic, payload))
+        count += 1
+    return count
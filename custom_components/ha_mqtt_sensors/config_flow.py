@@ -1,7 +1,9 @@
 from __future__ import annotations
+import csv
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import selector
 
 from .const import (
     DOMAIN,
@@ -19,6 +21,46 @@ from .const import (
     DEFAULT_SENSOR_SOURCE,
     SENSOR_SOURCE_EXTERNAL,
     SENSOR_SOURCE_INTERNAL,
+    CONF_INGEST_MODE,
+    DEFAULT_INGEST_MODE,
+    INGEST_MODE_FIELDS,
+    INGEST_MODE_EVENTS,
+    CONF_EVENTS_TOPIC,
+    DEFAULT_EVENTS_TOPIC,
+    CONF_DEDUP_WINDOW,
+    DEFAULT_DEDUP_WINDOW,
+    CONF_DIRECT_DISPATCH,
+    DEFAULT_DIRECT_DISPATCH,
+    CONF_DISCOVERY,
+    DEFAULT_DISCOVERY,
+    CONF_DIAG_MIN_INTERVAL,
+    DEFAULT_DIAG_MIN_INTERVAL,
+    CONF_RSSI_DEADBAND,
+    DEFAULT_RSSI_DEADBAND,
+    CONF_RSSI_AGGREGATE,
+    DEFAULT_RSSI_AGGREGATE,
+    AGGREGATE_LAST,
+    AGGREGATE_MEAN,
+    AGGREGATE_MIN,
+    AGGREGATE_MAX,
+    CONF_RSSI_WINDOW,
+    DEFAULT_RSSI_WINDOW,
+    CONF_FUSION_PREFIXES,
+    DEFAULT_FUSION_PREFIXES,
+    CONF_FUSION_WINDOW,
+    DEFAULT_FUSION_WINDOW,
+    CONF_CAPTURE,
+    DEFAULT_CAPTURE,
+    CONF_ENTITY_PROFILE,
+    DEFAULT_ENTITY_PROFILE,
+    PROFILE_FULL,
+    PROFILE_STANDARD,
+    PROFILE_MINIMAL,
+    CONF_ENTRY_TYPE,
+    ENTRY_TYPE_SENSOR,
+    ENTRY_TYPE_RECEIVER,
+    CONF_SENSORS,
+    CONF_SENSOR_LIST,
     CONF_USE_EXTERNAL,
     CONF_USE_INTERNAL,
     DEFAULT_USE_EXTERNAL,
@@ -26,11 +68,278 @@ from .const import (
 )
 
 DEVICE_CHOICES = ["door", "window", "leak"]
+INGEST_CHOICES = [INGEST_MODE_FIELDS, INGEST_MODE_EVENTS]
+SOURCE_CHOICES = [SENSOR_SOURCE_EXTERNAL, SENSOR_SOURCE_INTERNAL]
+AGGREGATE_CHOICES = [AGGREGATE_LAST, AGGREGATE_MEAN, AGGREGATE_MIN, AGGREGATE_MAX]
+PROFILE_CHOICES = [PROFILE_FULL, PROFILE_STANDARD, PROFILE_MINIMAL]
+WRITE_POLICY_KEYS = (CONF_DIAG_MIN_INTERVAL, CONF_RSSI_DEADBAND, CONF_RSSI_AGGREGATE, CONF_RSSI_WINDOW)
+FUSION_KEYS = (CONF_FUSION_PREFIXES, CONF_FUSION_WINDOW)
+_HEADER_IDS = {"id", CONF_SENSOR_ID}
+
+
+def parse_sensor_list(
+    text: str, device_type: str = DEFAULT_DEVICE_TYPE, sensor_source: str = DEFAULT_SENSOR_SOURCE
+) -> list[dict]:
+    """Parse a pasted sensor list into per-sensor dicts for a receiver entry.
+
+    Each line is either bare sensor ids separated by whitespace, or a CSV row
+    ``id,name,device_type,sensor_source`` where trailing columns may be left
+    out.  Missing values fall back to ``device_type`` and ``sensor_source``.
+    A header row is skipped.  Raises ``ValueError`` on an invalid or
+    duplicate row.
+    """
+    sensors: list[dict] = []
+    seen: set[str] = set()
+    for row in csv.reader(text.splitlines()):
+        fields = [field.strip() for field in row]
+        if not any(fields):
+            continue
+        if len(fields) == 1:
+            rows = [[sensor_id] for sensor_id in fields[0].split()]
+        else:
+            rows = [fields]
+        for columns in rows:
+            sensor_id = columns[0]
+            if sensor_id.lower() in _HEADER_IDS:
+                continue
+            name, dtype, source = (columns[1:] + ["", "", ""])[:3]
+            dtype = (dtype or device_type).lower()
+            source = (source or sensor_source).lower()
+            if (
+                not sensor_id
+                or sensor_id in seen
+                or dtype not in DEVICE_CHOICES
+                or source not in SOURCE_CHOICES
+            ):
+                raise ValueError(f"Invalid sensor row: {','.join(columns)}")
+            seen.add(sensor_id)
+            sensors.append({
+                CONF_SENSOR_ID: sensor_id,
+                CONF_NAME: name or f"Sensor {sensor_id}",
+                CONF_DEVICE_TYPE: dtype,
+                CONF_SENSOR_SOURCE: source,
+            })
+    return sensors
+
+
+def format_sensor_list(sensors: list[dict]) -> str:
+    """Render receiver sensors as the CSV accepted by ``parse_sensor_list``."""
+    return "\n".join(
+        ",".join((
+            sensor[CONF_SENSOR_ID],
+            sensor.get(CONF_NAME, ""),
+            sensor.get(CONF_DEVICE_TYPE, DEFAULT_DEVICE_TYPE),
+            sensor.get(CONF_SENSOR_SOURCE, DEFAULT_SENSOR_SOURCE),
+        ))
+        for sensor in sensors
+    )
+
+
+def _receiver_options_schema(current: dict) -> dict:
+    """Fields shared by the receiver config and options forms."""
+    return {
+        vol.Optional(
+            CONF_PREFIX, default=current.get(CONF_PREFIX, DEFAULT_PREFIX)
+        ): str,
+        vol.Required(
+            CONF_SENSOR_LIST, default=current.get(CONF_SENSOR_LIST, "")
+        ): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
+        vol.Optional(
+            CONF_AVAIL_MINUTES,
+            default=current.get(CONF_AVAIL_MINUTES, DEFAULT_AVAIL_MINUTES),
+        ): vol.All(int, vol.Range(min=1, max=1440)),
+        vol.Optional(
+            CONF_AVAIL_TICK,
+            default=current.get(CONF_AVAIL_TICK, DEFAULT_AVAIL_TICK),
+        ): vol.All(int, vol.Range(min=5, max=3600)),
+        vol.Optional(
+            CONF_INGEST_MODE,
+            default=current.get(CONF_INGEST_MODE, DEFAULT_INGEST_MODE),
+        ): vol.In(INGEST_CHOICES),
+        vol.Optional(
+            CONF_EVENTS_TOPIC,
+            default=current.get(CONF_EVENTS_TOPIC, DEFAULT_EVENTS_TOPIC),
+        ): str,
+        vol.Optional(
+            CONF_DEDUP_WINDOW,
+            default=current.get(CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW),
+        ): vol.All(int, vol.Range(min=0, max=60)),
+        vol.Optional(
+            CONF_DISCOVERY,
+            default=current.get(CONF_DISCOVERY, DEFAULT_DISCOVERY),
+        ): bool,
+        vol.Optional(
+            CONF_ENTITY_PROFILE,
+            default=current.get(CONF_ENTITY_PROFILE, DEFAULT_ENTITY_PROFILE),
+        ): vol.In(PROFILE_CHOICES),
+    }
+
+
+def _write_policy_schema(current: dict) -> dict:
+    """Options throttling the RSSI and heartbeat sensors."""
+    return {
+        vol.Optional(
+            CONF_DIAG_MIN_INTERVAL,
+            default=current.get(CONF_DIAG_MIN_INTERVAL, DEFAULT_DIAG_MIN_INTERVAL),
+        ): vol.All(int, vol.Range(min=0, max=3600)),
+        vol.Optional(
+            CONF_RSSI_DEADBAND,
+            default=current.get(CONF_RSSI_DEADBAND, DEFAULT_RSSI_DEADBAND),
+        ): vol.All(int, vol.Range(min=0, max=50)),
+        vol.Optional(
+            CONF_RSSI_AGGREGATE,
+            default=current.get(CONF_RSSI_AGGREGATE, DEFAULT_RSSI_AGGREGATE),
+        ): vol.In(AGGREGATE_CHOICES),
+        vol.Optional(
+            CONF_RSSI_WINDOW,
+            default=current.get(CONF_RSSI_WINDOW, DEFAULT_RSSI_WINDOW),
+        ): vol.All(int, vol.Range(min=5, max=3600)),
+    }
+
+
+def _fusion_schema(current: dict) -> dict:
+    """Options merging the same sensors heard under further receiver prefixes."""
+    return {
+        vol.Optional(
+            CONF_FUSION_PREFIXES,
+            default=current.get(CONF_FUSION_PREFIXES, DEFAULT_FUSION_PREFIXES),
+        ): str,
+        vol.Optional(
+            CONF_FUSION_WINDOW,
+            default=current.get(CONF_FUSION_WINDOW, DEFAULT_FUSION_WINDOW),
+        ): vol.All(int, vol.Range(min=0, max=5000)),
+    }
+
+
+def _configured_sensors(entries, exclude=None) -> set[str]:
+    """``{prefix}_{id}`` of every sensor served by ``entries``, other than ``exclude``.
+
+    Sensor entries are keyed by their unique id, receiver entries by each
+    sensor of their list under the receiver's prefix.
+    """
+    configured = set()
+    for entry in entries:
+        if exclude is not None and entry.entry_id == exclude.entry_id:
+            continue
+        if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_RECEIVER:
+            prefix = entry.options.get(CONF_PREFIX) or entry.data.get(CONF_PREFIX, DEFAULT_PREFIX)
+            configured.update(
+                f"{prefix}_{sensor[CONF_SENSOR_ID]}"
+                for sensor in entry.options.get(CONF_SENSORS, [])
+            )
+        elif entry.unique_id is not None:
+            configured.add(entry.unique_id)
+    return configured
+
+
+def _has_configured_sensor(entries, prefix: str, sensors: list[dict], exclude=None) -> bool:
+    """Whether a sensor of the list is already served by an entry among ``entries``."""
+    configured = _configured_sensors(entries, exclude)
+    return any(f"{prefix}_{s[CONF_SENSOR_ID]}" in configured for s in sensors)
+
+
+def _receiver_options(user_input: dict, sensors: list[dict]) -> dict:
+    return {
+        CONF_PREFIX: user_input.get(CONF_PREFIX, DEFAULT_PREFIX),
+        CONF_SENSORS: sensors,
+        CONF_AVAIL_MINUTES: user_input.get(CONF_AVAIL_MINUTES, DEFAULT_AVAIL_MINUTES),
+        CONF_AVAIL_TICK: user_input.get(CONF_AVAIL_TICK, DEFAULT_AVAIL_TICK),
+        CONF_INGEST_MODE: user_input.get(CONF_INGEST_MODE, DEFAULT_INGEST_MODE),
+        CONF_EVENTS_TOPIC: user_input.get(CONF_EVENTS_TOPIC, DEFAULT_EVENTS_TOPIC),
+        CONF_DEDUP_WINDOW: user_input.get(CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW),
+        CONF_DISCOVERY: user_input.get(CONF_DISCOVERY, DEFAULT_DISCOVERY),
+        CONF_ENTITY_PROFILE: user_input.get(CONF_ENTITY_PROFILE, DEFAULT_ENTITY_PROFILE),
+    }
+
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 3
 
     async def async_step_user(self, user_input=None) -> FlowResult:
+        return self.async_show_menu(
+            step_id="user", menu_options=[ENTRY_TYPE_SENSOR, ENTRY_TYPE_RECEIVER]
+        )
+
+    async def async_step_receiver(self, user_input=None) -> FlowResult:
+        """Set up many sensors sharing one prefix from a pasted list or CSV."""
+        errors = {}
+        current = user_input or {}
+        if user_input is not None:
+            prefix = user_input.get(CONF_PREFIX, DEFAULT_PREFIX)
+            try:
+                sensors = parse_sensor_list(
+                    user_input[CONF_SENSOR_LIST],
+                    user_input.get(CONF_DEVICE_TYPE, DEFAULT_DEVICE_TYPE),
+                    user_input.get(CONF_SENSOR_SOURCE, DEFAULT_SENSOR_SOURCE),
+                )
+            except ValueError:
+                errors[CONF_SENSOR_LIST] = "invalid_sensor_list"
+            else:
+                if not sensors:
+                    errors[CONF_SENSOR_LIST] = "no_sensors"
+                elif _has_configured_sensor(self._async_current_entries(), prefix, sensors):
+                    errors[CONF_SENSOR_LIST] = "sensor_already_configured"
+            if not errors:
+                await self.async_set_unique_id(f"{prefix}_{ENTRY_TYPE_RECEIVER}")
+                self._abort_if_unique_id_configured()
+                name = user_input.get(CONF_NAME) or f"Receiver {prefix}"
+                return self.async_create_entry(
+                    title=name,
+                    data={
+                        CONF_ENTRY_TYPE: ENTRY_TYPE_RECEIVER,
+                        CONF_NAME: name,
+                        CONF_PREFIX: prefix,
+                    },
+                    options=_receiver_options(user_input, sensors),
+                )
+
+        schema = vol.Schema({
+            vol.Optional(CONF_NAME): str,
+            **_receiver_options_schema(current),
+            vol.Optional(
+                CONF_DEVICE_TYPE, default=current.get(CONF_DEVICE_TYPE, DEFAULT_DEVICE_TYPE)
+            ): vol.In(DEVICE_CHOICES),
+            vol.Optional(
+                CONF_SENSOR_SOURCE,
+                default=current.get(CONF_SENSOR_SOURCE, DEFAULT_SENSOR_SOURCE),
+            ): vol.In(SOURCE_CHOICES),
+        })
+        return self.async_show_form(step_id="receiver", data_schema=schema, errors=errors)
+
+    async def async_step_integration_discovery(self, discovery_info: dict) -> FlowResult:
+        """Offer a sensor id heard on a prefix that no entry covers."""
+        sensor_id = discovery_info[CONF_SENSOR_ID]
+        prefix = discovery_info[CONF_PREFIX]
+        await self.async_set_unique_id(f"{prefix}_{sensor_id}")
+        self._abort_if_unique_id_configured()
+        self._discovered = discovery_info
+        self.context["title_placeholders"] = {CONF_SENSOR_ID: sensor_id}
+        return await self.async_step_discovery_confirm()
+
+    async def async_step_discovery_confirm(self, user_input=None) -> FlowResult:
+        info = self._discovered
+        if user_input is not None:
+            return await self.async_step_sensor({
+                **user_input,
+                CONF_SENSOR_ID: info[CONF_SENSOR_ID],
+                CONF_PREFIX: info[CONF_PREFIX],
+            })
+
+        schema = vol.Schema({
+            vol.Optional(CONF_NAME): str,
+            vol.Optional(CONF_DEVICE_TYPE, default=DEFAULT_DEVICE_TYPE): vol.In(DEVICE_CHOICES),
+            vol.Required(CONF_SENSOR_SOURCE, default=DEFAULT_SENSOR_SOURCE): vol.In(SOURCE_CHOICES),
+        })
+        return self.async_show_form(
+            step_id="discovery_confirm",
+            data_schema=schema,
+            description_placeholders={
+                CONF_SENSOR_ID: info[CONF_SENSOR_ID],
+                CONF_PREFIX: info[CONF_PREFIX],
+            },
+        )
+
+    async def async_step_sensor(self, user_input=None) -> FlowResult:
         schema = vol.Schema({
             vol.Required(CONF_SENSOR_ID, description={"suggested_value": "502442"}): str,
             vol.Optional(CONF_NAME): str,
@@ -45,14 +354,24 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Required(CONF_SENSOR_SOURCE): vol.In(
                 [SENSOR_SOURCE_EXTERNAL, SENSOR_SOURCE_INTERNAL]
             ),
+            vol.Optional(CONF_INGEST_MODE, default=DEFAULT_INGEST_MODE): vol.In(INGEST_CHOICES),
+            vol.Optional(CONF_EVENTS_TOPIC, default=DEFAULT_EVENTS_TOPIC): str,
+            vol.Optional(
+                CONF_DEDUP_WINDOW, default=DEFAULT_DEDUP_WINDOW
+            ): vol.All(int, vol.Range(min=0, max=60)),
         })
 
+        errors = {}
         if user_input is not None:
             sensor_id = user_input[CONF_SENSOR_ID].strip()
             prefix = user_input.get(CONF_PREFIX, DEFAULT_PREFIX)
             combined_id = f"{prefix}_{sensor_id}"
             await self.async_set_unique_id(combined_id)
             self._abort_if_unique_id_configured()
+            if combined_id in _configured_sensors(self._async_current_entries()):
+                # A receiver already serves the id; two hubs would collide in its router
+                errors[CONF_SENSOR_ID] = "sensor_already_configured"
+        if user_input is not None and not errors:
             return self.async_create_entry(
                 title=user_input.get(CONF_NAME) or f"MQTT Sensor {sensor_id}",
                 data={
@@ -72,10 +391,19 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_AVAIL_TICK, DEFAULT_AVAIL_TICK
                     ),
                     CONF_SENSOR_SOURCE: user_input[CONF_SENSOR_SOURCE],
+                    CONF_INGEST_MODE: user_input.get(
+                        CONF_INGEST_MODE, DEFAULT_INGEST_MODE
+                    ),
+                    CONF_EVENTS_TOPIC: user_input.get(
+                        CONF_EVENTS_TOPIC, DEFAULT_EVENTS_TOPIC
+                    ),
+                    CONF_DEDUP_WINDOW: user_input.get(
+                        CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW
+                    ),
                 },
             )
 
-        return self.async_show_form(step_id="user", data_schema=schema)
+        return self.async_show_form(step_id="sensor", data_schema=schema, errors=errors)
 
     @staticmethod
     def async_get_options_flow(config_entry):
@@ -86,6 +414,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         self.entry = entry
 
     async def async_step_init(self, user_input=None) -> FlowResult:
+        if self.entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_RECEIVER:
+            return await self.async_step_receiver()
         current = {**self.entry.data, **self.entry.options}
         schema = vol.Schema({
             vol.Optional(
@@ -106,6 +436,35 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             vol.Required(CONF_SENSOR_SOURCE): vol.In(
                 [SENSOR_SOURCE_EXTERNAL, SENSOR_SOURCE_INTERNAL]
             ),
+            vol.Optional(
+                CONF_INGEST_MODE,
+                default=current.get(CONF_INGEST_MODE, DEFAULT_INGEST_MODE),
+            ): vol.In(INGEST_CHOICES),
+            vol.Optional(
+                CONF_EVENTS_TOPIC,
+                default=current.get(CONF_EVENTS_TOPIC, DEFAULT_EVENTS_TOPIC),
+            ): str,
+            vol.Optional(
+                CONF_DEDUP_WINDOW,
+                default=current.get(CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW),
+            ): vol.All(int, vol.Range(min=0, max=60)),
+            vol.Optional(
+                CONF_DIRECT_DISPATCH,
+                default=current.get(CONF_DIRECT_DISPATCH, DEFAULT_DIRECT_DISPATCH),
+            ): bool,
+            vol.Optional(
+                CONF_DISCOVERY,
+                default=current.get(CONF_DISCOVERY, DEFAULT_DISCOVERY),
+            ): bool,
+            vol.Optional(
+                CONF_ENTITY_PROFILE,
+                default=current.get(CONF_ENTITY_PROFILE, DEFAULT_ENTITY_PROFILE),
+            ): vol.In(PROFILE_CHOICES),
+            **_fusion_schema(current),
+            **_write_policy_schema(current),
+            vol.Optional(
+                CONF_CAPTURE, default=current.get(CONF_CAPTURE, DEFAULT_CAPTURE)
+            ): bool,
         })
 
         if user_input is not None:
@@ -113,6 +472,55 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
         return self.async_show_form(step_id="init", data_schema=schema)
 
+    async def async_step_receiver(self, user_input=None) -> FlowResult:
+        """Edit the sensor list and shared settings of a receiver entry."""
+        errors = {}
+        if user_input is not None:
+            try:
+                sensors = parse_sensor_list(user_input[CONF_SENSOR_LIST])
+            except ValueError:
+                errors[CONF_SENSOR_LIST] = "invalid_sensor_list"
+            else:
+                prefix = user_input.get(CONF_PREFIX, DEFAULT_PREFIX)
+                if not sensors:
+                    errors[CONF_SENSOR_LIST] = "no_sensors"
+                elif _has_configured_sensor(
+                    self.hass.config_entries.async_entries(DOMAIN), prefix, sensors, self.entry
+                ):
+                    # Two hubs for one id would collide in the prefix router
+                    errors[CONF_SENSOR_LIST] = "sensor_already_configured"
+            if not errors:
+                options = _receiver_options(user_input, sensors)
+                options[CONF_DIRECT_DISPATCH] = user_input.get(
+                    CONF_DIRECT_DISPATCH, DEFAULT_DIRECT_DISPATCH
+                )
+                options[CONF_CAPTURE] = user_input.get(CONF_CAPTURE, DEFAULT_CAPTURE)
+                options.update(
+                    (key, user_input[key])
+                    for key in (*FUSION_KEYS, *WRITE_POLICY_KEYS)
+                    if key in user_input
+                )
+                return self.async_create_entry(title="", data=options)
+
+        current = user_input or {
+            **self.entry.data,
+            **self.entry.options,
+            CONF_SENSOR_LIST: format_sensor_list(self.entry.options.get(CONF_SENSORS, [])),
+        }
+        schema = vol.Schema({
+            **_receiver_options_schema(current),
+            vol.Optional(
+                CONF_DIRECT_DISPATCH,
+                default=current.get(CONF_DIRECT_DISPATCH, DEFAULT_DIRECT_DISPATCH),
+            ): bool,
+            **_fusion_schema(current),
+            **_write_policy_schema(current),
+            vol.Optional(
+                CONF_CAPTURE, default=current.get(CONF_CAPTURE, DEFAULT_CAPTURE)
+            ): bool,
+        })
+        return self.async_show_form(step_id="receiver", data_schema=schema, errors=errors)
+
 
 async def async_migrate_entry(hass, config_entry: config_entries.ConfigEntry) -> bool:
     """Migrate old config entries to the new unique ID format."""
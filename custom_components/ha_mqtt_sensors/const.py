@@ -6,6 +6,13 @@ CONF_NAME = "name"
 CONF_PREFIX = "topic_prefix"
 DEFAULT_PREFIX = "sensors_345"
 
+# Entry type: one sensor per entry, or a receiver holding a list of sensors
+CONF_ENTRY_TYPE = "entry_type"  # "sensor" | "receiver"
+ENTRY_TYPE_SENSOR = "sensor"
+ENTRY_TYPE_RECEIVER = "receiver"
+CONF_SENSORS = "sensors"  # receiver options: list of per-sensor dicts
+CONF_SENSOR_LIST = "sensor_list"  # pasted list or CSV in the receiver forms
+
 # Device type & availability options
 CONF_DEVICE_TYPE = "device_type"           # "door" | "window" | "leak"
 DEFAULT_DEVICE_TYPE = "window"
@@ -20,6 +27,48 @@ SENSOR_SOURCE_EXTERNAL = "external"
 SENSOR_SOURCE_INTERNAL = "internal"
 DEFAULT_SENSOR_SOURCE = SENSOR_SOURCE_INTERNAL
 
+# Ingest mode: per-field topics under <prefix>/<id>/ or rtl_433 JSON events
+CONF_INGEST_MODE = "ingest_mode"  # "fields" | "events"
+INGEST_MODE_FIELDS = "fields"
+INGEST_MODE_EVENTS = "events"
+DEFAULT_INGEST_MODE = INGEST_MODE_FIELDS
+CONF_EVENTS_TOPIC = "events_topic"
+DEFAULT_EVENTS_TOPIC = "rtl_433/+/events"
+
+# Suppress radio retransmissions of an identical packet within this window
+CONF_DEDUP_WINDOW = "dedup_window_seconds"
+DEFAULT_DEDUP_WINDOW = 2
+
+# Call entity listeners straight from the hub instead of the HA dispatcher
+CONF_DIRECT_DISPATCH = "direct_dispatch"
+DEFAULT_DIRECT_DISPATCH = False
+
+# Offer a discovery flow for unconfigured sensor ids heard on the prefix
+CONF_DISCOVERY = "discovery"
+DEFAULT_DISCOVERY = False
+DISCOVERY_MAX_IDS = 128  # unknown ids remembered per prefix (least recently heard dropped)
+DISCOVERY_INTERVAL_SECONDS = 10  # minimum spacing between discovery flows per prefix
+
+# Multi-receiver fusion: further prefixes publishing the same sensors
+CONF_FUSION_PREFIXES = "fusion_prefixes"  # comma-separated
+DEFAULT_FUSION_PREFIXES = ""
+CONF_FUSION_WINDOW = "fusion_window_ms"
+DEFAULT_FUSION_WINDOW = 500
+
+# Write policy for high-churn diagnostic sensors (RSSI, heartbeat)
+CONF_DIAG_MIN_INTERVAL = "diagnostic_min_interval_seconds"
+DEFAULT_DIAG_MIN_INTERVAL = 0
+CONF_RSSI_DEADBAND = "rssi_deadband"
+DEFAULT_RSSI_DEADBAND = 3
+CONF_RSSI_AGGREGATE = "rssi_aggregate"  # "last" | "mean" | "min" | "max"
+AGGREGATE_LAST = "last"
+AGGREGATE_MEAN = "mean"
+AGGREGATE_MIN = "min"
+AGGREGATE_MAX = "max"
+DEFAULT_RSSI_AGGREGATE = AGGREGATE_LAST
+CONF_RSSI_WINDOW = "rssi_window_seconds"
+DEFAULT_RSSI_WINDOW = 60
+
 # Deprecated options kept for migration
 CONF_USE_EXTERNAL = "use_external_sensor"
 CONF_USE_INTERNAL = "use_internal_sensor"
@@ -41,8 +90,90 @@ TOPIC_HEARTBEAT = "heartbeat"
 TOPIC_MIC = "mic"
 TOPIC_RSSI = "rssi"
 
+# JSON keys taken from an rtl_433 event; they match the per-field subtopics
+EVENT_FIELDS = (
+    TOPIC_TIME, TOPIC_ID, TOPIC_CHANNEL, TOPIC_EVENT, TOPIC_STATE,
+    TOPIC_CONTACT, TOPIC_REED, TOPIC_ALARM, TOPIC_TAMPER, TOPIC_BATTOK,
+    TOPIC_HEARTBEAT, TOPIC_MIC, TOPIC_RSSI,
+)
+
+# Runtime counters: messages per suffix (anything else counts as "other";
+# events-mode JSON documents as "json") and upper bounds, in microseconds, of
+# the ``_cb`` processing-time histogram buckets
+COUNTED_SUFFIXES = (*EVENT_FIELDS, "snr", "noise", "freq", "mod", "json")
+CB_TIME_BUCKETS_US = (5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# Unique-id suffixes, per platform, of the entities whose stored state seeds the hub
+RESTORE_SUFFIXES = {
+    "binary_sensor": ("contact", TOPIC_TAMPER, "battery", TOPIC_ALARM, "availability"),
+    "sensor": (
+        "last_seen", TOPIC_EVENT, TOPIC_CHANNEL, TOPIC_HEARTBEAT, TOPIC_RSSI,
+        TOPIC_STATE, TOPIC_MIC, TOPIC_ID,
+    ),
+}
+
+# Entity profile: which entities each sensor gets.  The fields of the
+# entities a profile leaves out are attributes of one "details" entity.
+CONF_ENTITY_PROFILE = "entity_profile"  # "full" | "standard" | "minimal"
+PROFILE_FULL = "full"
+PROFILE_STANDARD = "standard"
+PROFILE_MINIMAL = "minimal"
+DEFAULT_ENTITY_PROFILE = PROFILE_FULL
+SUFFIX_DETAILS = "details"
+# Unique-id suffixes of the entities a profile does not create
+PROFILE_DROPPED = {
+    PROFILE_FULL: frozenset({SUFFIX_DETAILS}),
+    PROFILE_STANDARD: frozenset({TOPIC_CHANNEL, TOPIC_HEARTBEAT, TOPIC_STATE, TOPIC_MIC, TOPIC_ID}),
+    PROFILE_MINIMAL: frozenset({
+        TOPIC_TAMPER, TOPIC_ALARM, "last_seen", TOPIC_EVENT, TOPIC_CHANNEL, TOPIC_HEARTBEAT,
+        TOPIC_RSSI, TOPIC_STATE, TOPIC_MIC, TOPIC_ID,
+        "rssi_mean", "rssi_stddev", "rssi_p10", "packets_per_hour", "packet_loss",
+    }),
+}
+# Fields the details entity can carry, in attribute order
+DETAIL_FIELDS = (
+    TOPIC_EVENT, TOPIC_TAMPER, TOPIC_ALARM, TOPIC_RSSI, TOPIC_CHANNEL, TOPIC_HEARTBEAT,
+    TOPIC_STATE, TOPIC_MIC, TOPIC_ID,
+)
+
+# Fields that differ between retransmissions of the same radio packet
+DEDUP_IGNORED_FIELDS = frozenset({TOPIC_TIME, TOPIC_RSSI, "snr", "noise", "freq", "mod"})
+
 SIG_UPDATE = "ha_mqtt_sensors_update"
+DATA_ROUTERS = f"{DOMAIN}_routers"
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+DATA_TIME_ZONE = f"{DOMAIN}_time_zone"
+DATA_SNAPSHOT = f"{DOMAIN}_snapshot"
+DATA_CAPTURES = f"{DOMAIN}_captures"
 SUFFIX_AVAILABILITY = "availability"
+SUFFIX_PACKET = "packet"
+SUFFIX_STATS = "stats"
+SUFFIX_OPTIONS = "options"
+
+# Raw MQTT capture per config entry, written to <config>/ha_mqtt_sensors/captures/<entry_id>.cap
+CONF_CAPTURE = "capture"
+DEFAULT_CAPTURE = False
+CAPTURE_MAX_BYTES = 8 * 1024 * 1024  # rotate the capture file beyond this size
+CAPTURE_BACKUPS = 2  # rotated files kept as .1, .2, ...
+CAPTURE_FLUSH_SECONDS = 5  # buffered records are written at most this late
+CAPTURE_BUFFER_BYTES = 64 * 1024  # or as soon as this much is buffered
+
+# Rolling link statistics per sensor
+STATS_CAPACITY = 64  # samples kept per ring buffer
+STATS_PUSH_SECONDS = 300  # minimum spacing of statistics sensor updates
+HEARTBEAT_INTERVAL_SECONDS = 3600  # nominal supervision interval of a 345 MHz sensor
+
+# rtl_433 publishes a packet as a burst of per-field messages within a few
+# milliseconds; a burst is considered complete after this much silence.
+PACKET_QUIET_SECONDS = 0.25
+
+# Delay before a failed <prefix>/+/+ subscription is attempted again
+SUBSCRIBE_RETRY_SECONDS = 30
+
+# Last-known packet of every sensor, kept in one storage file
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshot"
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 300  # seconds; pending data is also written on shutdown
 
 # Normalized text states for contact sensors
 CONTACT_OPEN_STATES = {"open", "opened", "wet", "leak"}
@@ -54,3 +185,19 @@ CONTACT_CLOSED_STATES = {"close", "closed", "dry"}
 # contact entity can normalize them.
 CONTACT_OPEN_EVENTS = {160, 168, 192, 200, 232}
 CONTACT_CLOSED_EVENTS = {128, 40, 64, 104}
+
+# Bit layout of the Honeywell 345 event byte as decoded by rtl_433.  Contact
+# state is taken from the observed code sets above rather than a single bit.
+EVENT_BIT_TAMPER = 0x40
+EVENT_BIT_REED = 0x20
+EVENT_BIT_ALARM = 0x10
+EVENT_BIT_BATTERY_LOW = 0x08
+EVENT_BIT_HEARTBEAT = 0x04
+
+# Options applied to the live hubs and entities; changing any other option
+# (prefix, device type, ingest mode, sensor list, ...) reloads the entry
+HOT_OPTIONS = frozenset({
+    CONF_AVAIL_MINUTES, CONF_AVAIL_TICK, CONF_SENSOR_SOURCE, CONF_DEDUP_WINDOW,
+    CONF_FUSION_WINDOW, CONF_DIAG_MIN_INTERVAL, CONF_RSSI_DEADBAND,
+    CONF_RSSI_AGGREGATE, CONF_RSSI_WINDOW,
+})
@@ -0,0 +1,57 @@
+"""Diagnostics for HA MQTT Sensors: runtime counters and link statistics per sensor."""
+from __future__ import annotations
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from . import MqttHub, async_entry_hubs
+from .const import DOMAIN
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 2)
+
+
+def _hub_diagnostics(hub: MqttHub) -> dict:
+    last = hub.last_seen_utc
+    stats = hub.stats
+    return {
+        "sensor_id": hub.sensor_id,
+        "prefixes": list(hub.prefixes),
+        "ingest_mode": hub.ingest_mode,
+        "online": hub.online,
+        "last_seen_utc": last.isoformat() if last else None,
+        "receiver": hub.receiver,
+        "packets": {
+            "accepted": hub.packets_accepted,
+            "suppressed": hub.packets_suppressed,
+            "replayed": hub.packets_replayed,
+            "fused": hub.packets_fused,
+        },
+        "counters": hub.counters.as_dict(hub.hass.loop.time()),
+        "link": {
+            "rssi_mean": _round(stats.rssi.mean),
+            "rssi_stddev": _round(stats.rssi.stddev),
+            "rssi_p10": _round(stats.rssi.percentile(10)),
+            "packets_per_hour": _round(stats.packets_per_hour),
+            "packet_loss": _round(stats.packet_loss),
+        },
+    }
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    return {
+        "data": dict(entry.data),
+        "options": dict(entry.options),
+        "sensors": [_hub_diagnostics(hub) for hub in async_entry_hubs(hass, entry)],
+    }
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry
+) -> dict:
+    combined_ids = {identifier for domain, identifier in device.identifiers if domain == DOMAIN}
+    for hub in async_entry_hubs(hass, entry):
+        if hub.combined_id in combined_ids:
+            return _hub_diagnostics(hub)
+    return {}
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from collections import OrderedDict
+from datetime import datetime
+
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import discovery_flow
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    CONF_SENSOR_ID,
+    CONF_PREFIX,
+    TOPIC_RSSI,
+    DISCOVERY_MAX_IDS,
+    DISCOVERY_INTERVAL_SECONDS,
+)
+
+
+class UnknownSensor:
+    """When an unconfigured sensor id was heard and its latest signal strength."""
+    __slots__ = ("first_seen", "last_seen", "rssi", "offered")
+
+    def __init__(self, now: datetime) -> None:
+        self.first_seen = now
+        self.last_seen = now
+        self.rssi: float | None = None
+        self.offered = False
+
+
+class DiscoveryTracker:
+    """Remember sensor ids heard on a prefix without a hub and offer each for setup.
+
+    Ids are kept in an LRU bounded by ``max_ids`` so a busy neighbourhood
+    cannot grow it without limit.  Each id gets at most one discovery flow
+    while it stays in the LRU, flows are spaced at least ``interval`` seconds
+    apart, and ids that already have an entry (including ignored ones) are
+    never offered.
+    """
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        prefix: str,
+        max_ids: int = DISCOVERY_MAX_IDS,
+        interval: float = DISCOVERY_INTERVAL_SECONDS,
+    ) -> None:
+        self.hass = hass
+        self.prefix = prefix
+        self.unknown: OrderedDict[str, UnknownSensor] = OrderedDict()
+        self._max_ids = max_ids
+        self._interval = interval
+        self._next_flow = float("-inf")  # loop time the next flow may start
+
+    @callback
+    def async_seen(self, sensor_id: str, suffix: str, payload) -> None:
+        """Record a message for an unconfigured ``sensor_id``."""
+        now = dt_util.utcnow()
+        unknown = self.unknown
+        seen = unknown.get(sensor_id)
+        if seen is None:
+            seen = unknown[sensor_id] = UnknownSensor(now)
+            if len(unknown) > self._max_ids:
+                unknown.popitem(last=False)
+        else:
+            seen.last_seen = now
+            unknown.move_to_end(sensor_id)
+        if suffix == TOPIC_RSSI:
+            try:
+                seen.rssi = float(payload.decode() if isinstance(payload, bytes) else payload)
+            except ValueError:
+                pass
+        if not seen.offered:
+            self._async_offer(sensor_id, seen)
+
+    @callback
+    def _async_offer(self, sensor_id: str, seen: UnknownSensor) -> None:
+        loop_now = self.hass.loop.time()
+        if loop_now < self._next_flow:
+            return
+        seen.offered = True
+        unique_id = f"{self.prefix}_{sensor_id}"
+        if self.hass.config_entries.async_entry_for_domain_unique_id(DOMAIN, unique_id):
+            # Configured elsewhere or dismissed by the user
+            return
+        self._next_flow = loop_now + self._interval
+        discovery_flow.async_create_flow(
+            self.hass,
+            DOMAIN,
+            context={"source": SOURCE_INTEGRATION_DISCOVERY},
+            data={
+                CONF_SENSOR_ID: sensor_id,
+                CONF_PREFIX: self.prefix,
+                TOPIC_RSSI: seen.rssi,
+            },
+        )
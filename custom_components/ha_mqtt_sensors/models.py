@@ -0,0 +1,153 @@
+from __future__ import annotations
+from datetime import datetime
+
+from .const import (
+    TOPIC_TIME, TOPIC_ID, TOPIC_CHANNEL, TOPIC_EVENT, TOPIC_STATE,
+    TOPIC_CONTACT, TOPIC_REED, TOPIC_ALARM, TOPIC_TAMPER, TOPIC_BATTOK,
+    TOPIC_HEARTBEAT, TOPIC_MIC, TOPIC_RSSI,
+    CONTACT_OPEN_STATES, CONTACT_CLOSED_STATES,
+)
+from .util import EventFlags, decode_event, parse_datetime_utc
+
+
+def _to_text(raw) -> str:
+    return raw if isinstance(raw, str) else str(raw)
+
+
+def _to_int(raw) -> int | None:
+    if type(raw) is int:
+        return raw
+    raw = _to_text(raw)
+    try:
+        return int(raw)
+    except ValueError:
+        pass
+    try:
+        return int(raw, 0)
+    except ValueError:
+        return None
+
+
+def _to_float(raw) -> float | None:
+    if type(raw) is float:
+        return raw
+    if type(raw) is int:
+        return float(raw)
+    try:
+        return float(_to_text(raw))
+    except ValueError:
+        return None
+
+
+def _to_flag(raw) -> bool:
+    return raw == "1" or raw == 1
+
+
+def _to_battery_ok(raw) -> bool:
+    # Only an explicit 0 reports a low battery
+    return raw != "0" and raw != 0
+
+
+def _state_open(text: str) -> bool | None:
+    text = text.lower()
+    if text in CONTACT_OPEN_STATES:
+        return True
+    if text in CONTACT_CLOSED_STATES:
+        return False
+    return None
+
+
+# Converter applied once at ingest for every field backing an entity
+_PARSERS = {
+    TOPIC_TIME: _to_text,
+    TOPIC_ID: _to_text,
+    TOPIC_CHANNEL: _to_int,
+    TOPIC_EVENT: _to_int,
+    TOPIC_STATE: _to_text,
+    TOPIC_CONTACT: _to_flag,
+    TOPIC_REED: _to_flag,
+    TOPIC_ALARM: _to_flag,
+    TOPIC_TAMPER: _to_flag,
+    TOPIC_BATTOK: _to_battery_ok,
+    TOPIC_HEARTBEAT: _to_int,
+    TOPIC_MIC: _to_text,
+    TOPIC_RSSI: _to_float,  # rtl_433 reports dB with decimals, e.g. -12.345
+}
+
+
+class SensorRecord:
+    """Latest value of every rtl_433 field for one sensor, stored as native types.
+
+    Attribute names match the MQTT subtopics.  Values are converted once by
+    ``set`` so entity properties are plain attribute loads; ``None`` means the
+    field has not been received.  Subtopics without a parser are kept as text
+    in ``extra``.  ``time`` stays text; its UTC datetime is memoized by
+    ``time_utc`` together with the string it was parsed from.  A received
+    ``event`` is also decoded into ``event_flags``.
+    """
+    __slots__ = (
+        *_PARSERS, "state_open", "event_flags", "extra", "_time_utc", "_time_utc_raw",
+    )
+
+    def __init__(self) -> None:
+        for name in _PARSERS:
+            setattr(self, name, None)
+        self.state_open: bool | None = None  # ``state`` text normalized to open/closed
+        self.event_flags: EventFlags | None = None
+        self.extra: dict[str, str] = {}
+        self._time_utc: datetime | None = None
+        self._time_utc_raw: str | None = None
+
+    def set(self, suffix: str, raw) -> bool:
+        """Store ``raw`` for ``suffix`` and return whether the value changed."""
+        parser = _PARSERS.get(suffix)
+        if parser is None:
+            value = _to_text(raw)
+            if self.extra.get(suffix) == value:
+                return False
+            self.extra[suffix] = value
+            return True
+        value = parser(raw)
+        if getattr(self, suffix) == value:
+            return False
+        setattr(self, suffix, value)
+        if suffix == TOPIC_EVENT:
+            self.event_flags = decode_event(value)
+        elif suffix == TOPIC_STATE:
+            self.state_open = _state_open(value)
+        return True
+
+    def get(self, suffix: str):
+        if suffix in _PARSERS:
+            return getattr(self, suffix)
+        return self.extra.get(suffix)
+
+    def snapshot(self) -> dict:
+        """Return every received field as JSON-serializable typed values."""
+        fields = {name: getattr(self, name) for name in _PARSERS if getattr(self, name) is not None}
+        fields.update(self.extra)
+        return fields
+
+    def load_snapshot(self, fields: dict, decode_flags: bool = True) -> None:
+        """Restore fields saved by ``snapshot`` without re-parsing them.
+
+        ``decode_flags`` is false when the stored ``event`` is a stand-in
+        rather than a received code.
+        """
+        for name, value in fields.items():
+            if name in _PARSERS:
+                setattr(self, name, value)
+            else:
+                self.extra[name] = value
+        if decode_flags:
+            self.event_flags = decode_event(self.event)
+        if self.state is not None:
+            self.state_open = _state_open(self.state)
+
+    def time_utc(self, hass) -> datetime | None:
+        """Return ``time`` as an aware UTC datetime, parsing each string once."""
+        raw = self.time
+        if raw != self._time_utc_raw:
+            self._time_utc = parse_datetime_utc(hass, raw)
+            self._time_utc_raw = raw
+        return self._time_utc
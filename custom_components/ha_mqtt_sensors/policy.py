@@ -0,0 +1,132 @@
+from __future__ import annotations
+from statistics import fmean
+from typing import Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    AGGREGATE_LAST,
+    AGGREGATE_MEAN,
+    AGGREGATE_MIN,
+    AGGREGATE_MAX,
+)
+
+_AGGREGATES: dict[str, Callable[[list[float]], float]] = {
+    AGGREGATE_MEAN: lambda samples: round(fmean(samples), 1),
+    AGGREGATE_MIN: min,
+    AGGREGATE_MAX: max,
+}
+
+
+class WritePolicy:
+    """Decide when a numeric sensor publishes a new value.
+
+    A value is published only when it differs from the published one by at
+    least ``deadband`` and at least ``min_interval`` seconds have passed
+    since the last write; a value held back by the interval is written when
+    it expires.  With an ``aggregate`` other than ``last``, samples are
+    collected for ``window`` seconds and their mean, min or max is offered
+    instead.
+    """
+    def __init__(
+        self,
+        min_interval: float = 0,
+        deadband: float = 0,
+        aggregate: str = AGGREGATE_LAST,
+        window: float = 0,
+    ) -> None:
+        self.min_interval = min_interval
+        self.deadband = deadband
+        self.aggregate = aggregate
+        self.window = window
+        self.value: float | None = None  # last published value
+        self._hass: HomeAssistant | None = None
+        self._write: Callable[[], None] | None = None
+        self._published_at = float("-inf")
+        self._samples: list[float] = []
+        self._window_handle = None
+        self._pending: float | None = None
+        self._pending_handle = None
+
+    @callback
+    def async_start(self, hass: HomeAssistant, write: Callable[[], None], value) -> None:
+        """Begin publishing through ``write``, with ``value`` as already published."""
+        self._hass = hass
+        self._write = write
+        self.value = value
+
+    @callback
+    def async_stop(self) -> None:
+        for handle in (self._window_handle, self._pending_handle):
+            if handle:
+                handle.cancel()
+        self._window_handle = self._pending_handle = None
+        self._samples.clear()
+        self._pending = None
+
+    @callback
+    def async_configure(
+        self,
+        min_interval: float = 0,
+        deadband: float = 0,
+        aggregate: str = AGGREGATE_LAST,
+        window: float = 0,
+    ) -> None:
+        """Change the settings of a started policy.
+
+        An open aggregation window is closed under the old settings, and a
+        held-back value is reconsidered under the new interval.
+        """
+        if (aggregate, window) != (self.aggregate, self.window) and self._window_handle:
+            self._window_handle.cancel()
+            self._async_close_window()
+        self.min_interval = min_interval
+        self.deadband = deadband
+        self.aggregate = aggregate
+        self.window = window
+        if self._pending_handle:
+            self._pending_handle.cancel()
+            self._async_flush_pending()
+
+    @callback
+    def async_offer(self, value) -> None:
+        """Consider a newly received value for publishing."""
+        if value is None:
+            return
+        if self.aggregate == AGGREGATE_LAST or self.aggregate not in _AGGREGATES:
+            self._async_consider(value)
+            return
+        self._samples.append(value)
+        if self._window_handle is None:
+            self._window_handle = self._hass.loop.call_later(self.window, self._async_close_window)
+
+    @callback
+    def _async_close_window(self) -> None:
+        self._window_handle = None
+        samples, self._samples = self._samples, []
+        if samples:
+            self._async_consider(_AGGREGATES[self.aggregate](samples))
+
+    @callback
+    def _async_consider(self, value) -> None:
+        published = self.value
+        if published is not None and (value == published or abs(value - published) < self.deadband):
+            self._pending = None
+            return
+        now = self._hass.loop.time()
+        wait = self._published_at + self.min_interval - now
+        if wait > 0:
+            self._pending = value
+            if self._pending_handle is None:
+                self._pending_handle = self._hass.loop.call_later(wait, self._async_flush_pending)
+            return
+        self.value = value
+        self._published_at = now
+        self._write()
+
+    @callback
+    def _async_flush_pending(self) -> None:
+        self._pending_handle = None
+        value, self._pending = self._pending, None
+        if value is not None:
+            self._async_consider(value)
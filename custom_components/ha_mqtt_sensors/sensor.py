@@ -1,43 +1,85 @@
 from __future__ import annotations
 from datetime import datetime, timedelta
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
-from homeassistant.helpers.entity import DeviceInfo
+from typing import Callable, Mapping
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt as dt_util
+from . import async_entry_hubs, async_profile_entities
 from .const import (
-    DOMAIN, CONF_NAME,
+    DOMAIN,
     TOPIC_TIME, TOPIC_EVENT, TOPIC_CHANNEL, TOPIC_HEARTBEAT,
-    TOPIC_STATE, TOPIC_MIC, TOPIC_ID, TOPIC_RSSI,
+    TOPIC_STATE, TOPIC_MIC, TOPIC_ID, TOPIC_RSSI, SUFFIX_STATS, SUFFIX_OPTIONS,
+    SUFFIX_DETAILS, DETAIL_FIELDS,
+    CONF_DIAG_MIN_INTERVAL, DEFAULT_DIAG_MIN_INTERVAL,
+    CONF_RSSI_DEADBAND, DEFAULT_RSSI_DEADBAND,
+    CONF_RSSI_AGGREGATE, DEFAULT_RSSI_AGGREGATE,
+    CONF_RSSI_WINDOW, DEFAULT_RSSI_WINDOW,
 )
-from .util import parse_datetime_utc
+from .policy import WritePolicy
+
+# name, unique suffix, device class, unit, value read from ``LinkStats``
+_LINK_STATS = (
+    ("RSSI Mean", "rssi_mean", SensorDeviceClass.SIGNAL_STRENGTH, "dB", lambda s: s.rssi.mean),
+    ("RSSI Std Dev", "rssi_stddev", None, "dB", lambda s: s.rssi.stddev),
+    ("RSSI P10", "rssi_p10", SensorDeviceClass.SIGNAL_STRENGTH, "dB", lambda s: s.rssi.percentile(10)),
+    ("Packets per Hour", "packets_per_hour", None, "packets/h", lambda s: s.packets_per_hour),
+    ("Packet Loss", "packet_loss", None, "%", lambda s: s.packet_loss),
+)
+
+# ``WritePolicy`` settings from the entry options
+def _rssi_settings(options: Mapping) -> dict:
+    return {
+        "min_interval": options.get(CONF_DIAG_MIN_INTERVAL, DEFAULT_DIAG_MIN_INTERVAL),
+        "deadband": options.get(CONF_RSSI_DEADBAND, DEFAULT_RSSI_DEADBAND),
+        "aggregate": options.get(CONF_RSSI_AGGREGATE, DEFAULT_RSSI_AGGREGATE),
+        "window": options.get(CONF_RSSI_WINDOW, DEFAULT_RSSI_WINDOW),
+    }
+
+def _heartbeat_settings(options: Mapping) -> dict:
+    return {"min_interval": options.get(CONF_DIAG_MIN_INTERVAL, DEFAULT_DIAG_MIN_INTERVAL)}
 
 async def async_setup_entry(hass, entry: ConfigEntry, async_add_entities):
-    hub = hass.data[DOMAIN][entry.entry_id]
-    base_name = entry.data[CONF_NAME]
-
-    dev_info = DeviceInfo(
-        identifiers={(DOMAIN, hub.combined_id)},
-        name=base_name,
-        manufacturer="345MHz Receiver",
-        model="Honeywell/345 Contact",
-    )
-
-    entities = [
-        LastSeenSensor(hub, entry, dev_info, f"{base_name} Last Seen"),
-        IntTopicSensor(hub, entry, dev_info, f"{base_name} Event", TOPIC_EVENT),
-        IntTopicSensor(hub, entry, dev_info, f"{base_name} Channel", TOPIC_CHANNEL),
-        IntTopicSensor(hub, entry, dev_info, f"{base_name} Heartbeat", TOPIC_HEARTBEAT),
-        SignalStrengthSensor(hub, entry, dev_info, f"{base_name} RSSI", TOPIC_RSSI),
-        TextTopicSensor(hub, entry, dev_info, f"{base_name} State Text", TOPIC_STATE),
-        TextTopicSensor(hub, entry, dev_info, f"{base_name} MIC", TOPIC_MIC),
-        TextTopicSensor(hub, entry, dev_info, f"{base_name} ID", TOPIC_ID),
-    ]
+    entities = []
+    for hub in async_entry_hubs(hass, entry):
+        base_name = hub.name
+        dev_info = DeviceInfo(
+            identifiers={(DOMAIN, hub.combined_id)},
+            name=base_name,
+            manufacturer="345MHz Receiver",
+            model="Honeywell/345 Contact",
+        )
+        sensors = [
+            LastSeenSensor(hub, entry, dev_info, f"{base_name} Last Seen"),
+            IntTopicSensor(hub, entry, dev_info, f"{base_name} Event", TOPIC_EVENT),
+            IntTopicSensor(hub, entry, dev_info, f"{base_name} Channel", TOPIC_CHANNEL),
+            IntTopicSensor(
+                hub, entry, dev_info, f"{base_name} Heartbeat", TOPIC_HEARTBEAT,
+                settings=_heartbeat_settings,
+            ),
+            SignalStrengthSensor(
+                hub, entry, dev_info, f"{base_name} RSSI", TOPIC_RSSI, settings=_rssi_settings
+            ),
+            TextTopicSensor(hub, entry, dev_info, f"{base_name} State Text", TOPIC_STATE),
+            TextTopicSensor(hub, entry, dev_info, f"{base_name} MIC", TOPIC_MIC),
+            TextTopicSensor(hub, entry, dev_info, f"{base_name} ID", TOPIC_ID),
+        ]
+        sensors += [
+            LinkStatSensor(hub, entry, dev_info, f"{base_name} {label}", *stat)
+            for label, *stat in _LINK_STATS
+        ]
+        sensors.append(DetailsSensor(hub, entry, dev_info, f"{base_name} Details"))
+        entities += async_profile_entities(hass, hub, "sensor", sensors)
     async_add_entities(entities)
 
 class _BaseSensor(RestoreEntity, SensorEntity):
+    """Sensor backed by the hub record.
+
+    ``RestoreEntity`` keeps the state stored across restarts; the hub reads
+    it back in ``MqttHub.async_restore`` before the entity is added.
+    """
     _attr_should_poll = False
 
     def __init__(self, hub, entry, dev_info: DeviceInfo, name: str, unique_suffix: str):
@@ -53,30 +95,36 @@ class _BaseSensor(RestoreEntity, SensorEntity):
             self._remove()
             self._remove = None
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._hub.counters.state_writes += 1
+        super().async_write_ha_state()
+
+    def _async_listen(self, *suffixes: str) -> None:
+        """Call ``_async_on_update`` once for every packet that changed one of ``suffixes``."""
+        @callback
+        def _on():
+            self._async_on_update()
+        self._remove = self._hub.async_listen(suffixes, _on)
+
+    @callback
+    def _async_on_update(self) -> None:
+        self.async_write_ha_state()
+
 class LastSeenSensor(_BaseSensor):
     _attr_device_class = SensorDeviceClass.TIMESTAMP
 
-    def __init__(self, hub, entry, dev_info, name):
-        super().__init__(hub, entry, dev_info, name, "last_seen")
+    def __init__(self, hub, entry, dev_info, name, unique_suffix: str = "last_seen"):
+        super().__init__(hub, entry, dev_info, name, unique_suffix)
+        self._suffixes: tuple[str, ...] = (TOPIC_TIME,)
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        last = await self.async_get_last_state()
-        if last and last.state != "unknown":
-            self._hub.states[TOPIC_TIME] = last.state
-            parsed = parse_datetime_utc(self.hass, last.state)
-            if parsed is not None:
-                self._hub._last_seen_utc = parsed
-        @callback
-        def _on(_payload: str):
-            self.async_write_ha_state()
-        self._remove = async_dispatcher_connect(self.hass, self._hub.signal_for(TOPIC_TIME), _on)
-        self.async_write_ha_state()
+        self._async_listen(*self._suffixes)
 
     @property
     def native_value(self):
-        val = self._hub.states.get(TOPIC_TIME)
-        parsed = parse_datetime_utc(self.hass, val)
+        parsed = self._hub.record.time_utc(self.hass)
         if parsed is None:
             return None
         now = dt_util.as_utc(dt_util.utcnow())
@@ -84,36 +132,94 @@ class LastSeenSensor(_BaseSensor):
             return now
         return parsed
 
+class DetailsSensor(LastSeenSensor):
+    """Last-seen time carrying, as attributes, the fields of the entities the profile drops.
+
+    Written at most once per packet, like any single entity.
+    """
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, hub, entry, dev_info, name):
+        super().__init__(hub, entry, dev_info, name, SUFFIX_DETAILS)
+        self._fields = tuple(field for field in DETAIL_FIELDS if field in hub.dropped_entities)
+        self._suffixes += self._fields
+
+    @property
+    def extra_state_attributes(self):
+        record = self._hub.record
+        return {field: record.get(field) for field in self._fields}
+
 class IntTopicSensor(_BaseSensor):
-    def __init__(self, hub, entry, dev_info, name, topic_suffix: str):
+    """Integer field; with a ``WritePolicy`` only values it publishes are written.
+
+    ``settings`` maps the entry options to the policy settings; the policy
+    is built from it and follows option changes applied in place.
+    """
+    def __init__(
+        self, hub, entry, dev_info, name, topic_suffix: str, policy: WritePolicy | None = None,
+        settings: Callable[[Mapping], dict] | None = None,
+    ):
         super().__init__(hub, entry, dev_info, name, topic_suffix)
         self._topic_suffix = topic_suffix
+        if policy is None and settings is not None:
+            policy = WritePolicy(**settings(entry.options))
+        self._policy = policy
+        self._settings = settings
+        self._remove_options = None
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        last = await self.async_get_last_state()
-        if last and last.state != "unknown":
-            self._hub.states[self._topic_suffix] = last.state
-        @callback
-        def _on(_payload: str):
-            self.async_write_ha_state()
-        self._remove = async_dispatcher_connect(self.hass, self._hub.signal_for(self._topic_suffix), _on)
+        if self._policy is not None:
+            self._policy.async_start(
+                self.hass, self._async_publish, self._hub.record.get(self._topic_suffix)
+            )
+        self._async_listen(self._topic_suffix)
+        if self._settings is not None:
+            self._remove_options = self._hub.async_listen(
+                (SUFFIX_OPTIONS,), self._async_options_updated
+            )
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        if self._remove_options:
+            self._remove_options()
+            self._remove_options = None
+        if self._policy is not None:
+            self._policy.async_stop()
+
+    @callback
+    def _async_options_updated(self) -> None:
+        self._policy.async_configure(**self._settings(self._entry.options))
+
+    @callback
+    def _async_publish(self) -> None:
         self.async_write_ha_state()
 
+    @callback
+    def _async_on_update(self) -> None:
+        if self._policy is None:
+            self.async_write_ha_state()
+        else:
+            self._policy.async_offer(self._hub.record.get(self._topic_suffix))
+
     @property
     def native_value(self):
-        v = self._hub.states.get(self._topic_suffix)
-        if v is None:
-            return None
-        try:
-            return int(v)
-        except ValueError:
-            return None
+        if self._policy is not None:
+            return self._policy.value
+        return self._hub.record.get(self._topic_suffix)
 
 class SignalStrengthSensor(IntTopicSensor):
     _attr_device_class = SensorDeviceClass.SIGNAL_STRENGTH
     _attr_native_unit_of_measurement = "dB"
 
+    def __init__(
+        self, hub, entry, dev_info, name, topic_suffix: str, policy: WritePolicy | None = None,
+        settings: Callable[[Mapping], dict] | None = None,
+    ):
+        if policy is None and settings is None:
+            policy = WritePolicy(deadband=DEFAULT_RSSI_DEADBAND)
+        super().__init__(hub, entry, dev_info, name, topic_suffix, policy, settings)
+
 class TextTopicSensor(_BaseSensor):
     def __init__(self, hub, entry, dev_info, name, topic_suffix: str):
         super().__init__(hub, entry, dev_info, name, topic_suffix)
@@ -121,15 +227,32 @@ class TextTopicSensor(_BaseSensor):
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        last = await self.async_get_last_state()
-        if last and last.state != "unknown":
-            self._hub.states[self._topic_suffix] = last.state
-        @callback
-        def _on(_payload: str):
-            self.async_write_ha_state()
-        self._remove = async_dispatcher_connect(self.hass, self._hub.signal_for(self._topic_suffix), _on)
-        self.async_write_ha_state()
+        self._async_listen(self._topic_suffix)
+
+    @property
+    def native_value(self):
+        return self._hub.record.get(self._topic_suffix)
+
+class LinkStatSensor(_BaseSensor):
+    """Rolling link statistic from ``MqttHub.stats``.
+
+    Written at most once per ``STATS_PUSH_SECONDS``, on the next accepted
+    packet, so the statistics never add writes to the packet path.
+    """
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, hub, entry, dev_info, name, unique_suffix, device_class, unit, value):
+        super().__init__(hub, entry, dev_info, name, unique_suffix)
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._value = value
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._async_listen(SUFFIX_STATS)
 
     @property
     def native_value(self):
-        return self._hub.states.get(self._topic_suffix)
+        value = self._value(self._hub.stats)
+        return None if value is None else round(value, 1)
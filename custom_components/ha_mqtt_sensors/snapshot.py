@@ -0,0 +1,85 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_SNAPSHOT,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+    SNAPSHOT_SAVE_DELAY,
+)
+
+if TYPE_CHECKING:
+    from . import MqttHub
+
+
+async def async_get_snapshot(hass: HomeAssistant) -> SnapshotStore:
+    """Return the integration-wide snapshot store, loading it on first use."""
+    snapshot = hass.data.get(DATA_SNAPSHOT)
+    if snapshot is None:
+        snapshot = hass.data[DATA_SNAPSHOT] = SnapshotStore(hass)
+    await snapshot.async_load()
+    return snapshot
+
+
+class SnapshotStore:
+    """Last-known packet of every sensor hub in a single storage file.
+
+    The file is read once at setup.  Saves are throttled to one per
+    ``SNAPSHOT_SAVE_DELAY`` seconds while packets arrive, and Home Assistant
+    writes any pending save on shutdown.  Live hubs are serialized when the
+    save runs; hubs that unloaded keep the snapshot taken at unload.
+    """
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._store = Store(hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY)
+        self._data: dict[str, dict] = {}
+        self._hubs: dict[str, MqttHub] = {}
+        self._loaded = False
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        if self._loaded:
+            return
+        # Concurrent callers share the Store's single read
+        data = await self._store.async_load()
+        if not self._loaded:
+            self._loaded = True
+            self._data = (data or {}).get("sensors", {})
+
+    def get(self, combined_id: str) -> dict | None:
+        return self._data.get(combined_id)
+
+    @callback
+    def async_register(self, hub: MqttHub) -> None:
+        self._hubs[hub.combined_id] = hub
+
+    @callback
+    def async_unregister(self, hub: MqttHub) -> None:
+        if self._hubs.get(hub.combined_id) is hub:
+            del self._hubs[hub.combined_id]
+            self._data[hub.combined_id] = hub.snapshot()
+            self.async_schedule_save()
+
+    @callback
+    def async_remove(self, combined_ids) -> None:
+        """Forget sensors whose config was removed."""
+        for combined_id in combined_ids:
+            self._data.pop(combined_id, None)
+        self.async_schedule_save()
+
+    @callback
+    def async_schedule_save(self) -> None:
+        # async_delay_save restarts its timer on every call, so only arm it once
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self._save_pending = False
+        for combined_id, hub in self._hubs.items():
+            self._data[combined_id] = hub.snapshot()
+        return {"sensors": self._data}
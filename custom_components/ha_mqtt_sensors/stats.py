@@ -0,0 +1,177 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from math import sqrt
+
+from .const import (
+    STATS_CAPACITY,
+    HEARTBEAT_INTERVAL_SECONDS,
+    COUNTED_SUFFIXES,
+    CB_TIME_BUCKETS_US,
+)
+
+_SUFFIX_SLOT = {suffix: slot for slot, suffix in enumerate(COUNTED_SUFFIXES)}
+_OTHER_SLOT = len(COUNTED_SUFFIXES)
+_BUCKET_BOUNDS_NS = tuple(bound * 1000 for bound in CB_TIME_BUCKETS_US)
+
+
+class RingStats:
+    """Fixed-capacity ring buffer of floats with running sum and sum of squares.
+
+    ``push`` is O(1) and only writes into a preallocated ``array``.  The
+    running sums are recomputed from the buffer each time it wraps so
+    floating-point drift cannot accumulate.
+    """
+    __slots__ = ("_values", "_capacity", "_index", "count", "total", "_total_sq")
+
+    def __init__(self, capacity: int = STATS_CAPACITY) -> None:
+        self._values = array("d", bytes(8 * capacity))
+        self._capacity = capacity
+        self._index = 0
+        self.count = 0
+        self.total = 0.0
+        self._total_sq = 0.0
+
+    def push(self, value: float) -> None:
+        values = self._values
+        index = self._index
+        if self.count == self._capacity:
+            old = values[index]
+            self.total -= old
+            self._total_sq -= old * old
+        else:
+            self.count += 1
+        values[index] = value
+        self.total += value
+        self._total_sq += value * value
+        index += 1
+        if index == self._capacity:
+            index = 0
+            self.total = sum(values)
+            self._total_sq = sum(v * v for v in values)
+        self._index = index
+
+    def clear(self) -> None:
+        self._index = self.count = 0
+        self.total = self._total_sq = 0.0
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    @property
+    def stddev(self) -> float | None:
+        count = self.count
+        if not count:
+            return None
+        mean = self.total / count
+        return sqrt(max(self._total_sq / count - mean * mean, 0.0))
+
+    def percentile(self, pct: float) -> float | None:
+        """Nearest-rank percentile; sorts a copy, so call it on read, not per sample."""
+        count = self.count
+        if not count:
+            return None
+        ordered = sorted(self._values[:count])
+        rank = max(1, -(-pct * count // 100))  # ceil without floats
+        return ordered[int(rank) - 1]
+
+
+class LinkStats:
+    """Rolling RSSI and packet timing for one sensor.
+
+    Heartbeat loss is estimated from the gaps between supervision packets:
+    a gap spanning ``n`` nominal intervals means ``n - 1`` were missed.
+    """
+    __slots__ = (
+        "rssi", "intervals", "heartbeat_expected", "_heartbeat_interval",
+        "_last_packet_at", "_last_heartbeat_at",
+    )
+
+    def __init__(
+        self,
+        capacity: int = STATS_CAPACITY,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL_SECONDS,
+    ) -> None:
+        self.rssi = RingStats(capacity)
+        self.intervals = RingStats(capacity)
+        self.heartbeat_expected = RingStats(capacity)  # intervals spanned per received heartbeat
+        self._heartbeat_interval = heartbeat_interval
+        self._last_packet_at: float | None = None
+        self._last_heartbeat_at: float | None = None
+
+    def add_packet(self, now: float, rssi: float | None, heartbeat: bool) -> None:
+        if rssi is not None:
+            self.rssi.push(rssi)
+        if self._last_packet_at is not None:
+            self.intervals.push(now - self._last_packet_at)
+        self._last_packet_at = now
+        if heartbeat:
+            if self._last_heartbeat_at is not None:
+                spanned = round((now - self._last_heartbeat_at) / self._heartbeat_interval)
+                self.heartbeat_expected.push(max(spanned, 1))
+            self._last_heartbeat_at = now
+
+    @property
+    def packets_per_hour(self) -> float | None:
+        intervals = self.intervals
+        if not intervals.count or intervals.total <= 0:
+            return None
+        return 3600 * intervals.count / intervals.total
+
+    @property
+    def packet_loss(self) -> float | None:
+        """Percentage of expected heartbeats that were not received."""
+        expected = self.heartbeat_expected
+        if not expected.count:
+            return None
+        return 100 * (1 - expected.count / expected.total)
+
+
+class HubCounters:
+    """Always-on runtime counters for one hub.
+
+    Message counts per suffix and the ``_cb`` time histogram live in
+    preallocated ``array`` slots, so counting never grows a container.
+    ``as_dict`` renders them for diagnostics.
+    """
+    __slots__ = (
+        "messages", "cb_time", "decode_failures", "empty_suffix", "dispatches",
+        "state_writes", "last_message_at",
+    )
+
+    def __init__(self) -> None:
+        self.messages = array("Q", bytes(8 * (len(COUNTED_SUFFIXES) + 1)))
+        self.cb_time = array("Q", bytes(8 * (len(CB_TIME_BUCKETS_US) + 1)))
+        self.decode_failures = 0
+        self.empty_suffix = 0
+        self.dispatches = 0
+        self.state_writes = 0
+        self.last_message_at: float | None = None  # loop time
+
+    def count_message(self, suffix: str, now: float) -> None:
+        self.messages[_SUFFIX_SLOT.get(suffix, _OTHER_SLOT)] += 1
+        self.last_message_at = now
+
+    def observe_cb(self, elapsed_ns: int) -> None:
+        self.cb_time[bisect_left(_BUCKET_BOUNDS_NS, elapsed_ns)] += 1
+
+    def as_dict(self, now: float) -> dict:
+        messages = {
+            suffix: count
+            for suffix, count in zip((*COUNTED_SUFFIXES, "other"), self.messages)
+            if count
+        }
+        labels = [f"<={bound}us" for bound in CB_TIME_BUCKETS_US]
+        labels.append(f">{CB_TIME_BUCKETS_US[-1]}us")
+        last = self.last_message_at
+        return {
+            "messages": messages,
+            "messages_total": sum(self.messages),
+            "decode_failures": self.decode_failures,
+            "empty_suffix_drops": self.empty_suffix,
+            "dispatches": self.dispatches,
+            "state_writes": self.state_writes,
+            "last_message_age_seconds": None if last is None else round(now - last, 3),
+            "cb_time_histogram": dict(zip(labels, self.cb_time)),
+        }
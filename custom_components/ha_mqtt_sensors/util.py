@@ -1,30 +1,122 @@
 from __future__ import annotations
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import NamedTuple
 from homeassistant.util import dt as dt_util
 
+from .const import (
+    DATA_TIME_ZONE,
+    CONTACT_OPEN_EVENTS,
+    CONTACT_CLOSED_EVENTS,
+    EVENT_BIT_TAMPER,
+    EVENT_BIT_REED,
+    EVENT_BIT_ALARM,
+    EVENT_BIT_BATTERY_LOW,
+    EVENT_BIT_HEARTBEAT,
+)
+
+
+class EventFlags(NamedTuple):
+    """Flags carried by a Honeywell 345 event code."""
+    contact: bool | None  # None when the code is not a known open/closed code
+    tamper: bool
+    reed: bool
+    alarm: bool
+    battery_low: bool
+    heartbeat: bool
+
+
+def _decode_event(code: int) -> EventFlags:
+    if code in CONTACT_OPEN_EVENTS:
+        contact = True
+    elif code in CONTACT_CLOSED_EVENTS:
+        contact = False
+    else:
+        contact = None
+    return EventFlags(
+        contact,
+        bool(code & EVENT_BIT_TAMPER),
+        bool(code & EVENT_BIT_REED),
+        bool(code & EVENT_BIT_ALARM),
+        bool(code & EVENT_BIT_BATTERY_LOW),
+        bool(code & EVENT_BIT_HEARTBEAT),
+    )
+
+
+EVENT_TABLE: tuple[EventFlags, ...] = tuple(_decode_event(code) for code in range(256))
+
+
+def decode_event(code: int | None) -> EventFlags | None:
+    """Look up the flags for an event byte; ``None`` if it is not a byte."""
+    if code is None or not 0 <= code <= 255:
+        return None
+    return EVENT_TABLE[code]
+
+
+def _local_time_zone(hass):
+    """Return the tzinfo for ``hass.config.time_zone``, resolved once per hass."""
+    tz_name = getattr(getattr(hass, "config", None), "time_zone", None) or "UTC"
+    data = getattr(hass, "data", None)
+    cached = data.get(DATA_TIME_ZONE) if data is not None else None
+    if cached is not None and cached[0] == tz_name:
+        return cached[1]
+    tz = dt_util.get_time_zone(tz_name)
+    if data is not None:
+        data[DATA_TIME_ZONE] = (tz_name, tz)
+    return tz
+
+
+def _parse_rtl433_time(val: str):
+    """Parse rtl_433's fixed ``"%Y-%m-%d %H:%M:%S"`` layout without strptime.
+
+    Returns a naive datetime, or ``None`` if ``val`` does not have that layout.
+    """
+    if (
+        len(val) != 19
+        or val[4] != "-" or val[7] != "-" or val[10] != " "
+        or val[13] != ":" or val[16] != ":"
+    ):
+        return None
+    try:
+        return datetime(
+            int(val[0:4]), int(val[5:7]), int(val[8:10]),
+            int(val[11:13]), int(val[14:16]), int(val[17:19]),
+        )
+    except ValueError:
+        return None
+
 
 def parse_datetime_utc(hass, val: str):
     """Parse a datetime string and return a timezone-aware UTC datetime.
 
-    Attempts to parse strings using Home Assistant's ``parse_datetime`` helper
-    before falling back to a manual ``strptime`` with the default
-    ``"%Y-%m-%d %H:%M:%S"`` format. Any parsing or timezone failures result in
-    ``None`` being returned.
+    rtl_433's default ``"%Y-%m-%d %H:%M:%S"`` layout is sliced directly and
+    interpreted in Home Assistant's configured time zone (resolved once per
+    ``hass``), and ISO strings with an offset are converted directly. Other
+    strings go through Home Assistant's ``parse_datetime`` helper before
+    falling back to ``strptime`` with the same format. Any parsing or
+    timezone failures result in ``None`` being returned.
     """
     if not val:
         return None
-    dt_parsed = dt_util.parse_datetime(val)
-    if dt_parsed is not None:
+    dt_local = _parse_rtl433_time(val) if len(val) == 19 else None
+    if dt_local is None:
+        try:
+            dt_parsed = datetime.fromisoformat(val)
+        except ValueError:
+            dt_parsed = None
+        if dt_parsed is not None and dt_parsed.tzinfo is not None:
+            # ``-M time:iso:tz`` carries its offset; no time zone to resolve
+            return dt_parsed.astimezone(timezone.utc)
+        dt_parsed = dt_util.parse_datetime(val)
+        if dt_parsed is not None:
+            try:
+                return dt_util.as_utc(dt_parsed)
+            except (ValueError, TypeError):
+                return None
         try:
-            return dt_util.as_utc(dt_parsed)
+            dt_local = datetime.strptime(val, "%Y-%m-%d %H:%M:%S")
         except (ValueError, TypeError):
             return None
-    try:
-        dt_local = datetime.strptime(val, "%Y-%m-%d %H:%M:%S")
-    except (ValueError, TypeError):
-        return None
-    tz_name = getattr(getattr(hass, "config", None), "time_zone", None) or "UTC"
-    tz = dt_util.get_time_zone(tz_name)
+    tz = _local_time_zone(hass)
     if tz is not None:
         try:
             if hasattr(tz, "localize"):
@@ -37,3 +129,10 @@ def parse_datetime_utc(hass, val: str):
         return dt_util.as_utc(dt_local)
     except (ValueError, TypeError):
         return None
+
+
+def split_prefixes(text: str | None) -> list[str]:
+    """Split a comma- or whitespace-separated prefix list, dropping blanks and repeats."""
+    if not text:
+        return []
+    return list(dict.fromkeys(part for part in text.replace(",", " ").split()))
@@ -0,0 +1,156 @@
+"""Ingest benchmark: rtl_433 per-field bursts for N sensors through ``MqttHub._cb``.
+
+Not collected by the default test run; execute explicitly with
+``python -m pytest -s tests/benchmarks/bench_ingest.py``.
+
+Every sensor of a receiver entry gets its full entity set.  Each round, a
+sensor sends one new packet (contact toggled, RSSI jittered) and the
+transmitter's two repeats, all through the shared ``<prefix>/+/+``
+callback.  Reported per received burst: dispatcher sends and
+``async_write_ha_state`` calls.  Also reported: messages/s and the traced
+memory per sensor after setup plus one round.  Results are written via
+``report``.  The run fails when a metric is outside ``budgets.json``.
+"""
+import asyncio
+import random
+import time
+import tracemalloc
+
+import pytest
+
+import custom_components.ha_mqtt_sensors as integration
+from custom_components.ha_mqtt_sensors import ReceiverHub, binary_sensor, sensor
+from custom_components.ha_mqtt_sensors.const import (
+    DOMAIN,
+    CONF_SENSOR_ID,
+    CONF_NAME,
+    CONF_PREFIX,
+    DEFAULT_PREFIX,
+    CONF_ENTRY_TYPE,
+    ENTRY_TYPE_RECEIVER,
+    CONF_SENSORS,
+    CONF_DIRECT_DISPATCH,
+    PACKET_QUIET_SECONDS,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.components.mqtt import subscriptions
+
+from report import report
+
+ROUNDS = 5
+REPEATS = 3  # Honeywell transmitters send every packet several times
+ROUND_SECONDS = 60
+
+
+class Msg:
+    __slots__ = ("topic", "payload")
+
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = payload
+
+
+def _burst(sensor_id, n, rng):
+    """One rtl_433 per-field burst as (topic, payload) pairs."""
+    is_open = n % 2 == 0
+    fields = (
+        ("time", f"2025-08-16 01:{n // 60 % 60:02d}:{n % 60:02d}"),
+        ("id", sensor_id),
+        ("channel", "10"),
+        ("event", "160" if is_open else "128"),
+        ("state", "open" if is_open else "closed"),
+        ("contact_open", "1" if is_open else "0"),
+        ("reed_open", "1" if is_open else "0"),
+        ("alarm", "0"),
+        ("tamper", "0"),
+        ("battery_ok", "1"),
+        ("heartbeat", "0"),
+        ("mic", "CRC"),
+        ("rssi", str(rng.randint(-70, -40))),
+    )
+    return [(f"{DEFAULT_PREFIX}/{sensor_id}/{suffix}", payload) for suffix, payload in fields]
+
+
+async def _setup(hass, entry):
+    receiver = ReceiverHub(hass, entry)
+    await receiver.async_setup()
+    hass.data[DOMAIN][entry.entry_id] = receiver
+    entities = []
+    for platform in (binary_sensor, sensor):
+        await platform.async_setup_entry(hass, entry, entities.extend)
+    for entity in entities:
+        entity.hass = hass
+        await entity.async_added_to_hass()
+    return receiver, entities
+
+
+@pytest.mark.parametrize("n", [1, 10, 100, 1000])
+@pytest.mark.parametrize("dispatch", ["dispatcher", "direct"])
+def test_bench_ingest(hass, monkeypatch, n, dispatch):
+    subscriptions.clear()
+    hass.data[DOMAIN] = {}
+    rng = random.Random(n)
+    sensor_ids = [str(500000 + i) for i in range(n)]
+    entry = ConfigEntry(
+        data={CONF_ENTRY_TYPE: ENTRY_TYPE_RECEIVER, CONF_NAME: "Receiver", CONF_PREFIX: DEFAULT_PREFIX},
+        options={
+            CONF_SENSORS: [{CONF_SENSOR_ID: sensor_id} for sensor_id in sensor_ids],
+            CONF_DIRECT_DISPATCH: dispatch == "direct",
+        },
+        entry_id="receiver",
+    )
+
+    counts = {"dispatch": 0, "write": 0}
+    send = integration.async_dispatcher_send
+
+    def _counting_send(*args):
+        counts["dispatch"] += 1
+        send(*args)
+    monkeypatch.setattr(integration, "async_dispatcher_send", _counting_send)
+
+    def _round(number):
+        callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+        bursts = [_burst(sensor_id, number, rng) for sensor_id in sensor_ids]
+        messages = 0
+        for _repeat in range(REPEATS):
+            for burst in bursts:
+                for topic, payload in burst:
+                    callback(Msg(topic, payload))
+                messages += len(burst)
+            hass.loop.advance(PACKET_QUIET_SECONDS)
+        hass.loop.advance(ROUND_SECONDS)
+        return messages
+
+    tracemalloc.start()
+    receiver, entities = asyncio.run(_setup(hass, entry))
+    _round(0)
+    bytes_per_sensor = tracemalloc.get_traced_memory()[0] / n
+    tracemalloc.stop()
+
+    def _write():
+        counts["write"] += 1
+    for entity in entities:
+        entity.async_write_ha_state = _write
+    counts["dispatch"] = 0
+
+    messages = 0
+    start = time.perf_counter()
+    for number in range(1, ROUNDS + 1):
+        messages += _round(number)
+    elapsed = time.perf_counter() - start
+
+    bursts = ROUNDS * REPEATS * n
+    metrics = {
+        "messages_per_second": messages / elapsed,
+        "dispatches_per_packet": counts["dispatch"] / bursts,
+        "writes_per_packet": counts["write"] / bursts,
+        "bytes_per_sensor": bytes_per_sensor,
+    }
+    print(
+        f"\n{dispatch:>10} n={n:>4}: {metrics['messages_per_second']:>10,.0f} msg/s  "
+        f"{metrics['dispatches_per_packet']:.2f} dispatch/pkt  "
+        f"{metrics['writes_per_packet']:.2f} writes/pkt  "
+        f"{bytes_per_sensor / 1024:.1f} KiB/sensor"
+    )
+    assert sum(hub.packets_accepted for hub in receiver.hubs) == (ROUNDS + 1) * n
+    assert report("ingest", {"n": n, "dispatch": dispatch}, metrics) == []
@@ -0,0 +1,116 @@
+"""Replay benchmark: feed a recorded capture through the ingest path.
+
+Not collected by the default test run; record traffic with the ``capture``
+option, then execute explicitly with
+``BENCH_CAPTURE=<config>/ha_mqtt_sensors/captures/<entry_id>.cap python -m pytest -s tests/benchmarks/bench_replay.py``.
+
+Rotated files are replayed oldest first.  A receiver entry is set up for
+every sensor id in the capture, and the records are delivered as fast as
+possible through the shared subscription callback.  Captures of
+events-mode entries, whose payloads are whole rtl_433 JSON packets, are
+replayed through an events-mode receiver on the recorded topic.  Timers are advanced
+by the recorded gaps so packets complete as they did live.
+"""
+import asyncio
+import json
+import os
+import pathlib
+import time
+
+import pytest
+
+from custom_components.ha_mqtt_sensors import ReceiverHub, binary_sensor, sensor
+from custom_components.ha_mqtt_sensors.capture import capture_files, read_capture, replay
+from custom_components.ha_mqtt_sensors.const import (
+    DOMAIN,
+    CONF_SENSOR_ID,
+    CONF_NAME,
+    CONF_PREFIX,
+    CONF_ENTRY_TYPE,
+    ENTRY_TYPE_RECEIVER,
+    CONF_SENSORS,
+    CONF_INGEST_MODE,
+    INGEST_MODE_EVENTS,
+    CONF_EVENTS_TOPIC,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.components.mqtt import subscriptions
+
+from report import report
+
+CAPTURE = os.environ.get("BENCH_CAPTURE")
+
+
+def _event_id(payload):
+    """Return the sensor id of an rtl_433 JSON packet, or ``None`` for a field value."""
+    try:
+        doc = json.loads(payload)
+    except ValueError:
+        return None
+    if isinstance(doc, dict) and doc.get("id") is not None:
+        return str(doc["id"])
+    return None
+
+
+def _layout(records):
+    """Return ``(prefix, options, topic, sensor_ids)`` for the receiver that replays ``records``."""
+    first_topic = records[0][1]
+    if _event_id(records[0][2]) is not None:
+        ids = {_event_id(payload) for _stamp, _topic, payload in records}
+        ids.discard(None)
+        options = {CONF_INGEST_MODE: INGEST_MODE_EVENTS, CONF_EVENTS_TOPIC: first_topic}
+        return first_topic.split("/", 1)[0], options, first_topic, sorted(ids)
+    if any(topic.count("/") < 2 for _stamp, topic, _payload in records):
+        pytest.fail(
+            f"{CAPTURE} is neither a per-field capture (<prefix>/<id>/<field> topics) "
+            "nor an events capture (rtl_433 JSON packets)"
+        )
+    prefix = first_topic.rsplit("/", 2)[0]
+    ids = {topic.rsplit("/", 2)[1] for _stamp, topic, _payload in records}
+    return prefix, {}, f"{prefix}/+/+", sorted(ids)
+
+
+@pytest.mark.skipif(not CAPTURE, reason="set BENCH_CAPTURE to a capture file")
+def test_bench_replay(hass):
+    records = [record for path in capture_files(CAPTURE) for record in read_capture(path)]
+    if not records:
+        pytest.fail(f"{CAPTURE} holds no records")
+    prefix, options, topic, sensor_ids = _layout(records)
+    subscriptions.clear()
+    entry = ConfigEntry(
+        data={CONF_ENTRY_TYPE: ENTRY_TYPE_RECEIVER, CONF_NAME: "Replay", CONF_PREFIX: prefix},
+        options={
+            **options,
+            CONF_SENSORS: [{CONF_SENSOR_ID: sensor_id} for sensor_id in sensor_ids],
+        },
+        entry_id="replay",
+    )
+    receiver = ReceiverHub(hass, entry)
+    asyncio.run(receiver.async_setup())
+    hass.data[DOMAIN] = {entry.entry_id: receiver}
+    entities = []
+    for platform in (binary_sensor, sensor):
+        asyncio.run(platform.async_setup_entry(hass, entry, entities.extend))
+    writes = [0]
+    for entity in entities:
+        entity.hass = hass
+        asyncio.run(entity.async_added_to_hass())
+        entity.async_write_ha_state = lambda: writes.__setitem__(0, writes[0] + 1)
+
+    start = time.perf_counter()
+    messages = replay(records, subscriptions[topic], wait=hass.loop.advance)
+    hass.loop.advance(60)
+    elapsed = time.perf_counter() - start
+
+    packets = sum(hub.packets_accepted for hub in receiver.hubs)
+    metrics = {
+        "messages_per_second": messages / elapsed,
+        "writes_per_message": writes[0] / messages,
+        "packets_accepted": packets,
+    }
+    print(
+        f"\n{pathlib.Path(CAPTURE).name}: {messages} messages, {len(sensor_ids)} sensors, "
+        f"{packets} packets  {metrics['messages_per_second']:,.0f} msg/s  "
+        f"{metrics['writes_per_message']:.2f} writes/msg"
+    )
+    assert report("replay", {"capture": pathlib.Path(CAPTURE).name}, metrics) == []
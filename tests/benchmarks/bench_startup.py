@@ -0,0 +1,112 @@
+"""Startup benchmark: config entry and platform setup for N simulated sensors.
+
+Not collected by the default test run; execute explicitly with
+``python -m pytest -s tests/benchmarks/bench_startup.py``.
+
+Each sensor has a restored state for every entity, so the numbers include
+the one-pass restore lookup.  ``entries`` sets up one config entry per
+sensor; ``receiver`` sets up a single receiver entry listing all of them.
+"""
+import asyncio
+import time
+
+import pytest
+
+from custom_components.ha_mqtt_sensors import MqttHub, ReceiverHub
+from custom_components.ha_mqtt_sensors import binary_sensor, sensor
+from custom_components.ha_mqtt_sensors.const import (
+    DOMAIN,
+    CONF_SENSOR_ID,
+    CONF_NAME,
+    CONF_PREFIX,
+    DEFAULT_PREFIX,
+    CONF_ENTRY_TYPE,
+    ENTRY_TYPE_RECEIVER,
+    CONF_SENSORS,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.components.mqtt import subscriptions
+
+from report import report
+import homeassistant.helpers.entity_registry as entity_registry
+import homeassistant.helpers.restore_state as restore_state
+
+PLATFORMS = (("binary_sensor", binary_sensor), ("sensor", sensor))
+
+
+def _seed_restore_cache(sensor_ids):
+    entity_registry.entity_ids.clear()
+    restore_state.last_states.clear()
+    for sensor_id in sensor_ids:
+        for platform, suffixes in (
+            ("binary_sensor", ("contact", "tamper", "battery", "alarm", "availability")),
+            ("sensor", ("last_seen", "event", "channel", "heartbeat", "rssi", "state", "mic", "id")),
+        ):
+            for suffix in suffixes:
+                entity_id = f"{platform}.s{sensor_id}_{suffix}"
+                unique_id = f"{DEFAULT_PREFIX}_{sensor_id}_{suffix}"
+                entity_registry.entity_ids[(platform, DOMAIN, unique_id)] = entity_id
+                restore_state.last_states[entity_id] = restore_state.State(
+                    "2025-08-16 01:10:15" if suffix == "last_seen" else "off"
+                )
+
+
+async def _setup_platforms(hass, entry):
+    added = []
+    for _name, platform in PLATFORMS:
+        await platform.async_setup_entry(hass, entry, added.extend)
+    for entity in added:
+        entity.hass = hass
+        await entity.async_added_to_hass()
+    return len(added)
+
+
+async def _entries(hass, sensor_ids):
+    count = 0
+    for sensor_id in sensor_ids:
+        entry = ConfigEntry(
+            data={CONF_SENSOR_ID: sensor_id, CONF_NAME: sensor_id, CONF_PREFIX: DEFAULT_PREFIX},
+            options={},
+            entry_id=f"entry_{sensor_id}",
+        )
+        hub = MqttHub(hass, entry)
+        await hub.async_setup()
+        hass.data[DOMAIN][entry.entry_id] = hub
+        count += await _setup_platforms(hass, entry)
+    return count
+
+
+async def _receiver(hass, sensor_ids):
+    entry = ConfigEntry(
+        data={CONF_ENTRY_TYPE: ENTRY_TYPE_RECEIVER, CONF_NAME: "Receiver", CONF_PREFIX: DEFAULT_PREFIX},
+        options={CONF_SENSORS: [{CONF_SENSOR_ID: sensor_id} for sensor_id in sensor_ids]},
+        entry_id="receiver",
+    )
+    receiver = ReceiverHub(hass, entry)
+    await receiver.async_setup()
+    hass.data[DOMAIN][entry.entry_id] = receiver
+    return await _setup_platforms(hass, entry)
+
+
+@pytest.mark.parametrize("n", [10, 100, 1000])
+@pytest.mark.parametrize("layout", ["entries", "receiver"])
+def test_bench_startup(hass, n, layout):
+    sensor_ids = [str(500000 + i) for i in range(n)]
+    _seed_restore_cache(sensor_ids)
+    subscriptions.clear()
+    hass.data[DOMAIN] = {}
+
+    setup = _entries if layout == "entries" else _receiver
+    start = time.perf_counter()
+    entities = asyncio.run(setup(hass, sensor_ids))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\n{layout:>8} n={n:>4}: {elapsed * 1000:8.1f} ms total  "
+        f"{elapsed / n * 1e6:7.1f} us/sensor  {entities} entities"
+    )
+    assert entities == 18 * n
+    assert list(subscriptions) == [f"{DEFAULT_PREFIX}/+/+"]
+    assert report(
+        "startup", {"n": n, "layout": layout}, {"us_per_sensor": elapsed / n * 1e6}
+    ) == []
@@ -0,0 +1,56 @@
+"""Micro-benchmark for rtl_433 timestamp parsing.
+
+Not collected by the default test run; execute explicitly with
+``python -m pytest -s tests/benchmarks/bench_time_parsing.py``.
+"""
+from datetime import datetime
+import timeit
+
+import pytest
+
+from custom_components.ha_mqtt_sensors.const import TOPIC_TIME
+from custom_components.ha_mqtt_sensors.models import SensorRecord
+from custom_components.ha_mqtt_sensors.util import parse_datetime_utc
+from homeassistant.util import dt as dt_util
+
+N = 20000
+
+# rtl_433's fixed layout carries no offset and is read in Home Assistant's
+# time zone; ``-M time:iso:tz`` prints local time with its offset.
+SAMPLES = {
+    "fixed_local": "2025-08-16 01:10:15",
+    "iso_offset": "2025-08-15T21:10:15-04:00",
+}
+
+
+def _legacy_parse(hass, val):
+    """Parsing path used before the fast path and time zone cache."""
+    dt_parsed = dt_util.parse_datetime(val)
+    if dt_parsed is not None:
+        return dt_util.as_utc(dt_parsed)
+    dt_local = datetime.strptime(val, "%Y-%m-%d %H:%M:%S")
+    tz = dt_util.get_time_zone(hass.config.time_zone)
+    return dt_util.as_utc(tz.localize(dt_local))
+
+
+def _rate(func):
+    seconds = min(timeit.repeat(func, number=N, repeat=3))
+    return N / seconds
+
+
+@pytest.mark.parametrize("fmt", SAMPLES)
+def test_bench_parse(hass, fmt):
+    val = SAMPLES[fmt]
+    assert parse_datetime_utc(hass, val) == _legacy_parse(hass, val)
+
+    legacy = _rate(lambda: _legacy_parse(hass, val))
+    fast = _rate(lambda: parse_datetime_utc(hass, val))
+    record = SensorRecord()
+    record.set(TOPIC_TIME, val)
+    cached = _rate(lambda: record.time_utc(hass))
+
+    print(
+        f"\n{fmt:>11}: legacy {legacy:,.0f}/s  parse {fast:,.0f}/s  "
+        f"memoized read {cached:,.0f}/s"
+    )
+    assert cached > fast
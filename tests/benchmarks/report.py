@@ -0,0 +1,31 @@
+"""Machine-readable benchmark results checked against the budgets in ``budgets.json``.
+
+``report`` merges each case's metrics into the JSON file named by the
+``BENCH_RESULTS`` environment variable (default ``bench_results.json`` in the
+working directory) and returns the budget violations for the case.  Budgets
+are keyed by benchmark name, then metric, with a ``max`` and/or ``min``
+bound that applies to every parametrization of the benchmark.
+"""
+import json
+import os
+import pathlib
+
+BUDGETS = pathlib.Path(__file__).with_name("budgets.json")
+
+
+def report(name: str, params: dict, metrics: dict) -> list[str]:
+    case = f"{name}[{','.join(f'{k}={v}' for k, v in params.items())}]"
+    path = pathlib.Path(os.environ.get("BENCH_RESULTS", "bench_results.json"))
+    results = json.loads(path.read_text()) if path.exists() else {}
+    results[case] = {**params, **metrics}
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+    budgets = json.loads(BUDGETS.read_text()).get(name, {})
+    violations = []
+    for metric, bounds in budgets.items():
+        value = metrics[metric]
+        if "max" in bounds and value > bounds["max"]:
+            violations.append(f"{case} {metric}={value:.4g} exceeds max {bounds['max']}")
+        if "min" in bounds and value < bounds["min"]:
+            violations.append(f"{case} {metric}={value:.4g} below min {bounds['min']}")
+    return violations
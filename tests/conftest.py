@@ -1,4 +1,11 @@
+import asyncio
+import heapq
+import itertools
+import json as _json
+import os
 import sys
+import tempfile
+import threading
 import types
 import pathlib
 from dataclasses import dataclass
@@ -16,17 +23,118 @@ components_pkg = types.ModuleType("homeassistant.components")
 sys.modules["homeassistant.components"] = components_pkg
 
 # core module
+ha_const = types.ModuleType("homeassistant.const")
+ha_const.EVENT_HOMEASSISTANT_STOP = "homeassistant_stop"
+sys.modules["homeassistant.const"] = ha_const
+
 core = types.ModuleType("homeassistant.core")
 
+class _TimerHandle:
+    _seq = itertools.count()
+
+    def __init__(self, when, func, args):
+        self.when = when
+        self.func = func
+        self.args = args
+        self.cancelled = False
+        self._order = (when, next(self._seq))
+
+    def __lt__(self, other):
+        return self._order < other._order
+
+    def cancel(self):
+        self.cancelled = True
+
 class _Loop:
+    """Synchronous loop stub with a manually advanced clock; timers are kept in a heap."""
+    def __init__(self):
+        self._now = 0.0
+        self._timers = []
+
+    def time(self):
+        return self._now
+
     def call_soon_threadsafe(self, func, *args):
         func(*args)
 
+    def call_at(self, when, func, *args):
+        handle = _TimerHandle(when, func, args)
+        heapq.heappush(self._timers, handle)
+        return handle
+
+    def call_later(self, delay, func, *args):
+        return self.call_at(self._now + delay, func, *args)
+
+    def advance(self, seconds):
+        """Move the clock forward, running every timer that falls due."""
+        target = self._now + seconds
+        timers = self._timers
+        while timers and timers[0].when <= target:
+            handle = heapq.heappop(timers)
+            if handle.cancelled:
+                continue
+            self._now = max(self._now, handle.when)
+            handle.func(*handle.args)
+        self._now = target
+        self._timers = [h for h in timers if not h.cancelled]
+        heapq.heapify(self._timers)
+
+class _ConfigEntries:
+    def __init__(self):
+        self.entries = []
+        self.reloaded = []
+
+    def async_entries(self, domain=None):
+        return list(self.entries)
+
+    async def async_reload(self, entry_id):
+        self.reloaded.append(entry_id)
+
+    def async_entry_for_domain_unique_id(self, domain, unique_id):
+        return next((e for e in self.entries if e.unique_id == unique_id), None)
+
+class _Config:
+    def __init__(self):
+        self.time_zone = "UTC"
+        self.config_dir = tempfile.gettempdir()
+
+    def path(self, *parts):
+        return os.path.join(self.config_dir, *parts)
+
+class _Bus:
+    def __init__(self):
+        self.listeners = {}
+
+    def async_listen_once(self, event_type, listener):
+        listeners = self.listeners.setdefault(event_type, [])
+        listeners.append(listener)
+        return lambda: listeners.remove(listener)
+
+    async def async_fire(self, event_type):
+        """Call and await every listener of ``event_type`` once."""
+        for listener in self.listeners.pop(event_type, []):
+            result = listener(None)
+            if asyncio.iscoroutine(result):
+                await result
+
 class HomeAssistant:
     def __init__(self):
         self.data = {}
+        self.config_entries = _ConfigEntries()
         self.loop = _Loop()
-        self.config = types.SimpleNamespace(time_zone="UTC")
+        self.loop_thread_id = threading.get_ident()
+        self.config = _Config()
+        self.bus = _Bus()
+
+    async def async_add_executor_job(self, target, *args):
+        return target(*args)
+
+    def async_create_background_task(self, target, name, eager_start=False):
+        # Stubbed MQTT calls never suspend, so the coroutine finishes eagerly
+        try:
+            target.send(None)
+        except StopIteration:
+            pass
 
 def callback(func):
     return func
@@ -43,19 +151,57 @@ class ConfigEntry:
     data: dict
     options: dict
     entry_id: str = "1"
+    unique_id: str | None = None
+
+class AbortFlow(Exception):
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
 
 class ConfigFlow:
+    current_entries: list = []
+
     def __init_subclass__(cls, **kwargs):
         pass
 
+    def __init__(self):
+        self.context = {}
+
+    def async_show_menu(self, step_id, menu_options):
+        return {"type": "menu", "step_id": step_id, "menu_options": menu_options}
+
+    def async_show_form(self, step_id, data_schema, errors=None, description_placeholders=None):
+        return {
+            "type": "form",
+            "step_id": step_id,
+            "data_schema": data_schema,
+            "errors": errors or {},
+            "description_placeholders": description_placeholders,
+        }
+
+    def async_create_entry(self, title, data, options=None):
+        return {"type": "create_entry", "title": title, "data": data, "options": options or {}}
+
+    async def async_set_unique_id(self, unique_id):
+        self.unique_id = unique_id
+
+    def _abort_if_unique_id_configured(self):
+        if self.unique_id in {e.unique_id for e in self._async_current_entries()}:
+            raise AbortFlow("already_configured")
+
+    def _async_current_entries(self):
+        return self.current_entries
+
 class OptionsFlow:
-    def async_show_form(self, step_id, data_schema):
-        return {"type": "form", "step_id": step_id, "data_schema": data_schema}
+    def async_show_form(self, step_id, data_schema, errors=None):
+        return {"type": "form", "step_id": step_id, "data_schema": data_schema, "errors": errors or {}}
 
     def async_create_entry(self, title, data):
         return {"type": "create_entry", "title": title, "data": data}
 
 config_entries.ConfigEntry = ConfigEntry
+config_entries.SOURCE_INTEGRATION_DISCOVERY = "integration_discovery"
+config_entries.AbortFlow = AbortFlow
 config_entries.ConfigFlow = ConfigFlow
 config_entries.OptionsFlow = OptionsFlow
 sys.modules["homeassistant.config_entries"] = config_entries
@@ -72,7 +218,7 @@ class Schema:
 def Optional(key, default=None, description=None):
     return key
 
-def Required(key, description=None):
+def Required(key, default=None, description=None):
     return key
 
 def In(values):
@@ -133,6 +279,10 @@ class BinarySensorEntity:
     def __init__(self):
         self.hass = None
 
+    @property
+    def unique_id(self):
+        return getattr(self, "_attr_unique_id", None)
+
     async def async_added_to_hass(self):
         pass
 
@@ -157,6 +307,10 @@ class SensorEntity:
     def __init__(self):
         self.hass = None
 
+    @property
+    def unique_id(self):
+        return getattr(self, "_attr_unique_id", None)
+
     async def async_added_to_hass(self):
         pass
 
@@ -166,10 +320,116 @@ class SensorEntity:
     def async_write_ha_state(self):
         pass
 
+class SensorStateClass:
+    MEASUREMENT = "measurement"
+
 sensor_mod.SensorDeviceClass = SensorDeviceClass
+sensor_mod.SensorStateClass = SensorStateClass
 sensor_mod.SensorEntity = SensorEntity
 sys.modules["homeassistant.components.sensor"] = sensor_mod
 
+# helpers.entity_registry module
+entity_registry = types.ModuleType("homeassistant.helpers.entity_registry")
+entity_registry.entity_ids = {}  # (domain, platform, unique_id) -> entity_id
+
+class EntityRegistry:
+    def async_get_entity_id(self, domain, platform, unique_id):
+        return entity_registry.entity_ids.get((domain, platform, unique_id))
+
+    def async_remove(self, entity_id):
+        for key, value in list(entity_registry.entity_ids.items()):
+            if value == entity_id:
+                del entity_registry.entity_ids[key]
+
+def _entity_registry_async_get(hass):
+    return EntityRegistry()
+
+entity_registry.async_get = _entity_registry_async_get
+helpers_pkg.entity_registry = entity_registry
+sys.modules["homeassistant.helpers.entity_registry"] = entity_registry
+
+# helpers.device_registry module
+device_registry = types.ModuleType("homeassistant.helpers.device_registry")
+
+@dataclass
+class DeviceEntry:
+    identifiers: set
+
+device_registry.DeviceEntry = DeviceEntry
+helpers_pkg.device_registry = device_registry
+sys.modules["homeassistant.helpers.device_registry"] = device_registry
+
+# helpers.storage module
+storage = types.ModuleType("homeassistant.helpers.storage")
+storage.saved = {}  # key -> data written by the last save
+storage.pending = {}  # key -> data_func of a delayed save
+storage.reads = 0
+
+class Store:
+    def __init__(self, hass, version, key, **kwargs):
+        self.key = key
+
+    async def async_load(self):
+        storage.reads += 1
+        return storage.saved.get(self.key)
+
+    def async_delay_save(self, data_func, delay=0):
+        storage.pending[self.key] = data_func
+
+    async def async_save(self, data):
+        storage.saved[self.key] = data
+
+def flush():
+    """Run pending delayed saves, as Home Assistant does on shutdown."""
+    for key, data_func in list(storage.pending.items()):
+        storage.saved[key] = _json.loads(_json.dumps(data_func()))
+    storage.pending.clear()
+    mqtt.status_callbacks.clear()
+
+storage.Store = Store
+storage.flush = flush
+helpers_pkg.storage = storage
+sys.modules["homeassistant.helpers.storage"] = storage
+
+# helpers.selector module
+selector = types.ModuleType("homeassistant.helpers.selector")
+
+class TextSelectorConfig:
+    def __init__(self, **kwargs):
+        self.config = kwargs
+
+class TextSelector:
+    def __init__(self, config=None):
+        self.config = config
+
+    def __call__(self, value):
+        return value
+
+selector.TextSelectorConfig = TextSelectorConfig
+selector.TextSelector = TextSelector
+helpers_pkg.selector = selector
+sys.modules["homeassistant.helpers.selector"] = selector
+
+# helpers.discovery_flow module
+discovery_flow = types.ModuleType("homeassistant.helpers.discovery_flow")
+discovery_flow.flows = []
+
+def async_create_flow(hass, domain, context, data):
+    discovery_flow.flows.append((domain, context, data))
+
+discovery_flow.async_create_flow = async_create_flow
+helpers_pkg.discovery_flow = discovery_flow
+sys.modules["homeassistant.helpers.discovery_flow"] = discovery_flow
+
+# exceptions module
+exceptions = types.ModuleType("homeassistant.exceptions")
+
+class HomeAssistantError(Exception):
+    pass
+
+exceptions.HomeAssistantError = HomeAssistantError
+sys.modules["homeassistant.exceptions"] = exceptions
+
 # helpers.dispatcher module
 dispatcher = types.ModuleType("homeassistant.helpers.dispatcher")
 dispatcher._signals = {}
@@ -203,8 +463,9 @@ sys.modules["homeassistant.helpers.event"] = event
 restore_state = types.ModuleType("homeassistant.helpers.restore_state")
 
 class State:
-    def __init__(self, state):
+    def __init__(self, state, attributes=None):
         self.state = state
+        self.attributes = attributes or {}
 
 restore_state.State = State
 restore_state.last_states = {}
@@ -216,7 +477,24 @@ class RestoreEntity:
     async def async_get_last_state(self):
         return restore_state.last_states.get(getattr(self, "entity_id", None))
 
+class StoredState:
+    def __init__(self, state):
+        self.state = state
+
+class _LastStates:
+    def get(self, entity_id, default=None):
+        state = restore_state.last_states.get(entity_id)
+        return default if state is None else StoredState(state)
+
+class _RestoreStateData:
+    last_states = _LastStates()
+
+def _restore_state_async_get(hass):
+    return _RestoreStateData()
+
 restore_state.RestoreEntity = RestoreEntity
+restore_state.async_get = _restore_state_async_get
+helpers_pkg.restore_state = restore_state
 sys.modules["homeassistant.helpers.restore_state"] = restore_state
 
 # components.mqtt module
@@ -232,7 +510,14 @@ async def async_subscribe(hass, topic, callback, qos=0, encoding=None):
         mqtt.subscriptions.pop(topic, None)
     return unsub
 
+mqtt.status_callbacks = []
+
+def async_subscribe_connection_status(hass, callback):
+    mqtt.status_callbacks.append(callback)
+    return lambda: mqtt.status_callbacks.remove(callback)
+
 mqtt.async_wait_for_mqtt_client = async_wait_for_mqtt_client
+mqtt.async_subscribe_connection_status = async_subscribe_connection_status
 mqtt.async_subscribe = async_subscribe
 components_pkg.mqtt = mqtt
 sys.modules["homeassistant.components.mqtt"] = mqtt
@@ -277,21 +562,34 @@ dt.parse_datetime = parse_datetime
 dt.as_utc = as_utc
 sys.modules["homeassistant.util.dt"] = dt
 
+# util.json module
+util_json = types.ModuleType("homeassistant.util.json")
+util_json.json_loads = _json.loads
+sys.modules["homeassistant.util.json"] = util_json
+
 # pytest fixtures
 import pytest
 
 @pytest.fixture
-def hass():
-    return HomeAssistant()
+def hass(tmp_path):
+    restore_state.last_states.clear()
+    entity_registry.entity_ids.clear()
+    storage.saved.clear()
+    storage.pending.clear()
+    mqtt.status_callbacks.clear()
+    instance = HomeAssistant()
+    instance.config.config_dir = str(tmp_path)
+    return instance
 
 class StubHub:
     def __init__(self):
         self.sensor_id = "abc"
-        self.states = {}
+        from custom_components.ha_mqtt_sensors.models import SensorRecord
+        from custom_components.ha_mqtt_sensors.stats import HubCounters
+        self.record = SensorRecord()
+        self.counters = HubCounters()
         self.combined_id = self.sensor_id
         self._last_seen_utc = None
-    def signal_for(self, suffix):
-        return suffix
     @property
     def last_seen_utc(self):
         return self._last_seen_utc
@@ -299,3 +597,89 @@ class StubHub:
 @pytest.fixture
 def stub_hub():
     return StubHub()
+
+# One packet as rtl_433 publishes it, field by field
+SENSOR_ID = "abc123"
+BURST = [
+    ("time", "2025-08-16 01:10:15"),
+    ("id", SENSOR_ID),
+    ("channel", "10"),
+    ("event", "160"),
+    ("state", "open"),
+    ("contact_open", "1"),
+    ("reed_open", "1"),
+    ("alarm", "0"),
+    ("tamper", "0"),
+    ("battery_ok", "1"),
+    ("heartbeat", "0"),
+    ("mic", "CRC"),
+    ("rssi", "-42"),
+]
+
+class Msg:
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = payload
+
+@pytest.fixture
+def message():
+    """Build an MQTT message stand-in: ``message(topic, payload)``."""
+    return Msg
+
+@pytest.fixture
+def sensor_id():
+    return SENSOR_ID
+
+@pytest.fixture
+def burst():
+    return list(BURST)
+
+@pytest.fixture
+def send_burst():
+    """Publish ``(suffix, payload)`` pairs as per-field messages to a subscription callback."""
+    from custom_components.ha_mqtt_sensors.const import DEFAULT_PREFIX
+    def send(callback, burst=BURST, prefix=DEFAULT_PREFIX, sensor_id=SENSOR_ID):
+        for suffix, payload in burst:
+            callback(Msg(f"{prefix}/{sensor_id}/{suffix}", payload))
+    return send
+
+@pytest.fixture
+def counting():
+    """Replace an entity's state writes with a counter in ``entity.writes``."""
+    def count(entity):
+        entity.writes = 0
+        def _write():
+            entity.writes += 1
+        entity.async_write_ha_state = _write
+        return entity
+    return count
+
+@pytest.fixture
+def make_hub(hass):
+    """Set up a sensor entry's hub and register it the way ``async_setup_entry`` does."""
+    from custom_components.ha_mqtt_sensors import MqttHub
+    from custom_components.ha_mqtt_sensors.const import (
+        DOMAIN, CONF_SENSOR_ID, CONF_NAME, CONF_PREFIX, DEFAULT_PREFIX,
+    )
+    def make(
+        options=None, *, sensor_id=SENSOR_ID, entry_id="entry1", prefix=DEFAULT_PREFIX, hass=hass
+    ):
+        entry = ConfigEntry(
+            data={CONF_SENSOR_ID: sensor_id, CONF_NAME: "Test", CONF_PREFIX: prefix},
+            options=options or {},
+            entry_id=entry_id,
+        )
+        hub = MqttHub(hass, entry)
+        asyncio.run(hub.async_setup())
+        hass.data.setdefault(DOMAIN, {})[entry_id] = hub
+        return hub
+    return make
+
+@pytest.fixture
+def add_entity(hass):
+    """Add an entity to Home Assistant, running its ``async_added_to_hass``."""
+    def add(entity, hass=hass):
+        entity.hass = hass
+        asyncio.run(entity.async_added_to_hass())
+        return entity
+    return add
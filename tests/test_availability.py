@@ -1,50 +1,98 @@
 from datetime import timedelta
-import asyncio
-from unittest.mock import patch
 
-from custom_components.ha_mqtt_sensors import MqttHub
+import pytest
+
+from custom_components.ha_mqtt_sensors import async_get_scheduler
 from custom_components.ha_mqtt_sensors.binary_sensor import AvailabilityEntity
 from custom_components.ha_mqtt_sensors.const import (
     CONF_AVAIL_MINUTES,
     DEFAULT_AVAIL_MINUTES,
     CONF_AVAIL_TICK,
-    CONF_SENSOR_ID,
-    CONF_NAME,
-    CONF_PREFIX,
     DEFAULT_PREFIX,
 )
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.util import dt as dt_util
+from homeassistant.components.mqtt import subscriptions
 
 
-def _make_entity(hass, hub, minutes=DEFAULT_AVAIL_MINUTES):
-    entry = ConfigEntry(data={}, options={CONF_AVAIL_MINUTES: minutes})
-    entity = AvailabilityEntity(hub, entry, DeviceInfo(), "Connectivity")
-    entity.hass = hass
-    return entity
+@pytest.fixture
+def availability(add_entity):
+    """Add the hub's connectivity entity, recording ``is_on`` at every state write."""
+    def add(hub):
+        entity = add_entity(AvailabilityEntity(hub, hub.entry, DeviceInfo(), "Connectivity"))
+        entity.writes = []
+        entity.async_write_ha_state = lambda: entity.writes.append(entity.is_on)
+        return entity
+    return add
 
 
-def test_availability_based_on_last_seen(hass, stub_hub):
-    entity = _make_entity(hass, stub_hub)
+def test_availability_based_on_last_seen(make_hub, availability):
+    hub = make_hub()
+    entity = availability(hub)
     assert entity.is_on is None
 
-    stub_hub._last_seen_utc = dt_util.utcnow()
+    hub._last_seen_utc = dt_util.utcnow()
     assert entity.is_on is True
 
-    stub_hub._last_seen_utc = dt_util.utcnow() - timedelta(
+    hub._last_seen_utc = dt_util.utcnow() - timedelta(
         minutes=DEFAULT_AVAIL_MINUTES * 2
     )
     assert entity.is_on is False
 
 
-def test_configurable_availability_tick_interval(hass):
-    entry = ConfigEntry(
-        data={CONF_SENSOR_ID: "abc123", CONF_NAME: "Test", CONF_PREFIX: DEFAULT_PREFIX},
-        options={CONF_AVAIL_TICK: 10},
-        entry_id="entry1",
-    )
-    hub = MqttHub(hass, entry)
-    with patch("custom_components.ha_mqtt_sensors.async_track_time_interval") as mock_track:
-        asyncio.run(hub.async_setup())
-        assert mock_track.call_args[0][2] == timedelta(seconds=10)
+def test_availability_writes_only_on_flip(hass, make_hub, availability, send_burst):
+    hub = make_hub({CONF_AVAIL_MINUTES: 5, CONF_AVAIL_TICK: 30})
+    entity = availability(hub)
+    writes = entity.writes
+
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+    for _ in range(3):
+        send_burst(callback, [("time", "2025-08-16 01:10:15"), ("event", "128")])
+        hass.loop.advance(1)
+    assert writes == [True]
+
+    # Nothing wakes up while the sensor stays online
+    hass.loop.advance(60)
+    assert writes == [True]
+
+    # A packet after the tick interval refreshes the last-seen attribute once
+    send_burst(callback, [("event", "128")])
+    hass.loop.advance(1)
+    assert writes == [True, True]
+    assert entity.extra_state_attributes["last_seen_utc"] == hub.last_seen_utc.isoformat()
+
+    hub.async_set_last_seen(dt_util.utcnow() - timedelta(minutes=10))
+    hass.loop.advance(1)
+    hass.loop.advance(600)
+    assert writes == [True, True, False]
+
+
+def test_configurable_availability_tick_interval(hass, make_hub, availability, send_burst):
+    hub = make_hub({CONF_AVAIL_TICK: 10})
+    writes = availability(hub).writes
+
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+    for _ in range(4):
+        send_burst(callback, [("event", "128")])
+        hass.loop.advance(5)
+    # Attribute refreshes are spaced by the 10 second tick
+    assert writes == [True, True]
+
+
+def test_scheduler_wakes_only_for_expired_hubs(hass, make_hub):
+    scheduler = async_get_scheduler(hass)
+    hubs = []
+    for i in range(50):
+        hub = make_hub({CONF_AVAIL_MINUTES: 5}, sensor_id=str(i), entry_id=f"entry{i}")
+        assert hub._scheduler is scheduler
+        hub.async_set_last_seen(dt_util.utcnow())
+        hubs.append(hub)
+    assert len([t for t in hass.loop._timers if not t.cancelled]) == 1
+
+    flipped = []
+    for i, hub in enumerate(hubs):
+        hub._async_update_availability = lambda i=i: flipped.append(i)
+    hubs[7].async_set_last_seen(dt_util.utcnow() - timedelta(minutes=6))
+    hubs[9].async_set_last_seen(dt_util.utcnow() - timedelta(minutes=7))
+    hass.loop.advance(1)
+    assert sorted(flipped) == [7, 9]
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from custom_components.ha_mqtt_sensors.capture import (
+    CaptureWriter,
+    capture_files,
+    read_capture,
+    replay,
+)
+from custom_components.ha_mqtt_sensors.const import (
+    DOMAIN,
+    DEFAULT_PREFIX,
+    CONF_CAPTURE,
+    CAPTURE_FLUSH_SECONDS,
+    PACKET_QUIET_SECONDS,
+    DATA_CAPTURES,
+)
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant
+from homeassistant.components.mqtt import subscriptions
+
+TOPIC = f"{DEFAULT_PREFIX}/+/+"
+
+
+@pytest.fixture
+def hub(make_hub):
+    return make_hub({CONF_CAPTURE: True})
+
+
+def test_capture_records_raw_messages(hass, hub, send_burst, burst, sensor_id):
+    path = hub._capture.path
+    send_burst(subscriptions[TOPIC])
+    assert not path.exists()
+
+    hass.loop.advance(CAPTURE_FLUSH_SECONDS)
+    records = list(read_capture(path))
+    assert [(topic, payload) for _stamp, topic, payload in records] == [
+        (f"{DEFAULT_PREFIX}/{sensor_id}/{suffix}", payload.encode()) for suffix, payload in burst
+    ]
+    assert records == sorted(records, key=lambda record: record[0])
+
+    # Unloading writes what is still buffered and drops the shared writer
+    send_burst(subscriptions[TOPIC], burst[:2])
+    asyncio.run(hub.async_unload())
+    assert len(list(read_capture(path))) == len(burst) + 2
+    assert hass.data[DATA_CAPTURES] == {}
+
+
+def test_stop_writes_buffered_records(hass, hub, send_burst, burst):
+    send_burst(subscriptions[TOPIC])
+    assert not hub._capture.path.exists()
+
+    asyncio.run(hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP))
+    assert len(list(read_capture(hub._capture.path))) == len(burst)
+    # Nothing is left for the flush timer
+    hass.loop.advance(CAPTURE_FLUSH_SECONDS)
+    assert len(list(read_capture(hub._capture.path))) == len(burst)
+
+
+def test_capture_is_off_by_default(hass, make_hub, send_burst):
+    hub = make_hub()
+    send_burst(subscriptions[TOPIC])
+    hass.loop.advance(CAPTURE_FLUSH_SECONDS)
+    assert hub._capture is None
+
+
+def test_capture_rotates_within_bounds(hass, tmp_path, sensor_id):
+    writer = CaptureWriter(hass, tmp_path / "rx.cap", max_bytes=200, backups=2)
+    for i in range(40):
+        writer.append(f"{DEFAULT_PREFIX}/{sensor_id}/rssi", f"-{i}")
+        writer._async_flush()
+
+    files = capture_files(tmp_path / "rx.cap")
+    assert [f.name for f in files] == ["rx.cap.2", "rx.cap.1", "rx.cap"]
+    assert all(f.stat().st_size <= 200 for f in files)
+    payloads = [int(payload) for f in files for _s, _t, payload in read_capture(f)]
+    # The newest records survive, in order
+    assert payloads == list(range(0, -40, -1))[-len(payloads):]
+
+
+def test_replay_drives_a_hub_like_live_traffic(hass, hub, make_hub, send_burst, burst):
+    send_burst(subscriptions[TOPIC])
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    asyncio.run(hub.async_unload())
+    records = list(read_capture(hass.config.path(DOMAIN, "captures", "entry1.cap")))
+
+    subscriptions.clear()
+    hass2 = HomeAssistant()
+    hass2.config.config_dir = hass.config.config_dir
+    replayed = make_hub(hass=hass2)
+    assert replay(records, subscriptions[TOPIC]) == len(burst)
+    hass2.loop.advance(PACKET_QUIET_SECONDS)
+    assert replayed.record.snapshot() == hub.record.snapshot()
+
+
+def test_replay_keeps_original_spacing():
+    records = [(10.0, "a/1/time", b"x"), (10.0, "a/1/id", b"1"), (12.5, "a/1/time", b"y")]
+    delivered, waits = [], []
+    replay(records, lambda msg: delivered.append(msg.topic), wait=waits.append)
+    assert delivered == ["a/1/time", "a/1/id", "a/1/time"]
+    assert waits == [2.5]
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from custom_components.ha_mqtt_sensors import diagnostics
+from custom_components.ha_mqtt_sensors.binary_sensor import ContactEntity
+from custom_components.ha_mqtt_sensors.const import (
+    DOMAIN,
+    CONF_SENSOR_ID,
+    DEFAULT_PREFIX,
+    PACKET_QUIET_SECONDS,
+)
+from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.mqtt import subscriptions
+
+
+@pytest.fixture
+def hub(make_hub, add_entity):
+    hub = make_hub()
+    add_entity(ContactEntity(hub, hub.entry, DeviceInfo(), "Door", BinarySensorDeviceClass.DOOR))
+    return hub
+
+
+def test_counters_track_the_ingest_path(hass, hub, send_burst, burst):
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+    send_burst(callback)
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    hass.loop.advance(10)
+    send_burst(callback, [("time", "2025-08-16 01:10:30"), ("channel", "x"), ("snr", "9.1")])
+    send_burst(hub._async_ingest, [("", "1")])
+    hass.loop.advance(PACKET_QUIET_SECONDS + 5)
+
+    counters = hub.counters.as_dict(hass.loop.time())
+    assert counters["messages"]["time"] == 2
+    assert counters["messages"]["snr"] == 1
+    assert counters["messages_total"] == len(burst) + 3
+    assert sum(counters["cb_time_histogram"].values()) == len(burst) + 3
+    assert counters["decode_failures"] == 1
+    assert counters["empty_suffix_drops"] == 1
+    assert counters["dispatches"] == 2
+    # The first packet opens the contact; the second changes nothing it shows
+    assert counters["state_writes"] == 1
+    assert counters["last_message_age_seconds"] == PACKET_QUIET_SECONDS + 5
+
+
+def test_entry_and_device_diagnostics(hass, hub, send_burst, burst, sensor_id):
+    entry = hub.entry
+    send_burst(subscriptions[f"{DEFAULT_PREFIX}/+/+"])
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+
+    result = asyncio.run(diagnostics.async_get_config_entry_diagnostics(hass, entry))
+    assert result["data"][CONF_SENSOR_ID] == sensor_id
+    (sensor,) = result["sensors"]
+    assert sensor["packets"]["accepted"] == 1
+    assert sensor["link"]["rssi_mean"] == -42
+    assert sensor["counters"]["messages_total"] == len(burst)
+
+    device = DeviceEntry(identifiers={(DOMAIN, hub.combined_id)})
+    assert asyncio.run(diagnostics.async_get_device_diagnostics(hass, entry, device)) == sensor
+    other = DeviceEntry(identifiers={(DOMAIN, "other")})
+    assert asyncio.run(diagnostics.async_get_device_diagnostics(hass, entry, other)) == {}
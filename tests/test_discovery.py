@@ -0,0 +1,100 @@
+import asyncio
+
+from custom_components.ha_mqtt_sensors import MqttHub, config_flow
+from custom_components.ha_mqtt_sensors.const import (
+    CONF_SENSOR_ID,
+    CONF_NAME,
+    CONF_PREFIX,
+    DEFAULT_PREFIX,
+    CONF_DISCOVERY,
+    CONF_DEVICE_TYPE,
+    CONF_SENSOR_SOURCE,
+    DISCOVERY_INTERVAL_SECONDS,
+    SENSOR_SOURCE_EXTERNAL,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.components.mqtt import subscriptions
+from homeassistant.helpers import discovery_flow
+
+
+class Msg:
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = payload
+
+
+def _setup(hass, discovery=True):
+    subscriptions.clear()
+    discovery_flow.flows.clear()
+    entry = ConfigEntry(
+        data={CONF_SENSOR_ID: "known", CONF_NAME: "Known", CONF_PREFIX: DEFAULT_PREFIX},
+        options={CONF_DISCOVERY: discovery},
+        entry_id="entry1",
+    )
+    hub = MqttHub(hass, entry)
+    asyncio.run(hub.async_setup())
+    return hub, subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+
+
+def test_unknown_ids_start_rate_limited_flows(hass):
+    hub, callback = _setup(hass)
+    for sensor_id in ("111", "222"):
+        callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/time", "2025-08-16 01:10:15"))
+        callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/rssi", "-61.25"))
+    callback(Msg(f"{DEFAULT_PREFIX}/known/rssi", "-40"))
+
+    assert [flow[2][CONF_SENSOR_ID] for flow in discovery_flow.flows] == ["111"]
+    tracker = hub._routers[0].discovery
+    assert list(tracker.unknown) == ["111", "222"]
+    assert tracker.unknown["222"].rssi == -61.25
+    assert tracker.unknown["111"].first_seen <= tracker.unknown["111"].last_seen
+
+    # The second id is offered on its next message once the interval passed
+    hass.loop.advance(DISCOVERY_INTERVAL_SECONDS)
+    callback(Msg(f"{DEFAULT_PREFIX}/111/rssi", "-60"))
+    callback(Msg(f"{DEFAULT_PREFIX}/222/rssi", "-60"))
+    assert [flow[2][CONF_SENSOR_ID] for flow in discovery_flow.flows] == ["111", "222"]
+
+
+def test_dismissed_ids_are_not_offered(hass):
+    hass.config_entries.entries.append(
+        ConfigEntry(data={}, options={}, unique_id=f"{DEFAULT_PREFIX}_333")
+    )
+    hub, callback = _setup(hass)
+    callback(Msg(f"{DEFAULT_PREFIX}/333/rssi", "-50"))
+    assert discovery_flow.flows == []
+    assert "333" in hub._routers[0].discovery.unknown
+
+
+def test_unknown_ids_are_bounded(hass):
+    hub, callback = _setup(hass)
+    tracker = hub._routers[0].discovery
+    tracker._max_ids = 3
+    for i in range(5):
+        callback(Msg(f"{DEFAULT_PREFIX}/{i}/rssi", "-50"))
+    callback(Msg(f"{DEFAULT_PREFIX}/2/rssi", "-50"))
+    assert list(tracker.unknown) == ["3", "4", "2"]
+
+
+def test_discovery_disabled_by_default(hass):
+    hub, callback = _setup(hass, discovery=False)
+    callback(Msg(f"{DEFAULT_PREFIX}/111/rssi", "-50"))
+    assert hub._routers[0].discovery is None
+    assert discovery_flow.flows == []
+
+
+def test_discovery_flow_creates_sensor_entry():
+    flow = config_flow.ConfigFlow()
+    result = asyncio.run(flow.async_step_integration_discovery(
+        {CONF_SENSOR_ID: "111", CONF_PREFIX: DEFAULT_PREFIX, "rssi": -61}
+    ))
+    assert result["step_id"] == "discovery_confirm"
+    assert flow.context["title_placeholders"] == {CONF_SENSOR_ID: "111"}
+
+    result = asyncio.run(flow.async_step_discovery_confirm(
+        {CONF_NAME: "Porch", CONF_DEVICE_TYPE: "door", CONF_SENSOR_SOURCE: SENSOR_SOURCE_EXTERNAL}
+    ))
+    assert result["type"] == "create_entry"
+    assert result["data"] == {CONF_SENSOR_ID: "111", CONF_NAME: "Porch", CONF_PREFIX: DEFAULT_PREFIX}
+    assert result["options"][CONF_DEVICE_TYPE] == "door"
+    assert flow.unique_id == f"{DEFAULT_PREFIX}_111"
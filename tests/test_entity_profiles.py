@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from custom_components.ha_mqtt_sensors import _update_listener, binary_sensor, sensor
+from custom_components.ha_mqtt_sensors.sensor import DetailsSensor
+from custom_components.ha_mqtt_sensors.const import (
+    DOMAIN,
+    DEFAULT_PREFIX,
+    CONF_ENTITY_PROFILE,
+    PROFILE_FULL,
+    PROFILE_STANDARD,
+    PROFILE_MINIMAL,
+    PACKET_QUIET_SECONDS,
+)
+from homeassistant.helpers import entity_registry, restore_state
+from homeassistant.components.mqtt import subscriptions
+
+
+@pytest.fixture
+def unique(sensor_id):
+    return f"{DEFAULT_PREFIX}_{sensor_id}"
+
+
+@pytest.fixture
+def set_up_profile(hass, make_hub, add_entity):
+    """Set up the entry with ``profile`` through the platforms; return hub, entry and entities."""
+    def _setup(profile=None):
+        hub = make_hub(None if profile is None else {CONF_ENTITY_PROFILE: profile})
+        entities = []
+        for platform in (binary_sensor, sensor):
+            asyncio.run(platform.async_setup_entry(hass, hub.entry, entities.extend))
+        for entity in entities:
+            add_entity(entity)
+        return hub, hub.entry, entities
+    return _setup
+
+
+@pytest.mark.parametrize(
+    ("profile", "count"),
+    [(None, 18), (PROFILE_FULL, 18), (PROFILE_STANDARD, 14), (PROFILE_MINIMAL, 4)],
+)
+def test_profile_entity_count(set_up_profile, profile, count):
+    _hub, _entry, entities = set_up_profile(profile)
+    assert len(entities) == count
+    assert any(isinstance(e, DetailsSensor) for e in entities) == (profile not in (None, PROFILE_FULL))
+
+
+def test_minimal_profile_keeps_contact_availability_battery(set_up_profile, unique):
+    _hub, _entry, entities = set_up_profile(PROFILE_MINIMAL)
+    assert sorted(e.unique_id[len(unique) + 1:] for e in entities) == [
+        "availability", "battery", "contact", "details",
+    ]
+
+
+def test_details_written_once_per_packet(hass, set_up_profile, counting, send_burst):
+    hub, _entry, entities = set_up_profile(PROFILE_MINIMAL)
+    details = counting(next(e for e in entities if isinstance(e, DetailsSensor)))
+    send_burst(subscriptions[f"{DEFAULT_PREFIX}/+/+"])
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+
+    assert details.writes == 1
+    assert details.native_value == hub.record.time_utc(hass)
+    attributes = details.extra_state_attributes
+    assert attributes["rssi"] == -42
+    assert attributes["channel"] == 10
+    assert attributes["mic"] == "CRC"
+    assert attributes["tamper"] is False
+    assert "battery_ok" not in attributes
+
+
+def test_standard_profile_folds_only_rare_fields(set_up_profile):
+    _hub, _entry, entities = set_up_profile(PROFILE_STANDARD)
+    details = next(e for e in entities if isinstance(e, DetailsSensor))
+    assert list(details.extra_state_attributes) == ["channel", "heartbeat", "state", "mic", "id"]
+
+
+def test_profile_change_reloads_and_drops_stale_entities(hass, set_up_profile, unique):
+    entity_registry.entity_ids[("sensor", DOMAIN, f"{unique}_mic")] = "sensor.test_mic"
+    _hub, entry, _entities = set_up_profile()
+    entry.options = {CONF_ENTITY_PROFILE: PROFILE_MINIMAL}
+    asyncio.run(_update_listener(hass, entry))
+    assert hass.config_entries.reloaded == [entry.entry_id]
+
+    set_up_profile(PROFILE_MINIMAL)
+    assert ("sensor", DOMAIN, f"{unique}_mic") not in entity_registry.entity_ids
+
+
+def test_restore_from_details_attributes(set_up_profile, unique):
+    entity_registry.entity_ids[("sensor", DOMAIN, f"{unique}_details")] = "sensor.test_details"
+    restore_state.last_states["sensor.test_details"] = restore_state.State(
+        "2025-08-16T01:10:15+00:00", {"rssi": -51, "mic": "CRC", "tamper": True, "channel": None},
+    )
+    hub, _entry, _entities = set_up_profile(PROFILE_MINIMAL)
+    record = hub.record
+    assert (record.rssi, record.mic, record.tamper, record.channel) == (-51, "CRC", True, None)
+    assert hub.last_seen_utc is not None
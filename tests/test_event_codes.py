@@ -0,0 +1,95 @@
+import asyncio
+import logging
+
+from custom_components.ha_mqtt_sensors import MqttHub
+from custom_components.ha_mqtt_sensors.binary_sensor import (
+    AlarmEntity,
+    BatteryLowEntity,
+    ContactEntity,
+    TamperEntity,
+)
+from custom_components.ha_mqtt_sensors.const import (
+    CONF_SENSOR_ID,
+    CONF_NAME,
+    CONF_PREFIX,
+    DEFAULT_PREFIX,
+    CONTACT_OPEN_EVENTS,
+    CONTACT_CLOSED_EVENTS,
+)
+from custom_components.ha_mqtt_sensors.util import EVENT_TABLE, decode_event
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.mqtt import subscriptions
+
+
+class Msg:
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = payload
+
+
+def test_table_covers_every_byte():
+    assert len(EVENT_TABLE) == 256
+    for code in CONTACT_OPEN_EVENTS:
+        assert decode_event(code).contact is True
+    for code in CONTACT_CLOSED_EVENTS:
+        assert decode_event(code).contact is False
+    assert decode_event(0x11).contact is None
+    assert decode_event(None) is None
+    assert decode_event(999) is None
+
+
+def test_table_decodes_bitfield():
+    flags = decode_event(0x40 | 0x10 | 0x08 | 0x04)
+    assert flags.tamper and flags.alarm and flags.battery_low and flags.heartbeat
+    assert not flags.reed
+    assert decode_event(0xA0).reed is True
+
+
+def _setup(hass):
+    entry = ConfigEntry(
+        data={CONF_SENSOR_ID: "abc123", CONF_NAME: "Test", CONF_PREFIX: DEFAULT_PREFIX},
+        options={},
+        entry_id="entry1",
+    )
+    hub = MqttHub(hass, entry)
+    asyncio.run(hub.async_setup())
+    entities = [
+        ContactEntity(hub, entry, DeviceInfo(), "Door", BinarySensorDeviceClass.DOOR),
+        TamperEntity(hub, entry, DeviceInfo(), "Tamper"),
+        BatteryLowEntity(hub, entry, DeviceInfo(), "Battery"),
+        AlarmEntity(hub, entry, DeviceInfo(), "Alarm"),
+    ]
+    for entity in entities:
+        entity.hass = hass
+        asyncio.run(entity.async_added_to_hass())
+    return hub, entities
+
+
+def test_entities_derive_from_event_without_separate_topics(hass):
+    _hub, (contact, tamper, battery, alarm) = _setup(hass)
+    assert (tamper.is_on, battery.is_on, alarm.is_on) == (None, None, None)
+
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+    callback(Msg(f"{DEFAULT_PREFIX}/abc123/event", "232"))
+    hass.loop.advance(1)
+    assert (contact.is_on, tamper.is_on, battery.is_on, alarm.is_on) == (True, True, True, False)
+
+    # Dedicated topics take precedence over the event bits
+    callback(Msg(f"{DEFAULT_PREFIX}/abc123/tamper", "0"))
+    callback(Msg(f"{DEFAULT_PREFIX}/abc123/battery_ok", "1"))
+    hass.loop.advance(1)
+    assert (tamper.is_on, battery.is_on) == (False, False)
+
+
+def test_unknown_event_logged_once_per_code(hass, caplog):
+    _hub, (contact, *_rest) = _setup(hass)
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+    callback(Msg(f"{DEFAULT_PREFIX}/abc123/event", "17"))
+    hass.loop.advance(1)
+
+    with caplog.at_level(logging.DEBUG, logger="custom_components.ha_mqtt_sensors.binary_sensor"):
+        for _ in range(3):
+            _ = contact.is_on
+    assert caplog.text.count("Unknown event code 17") == 1
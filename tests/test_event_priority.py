@@ -29,7 +29,7 @@ def test_event_overrides_state(hass):
     entity.hass = hass
     asyncio.run(entity.async_added_to_hass())
 
-    callback = subscriptions[f"{DEFAULT_PREFIX}/{sensor_id}/+"]
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
 
     class Msg:
         def __init__(self, topic, payload):
@@ -38,9 +38,12 @@ def test_event_overrides_state(hass):
 
     # Simulate initial open event with accompanying state text
     callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/state", "open"))
+    hass.loop.advance(1)
     callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/event", "160"))
+    hass.loop.advance(1)
     assert entity.is_on is True
 
     # Now send a closed event without changing state text
     callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/event", "128"))
+    hass.loop.advance(1)
     assert entity.is_on is False
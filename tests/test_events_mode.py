@@ -0,0 +1,97 @@
+import json
+import threading
+
+import pytest
+
+from custom_components.ha_mqtt_sensors.binary_sensor import ContactEntity
+from custom_components.ha_mqtt_sensors.const import (
+    CONF_INGEST_MODE,
+    INGEST_MODE_EVENTS,
+    CONF_EVENTS_TOPIC,
+    DEFAULT_EVENTS_TOPIC,
+)
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.mqtt import subscriptions
+
+
+@pytest.fixture
+def events_hub(make_hub):
+    """Set up an events-mode hub for ``sensor_id``, optionally on its own ``topic``."""
+    def make(sensor_id, entry_id, topic=None):
+        options = {CONF_INGEST_MODE: INGEST_MODE_EVENTS}
+        if topic:
+            options[CONF_EVENTS_TOPIC] = topic
+        return make_hub(options, sensor_id=sensor_id, entry_id=entry_id)
+    return make
+
+
+def _event(sensor_id, **fields):
+    doc = {"time": "2025-08-16 01:10:15", "model": "Honeywell-Security", "id": sensor_id}
+    doc.update(fields)
+    return json.dumps(doc).encode()
+
+
+def test_events_mode_subscribes_to_events_topic(events_hub):
+    subscriptions.clear()
+    events_hub("502442", "entry1")
+    events_hub("702442", "entry2")
+    assert list(subscriptions) == [DEFAULT_EVENTS_TOPIC]
+
+
+def test_event_document_updates_all_fields_at_once(events_hub, add_entity, message):
+    subscriptions.clear()
+    hub = events_hub("502442", "entry1", topic="rtl_433/host/events")
+    other = events_hub("702442", "entry2", topic="rtl_433/host/events")
+
+    entity = add_entity(
+        ContactEntity(hub, hub.entry, DeviceInfo(), "Door", BinarySensorDeviceClass.DOOR)
+    )
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(entity.is_on)
+
+    callback = subscriptions["rtl_433/host/events"]
+    callback(message("rtl_433/host/events", _event(502442, event=160, state="open", tamper=0, rssi=-12.345)))
+
+    assert hub.record.event == 160
+    assert hub.record.state == "open"
+    assert hub.record.tamper is False
+    assert hub.record.rssi == -12.345
+    assert hub.counters.decode_failures == 0
+    assert hub.stats.rssi.mean == pytest.approx(-12.345)
+    assert "model" not in hub.record.extra
+    assert hub.last_seen_utc is not None
+    assert writes == [True]
+    assert other.record.time is None
+
+
+def test_events_mode_ignores_malformed_documents(events_hub, message):
+    subscriptions.clear()
+    hub = events_hub("502442", "entry1")
+    callback = subscriptions[DEFAULT_EVENTS_TOPIC]
+
+    callback(message("rtl_433/host/events", b"not json"))
+    callback(message("rtl_433/host/events", b"[1, 2]"))
+    callback(message("rtl_433/host/events", json.dumps({"model": "x"}).encode()))
+    assert hub.record.time is None
+
+
+def test_off_loop_events_are_queued_for_the_loop(hass, events_hub, message):
+    subscriptions.clear()
+    hub = events_hub("502442", "entry1")
+    hops = []
+    hass.loop.call_soon_threadsafe = lambda func, *args: hops.append(func)
+
+    callback = subscriptions[DEFAULT_EVENTS_TOPIC]
+    worker = threading.Thread(target=lambda: [
+        callback(message(DEFAULT_EVENTS_TOPIC, _event(502442, event=event))) for event in (160, 128)
+    ])
+    worker.start()
+    worker.join()
+    assert len(hops) == 1
+    assert hub.packets_accepted == 0
+
+    hops[0]()
+    assert hub.record.event == 128
+    assert hub.packets_accepted == 2
+    assert hub.counters.as_dict(hass.loop.time())["messages"]["json"] == 2
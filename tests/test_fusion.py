@@ -0,0 +1,98 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from custom_components.ha_mqtt_sensors import config_flow
+from custom_components.ha_mqtt_sensors.binary_sensor import AvailabilityEntity, ContactEntity
+from custom_components.ha_mqtt_sensors.const import (
+    DEFAULT_PREFIX,
+    PACKET_QUIET_SECONDS,
+    CONF_FUSION_PREFIXES,
+    CONF_FUSION_WINDOW,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.mqtt import subscriptions
+from homeassistant.util import dt as dt_util
+
+PREFIXES = (DEFAULT_PREFIX, "rx_attic", "rx_garage")
+
+
+@pytest.fixture
+def fused(make_hub, add_entity, counting):
+    subscriptions.clear()
+    hub = make_hub({CONF_FUSION_PREFIXES: "rx_attic, rx_garage rx_attic", CONF_FUSION_WINDOW: 500})
+    contact = ContactEntity(hub, hub.entry, DeviceInfo(), "Door", BinarySensorDeviceClass.DOOR)
+    availability = AvailabilityEntity(hub, hub.entry, DeviceInfo(), "Connectivity")
+    for entity in (contact, availability):
+        counting(add_entity(entity))
+    return hub, contact, availability
+
+
+@pytest.fixture
+def send(send_burst, burst):
+    """Publish the packet on ``prefix`` with the receiver's own rssi and time."""
+    def _send(prefix, rssi, time="2025-08-16 01:10:15"):
+        packet = [("time", time)] + burst[1:-1] + [("rssi", rssi)]
+        send_burst(subscriptions[f"{prefix}/+/+"], packet, prefix=prefix)
+    return _send
+
+
+def test_hub_subscribes_once_per_prefix(fused):
+    hub, _contact, _availability = fused
+    assert hub.prefixes == PREFIXES
+    assert sorted(subscriptions) == sorted(f"{prefix}/+/+" for prefix in PREFIXES)
+
+    asyncio.run(hub.async_unload())
+    assert subscriptions == {}
+
+
+def test_copies_are_fused_keeping_the_strongest(hass, fused, send):
+    hub, contact, availability = fused
+    # Receiver clocks differ, so each copy carries its own time
+    send(DEFAULT_PREFIX, "-61", "2025-08-16 01:10:15")
+    send("rx_attic", "-44", "2025-08-16 01:10:16")
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    send("rx_garage", "-52", "2025-08-16 01:10:14")
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert hub.packets_accepted == 0
+
+    hass.loop.advance(0.5)
+    assert (hub.packets_accepted, hub.packets_fused) == (1, 2)
+    assert hub.record.rssi == -44
+    assert hub.record.time == "2025-08-16 01:10:16"
+    assert contact.writes == 1
+
+    attrs = availability.extra_state_attributes
+    assert attrs["receiver"] == "rx_attic"
+    assert set(attrs["receivers_last_seen"]) == set(PREFIXES)
+    assert attrs["packets_fused"] == 2
+
+    # A late copy after the fusion window is a suppressed retransmission
+    send("rx_garage", "-40", "2025-08-16 01:10:14")
+    hass.loop.advance(PACKET_QUIET_SECONDS + 0.5)
+    assert (hub.packets_accepted, hub.packets_suppressed) == (1, 1)
+    assert hub.record.rssi == -44
+
+
+def test_any_receiver_keeps_the_sensor_available(hass, fused, send):
+    hub, _contact, availability = fused
+    hub.async_set_last_seen(dt_util.utcnow() - timedelta(hours=2))
+    hub._async_update_availability()
+    assert hub.online is False
+
+    send("rx_garage", "-70")
+    hass.loop.advance(PACKET_QUIET_SECONDS + 0.5)
+    assert hub.online is True
+    assert hub.receiver == "rx_garage"
+    assert list(hub.receivers_last_seen) == ["rx_garage"]
+    assert availability.writes == 2
+
+
+def test_options_flow_offers_fusion():
+    handler = config_flow.OptionsFlowHandler(ConfigEntry(data={}, options={}))
+    result = asyncio.run(handler.async_step_init())
+    assert CONF_FUSION_PREFIXES in result["data_schema"].schema
+    assert CONF_FUSION_WINDOW in result["data_schema"].schema
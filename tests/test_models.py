@@ -0,0 +1,59 @@
+import pytest
+
+from custom_components.ha_mqtt_sensors.models import SensorRecord
+
+
+def test_fields_are_converted_once_at_ingest():
+    record = SensorRecord()
+    record.set("event", "0x80")
+    record.set("channel", "10")
+    record.set("rssi", -42)
+    record.set("tamper", "1")
+    record.set("alarm", 0)
+    record.set("battery_ok", "0")
+    record.set("state", "Open")
+    record.set("mic", "CRC")
+    record.set("snr", 12.5)
+
+    assert record.event == 128
+    assert record.channel == 10
+    assert record.rssi == -42
+    assert record.tamper is True
+    assert record.alarm is False
+    assert record.battery_ok is False
+    assert record.state == "Open"
+    assert record.state_open is True
+    assert record.mic == "CRC"
+    assert record.get("snr") == "12.5"
+
+
+@pytest.mark.parametrize("raw", ["abc", "", "-42.5"])
+def test_unparseable_int_is_none(raw):
+    record = SensorRecord()
+    record.set("heartbeat", raw)
+    assert record.heartbeat is None
+
+
+@pytest.mark.parametrize(("raw", "value"), [("-12.345", -12.345), (-12.345, -12.345), ("-42", -42.0), (-42, -42.0)])
+def test_rssi_keeps_decimals(raw, value):
+    record = SensorRecord()
+    record.set("rssi", raw)
+    assert record.rssi == value
+    assert isinstance(record.rssi, float)
+
+
+def test_set_reports_changes():
+    record = SensorRecord()
+    assert record.set("event", "160") is True
+    assert record.set("event", "160") is False
+    assert record.set("event", 160) is False
+    assert record.set("state", "dry") is True
+    assert record.state_open is False
+    assert record.set("model", "Honeywell") is True
+    assert record.set("model", "Honeywell") is False
+
+
+def test_record_has_no_instance_dict():
+    record = SensorRecord()
+    with pytest.raises(AttributeError):
+        record.unknown_field = 1
@@ -3,6 +3,7 @@ import logging
 
 from custom_components.ha_mqtt_sensors import MqttHub
 from custom_components.ha_mqtt_sensors.const import (
+    DOMAIN,
     CONF_SENSOR_ID,
     CONF_NAME,
     CONF_PREFIX,
@@ -18,6 +19,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.components.mqtt import subscriptions
+import homeassistant.helpers.entity_registry as entity_registry
 import homeassistant.helpers.restore_state as restore_state
 
 
@@ -38,7 +40,7 @@ def test_contact_entity_state_updates(hass):
     assert entity.is_on is False
 
     topic = f"{DEFAULT_PREFIX}/{sensor_id}/state"
-    callback = subscriptions[f"{DEFAULT_PREFIX}/{sensor_id}/+"]
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
 
     class Msg:
         def __init__(self, topic, payload):
@@ -46,6 +48,7 @@ def test_contact_entity_state_updates(hass):
             self.payload = payload
 
     callback(Msg(topic, "open"))
+    hass.loop.advance(1)
     assert entity.is_on is True
 
 
@@ -66,7 +69,7 @@ def test_contact_entity_event_updates(hass):
     assert entity.is_on is False
 
     topic = f"{DEFAULT_PREFIX}/{sensor_id}/event"
-    callback = subscriptions[f"{DEFAULT_PREFIX}/{sensor_id}/+"]
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
 
     class Msg:
         def __init__(self, topic, payload):
@@ -75,9 +78,11 @@ def test_contact_entity_event_updates(hass):
 
     for code in (160, 168, 192, 200, 232):
         callback(Msg(topic, str(code)))
+        hass.loop.advance(1)
         assert entity.is_on is True
     for code in (128, 40, 64, 104):
         callback(Msg(topic, str(code)))
+        hass.loop.advance(1)
         assert entity.is_on is False
 
 
@@ -95,7 +100,7 @@ def test_contact_ignores_topics_by_default(hass):
     entity.hass = hass
     asyncio.run(entity.async_added_to_hass())
 
-    callback = subscriptions[f"{DEFAULT_PREFIX}/{sensor_id}/+"]
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
 
     class Msg:
         def __init__(self, topic, payload):
@@ -103,10 +108,13 @@ def test_contact_ignores_topics_by_default(hass):
             self.payload = payload
 
     callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/contact_open", "1"))
+    hass.loop.advance(1)
     assert entity.is_on is False
     callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/event", "128"))
+    hass.loop.advance(1)
     assert entity.is_on is False
     callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/reed_open", "1"))
+    hass.loop.advance(1)
     assert entity.is_on is False
 
 
@@ -124,7 +132,7 @@ def test_contact_topic_enabled_option(hass):
     entity.hass = hass
     asyncio.run(entity.async_added_to_hass())
 
-    callback = subscriptions[f"{DEFAULT_PREFIX}/{sensor_id}/+"]
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
 
     class Msg:
         def __init__(self, topic, payload):
@@ -132,8 +140,10 @@ def test_contact_topic_enabled_option(hass):
             self.payload = payload
 
     callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/contact_open", "1"))
+    hass.loop.advance(1)
     assert entity.is_on is True
     callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/contact_open", "0"))
+    hass.loop.advance(1)
     assert entity.is_on is False
 
 
@@ -151,7 +161,7 @@ def test_reed_topic_enabled_option(hass):
     entity.hass = hass
     asyncio.run(entity.async_added_to_hass())
 
-    callback = subscriptions[f"{DEFAULT_PREFIX}/{sensor_id}/+"]
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
 
     class Msg:
         def __init__(self, topic, payload):
@@ -159,8 +169,10 @@ def test_reed_topic_enabled_option(hass):
             self.payload = payload
 
     callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/reed_open", "1"))
+    hass.loop.advance(1)
     assert entity.is_on is True
     callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/reed_open", "0"))
+    hass.loop.advance(1)
     assert entity.is_on is False
 
 def test_contact_event_updates_after_restore(hass):
@@ -175,14 +187,13 @@ def test_contact_event_updates_after_restore(hass):
 
     entity = ContactEntity(hub, entry, DeviceInfo(), "Test Window", BinarySensorDeviceClass.WINDOW)
     entity.hass = hass
-    entity.entity_id = "binary_sensor.test_window"
-    restore_state.last_states[entity.entity_id] = restore_state.State("off")
+    hub.async_seed({"contact": "off"})
     asyncio.run(entity.async_added_to_hass())
 
     assert entity.is_on is False
 
     topic = f"{DEFAULT_PREFIX}/{sensor_id}/event"
-    callback = subscriptions[f"{DEFAULT_PREFIX}/{sensor_id}/+"]
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
 
     class Msg:
         def __init__(self, topic, payload):
@@ -190,6 +201,7 @@ def test_contact_event_updates_after_restore(hass):
             self.payload = payload
 
     callback(Msg(topic, "160"))
+    hass.loop.advance(1)
     assert entity.is_on is True
 
 
@@ -228,8 +240,7 @@ def test_contact_entity_restores_state(hass):
 
     entity = ContactEntity(hub, entry, DeviceInfo(), "Test Door", BinarySensorDeviceClass.DOOR)
     entity.hass = hass
-    entity.entity_id = "binary_sensor.test_door"
-    restore_state.last_states[entity.entity_id] = restore_state.State("on")
+    hub.async_seed({"contact": "on"})
     asyncio.run(entity.async_added_to_hass())
 
     assert entity.is_on is True
@@ -247,8 +258,7 @@ def test_int_sensor_restores_state(hass):
 
     entity = IntTopicSensor(hub, entry, DeviceInfo(), "Test Event", "event")
     entity.hass = hass
-    entity.entity_id = "sensor.test_event"
-    restore_state.last_states[entity.entity_id] = restore_state.State("5")
+    hub.async_seed({"event": "5"})
     asyncio.run(entity.async_added_to_hass())
 
     assert entity.native_value == 5
@@ -261,14 +271,15 @@ def test_last_seen_sensor_restores_state_and_hub(hass):
         options={},
         entry_id="entry1",
     )
+    ts = "2024-01-02 03:04:05"
+    unique_id = f"{DEFAULT_PREFIX}_{sensor_id}_last_seen"
+    entity_registry.entity_ids[("sensor", DOMAIN, unique_id)] = "sensor.test_last_seen"
+    restore_state.last_states["sensor.test_last_seen"] = restore_state.State(ts)
     hub = MqttHub(hass, entry)
     asyncio.run(hub.async_setup())
 
     entity = LastSeenSensor(hub, entry, DeviceInfo(), "Test Last Seen")
     entity.hass = hass
-    entity.entity_id = "sensor.test_last_seen"
-    ts = "2024-01-02 03:04:05"
-    restore_state.last_states[entity.entity_id] = restore_state.State(ts)
     asyncio.run(entity.async_added_to_hass())
 
     parsed = parse_datetime_utc(hass, ts)
@@ -292,7 +303,7 @@ def test_rssi_sensor_updates(hass):
 
     assert entity.native_value is None
 
-    callback = subscriptions[f"{DEFAULT_PREFIX}/{sensor_id}/+"]
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
 
     class Msg:
         def __init__(self, topic, payload):
@@ -300,8 +311,16 @@ def test_rssi_sensor_updates(hass):
             self.payload = payload
 
     callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/rssi", "-42"))
+    hass.loop.advance(1)
     assert entity.native_value == -42
 
+    # rtl_433 reports dB with decimals
+    hass.loop.advance(10)
+    callback(Msg(f"{DEFAULT_PREFIX}/{sensor_id}/rssi", "-12.345"))
+    hass.loop.advance(1)
+    assert entity.native_value == -12.345
+    assert hub.counters.decode_failures == 0
+
 
 def test_unknown_event_logs_debug(hass, caplog):
     sensor_id = "abc123"
@@ -318,7 +337,7 @@ def test_unknown_event_logs_debug(hass, caplog):
     asyncio.run(entity.async_added_to_hass())
 
     topic = f"{DEFAULT_PREFIX}/{sensor_id}/event"
-    callback = subscriptions[f"{DEFAULT_PREFIX}/{sensor_id}/+"]
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
 
     class Msg:
         def __init__(self, topic, payload):
@@ -327,7 +346,40 @@ def test_unknown_event_logs_debug(hass, caplog):
 
     with caplog.at_level(logging.DEBUG, logger="custom_components.ha_mqtt_sensors.binary_sensor"):
         callback(Msg(topic, "999"))
+        hass.loop.advance(1)
         _ = entity.is_on
         assert "Unknown event code 999" in caplog.text
 
 
+
+
+def test_hub_seeds_typed_restored_states(hass):
+    entry = ConfigEntry(
+        data={CONF_SENSOR_ID: "abc123", CONF_NAME: "Test", CONF_PREFIX: DEFAULT_PREFIX},
+        options={},
+        entry_id="entry1",
+    )
+    states = {
+        "binary_sensor": {"contact": "on", "tamper": "off", "battery": "on", "availability": "off"},
+        "sensor": {"rssi": "-48", "channel": "unavailable", "last_seen": "unknown"},
+    }
+    for platform, by_suffix in states.items():
+        for suffix, state in by_suffix.items():
+            entity_id = f"{platform}.test_{suffix}"
+            entity_registry.entity_ids[(platform, DOMAIN, f"{DEFAULT_PREFIX}_abc123_{suffix}")] = entity_id
+            restore_state.last_states[entity_id] = restore_state.State(state)
+    hub = MqttHub(hass, entry)
+    asyncio.run(hub.async_setup())
+
+    record = hub.record
+    assert (record.event, record.event_flags) == (160, None)
+    assert (record.tamper, record.battery_ok, record.rssi, record.channel) == (False, False, -48, None)
+    assert hub.online is False
+
+    entity = ContactEntity(hub, entry, DeviceInfo(), "Test Door", BinarySensorDeviceClass.DOOR)
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(1)
+    entity.hass = hass
+    asyncio.run(entity.async_added_to_hass())
+    assert entity.is_on is True
+    assert writes == []
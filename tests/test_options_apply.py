@@ -0,0 +1,150 @@
+import asyncio
+from datetime import timedelta
+
+from custom_components.ha_mqtt_sensors import ReceiverHub, _update_listener
+from custom_components.ha_mqtt_sensors.binary_sensor import AvailabilityEntity, ContactEntity
+from custom_components.ha_mqtt_sensors.policy import WritePolicy
+from custom_components.ha_mqtt_sensors.sensor import SignalStrengthSensor, _rssi_settings
+from custom_components.ha_mqtt_sensors.const import (
+    DOMAIN,
+    CONF_SENSOR_ID,
+    CONF_NAME,
+    CONF_PREFIX,
+    DEFAULT_PREFIX,
+    CONF_DEVICE_TYPE,
+    CONF_DIRECT_DISPATCH,
+    CONF_ENTRY_TYPE,
+    ENTRY_TYPE_RECEIVER,
+    CONF_SENSORS,
+    CONF_AVAIL_MINUTES,
+    CONF_SENSOR_SOURCE,
+    SENSOR_SOURCE_EXTERNAL,
+    SENSOR_SOURCE_INTERNAL,
+    CONF_RSSI_DEADBAND,
+    CONF_RSSI_AGGREGATE,
+    CONF_RSSI_WINDOW,
+    AGGREGATE_MAX,
+    PACKET_QUIET_SECONDS,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.mqtt import subscriptions
+from homeassistant.util import dt as dt_util
+
+TOPIC = f"{DEFAULT_PREFIX}/+/+"
+
+
+def test_hot_options_apply_without_reload(hass, make_hub, add_entity, counting):
+    hub = make_hub({CONF_AVAIL_MINUTES: 30})
+    entry = hub.entry
+    callback = subscriptions[TOPIC]
+    availability = counting(add_entity(AvailabilityEntity(hub, entry, DeviceInfo(), "Connectivity")))
+    hub.async_set_last_seen(dt_util.utcnow() - timedelta(minutes=10))
+    assert availability.is_on is True
+
+    entry.options = {CONF_AVAIL_MINUTES: 5}
+    asyncio.run(_update_listener(hass, entry))
+    assert hass.config_entries.reloaded == []
+    assert subscriptions[TOPIC] is callback
+    assert availability.is_on is False
+    assert availability.writes == 1
+
+
+def test_sensor_source_change_rewrites_contact(
+    hass, make_hub, add_entity, counting, send_burst, burst
+):
+    hub = make_hub({CONF_SENSOR_SOURCE: SENSOR_SOURCE_EXTERNAL})
+    entry = hub.entry
+    contact = counting(add_entity(
+        ContactEntity(hub, entry, DeviceInfo(), "Door", BinarySensorDeviceClass.DOOR)
+    ))
+    send_burst(subscriptions[TOPIC], [(s, "0" if s == "contact_open" else p) for s, p in burst])
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert contact.is_on is False
+
+    entry.options = {CONF_SENSOR_SOURCE: SENSOR_SOURCE_INTERNAL}
+    asyncio.run(_update_listener(hass, entry))
+    assert hass.config_entries.reloaded == []
+    assert contact.is_on is True
+    assert contact.writes == 2
+
+
+def test_rssi_policy_follows_options(hass, make_hub, add_entity):
+    hub = make_hub({CONF_DIRECT_DISPATCH: True})
+    entry = hub.entry
+    rssi = add_entity(SignalStrengthSensor(
+        hub, entry, DeviceInfo(), "RSSI", "rssi", settings=_rssi_settings
+    ))
+    entry.options = {
+        CONF_DIRECT_DISPATCH: True,
+        CONF_RSSI_DEADBAND: 10,
+        CONF_RSSI_AGGREGATE: AGGREGATE_MAX,
+        CONF_RSSI_WINDOW: 60,
+    }
+    asyncio.run(_update_listener(hass, entry))
+    assert hass.config_entries.reloaded == []
+    assert (rssi._policy.deadband, rssi._policy.aggregate, rssi._policy.window) == (10, AGGREGATE_MAX, 60)
+
+
+def test_structural_changes_reload(hass, make_hub):
+    entry = make_hub().entry
+    # Options a previous version did not store are compared by their defaults
+    entry.options = {CONF_DIRECT_DISPATCH: False}
+    asyncio.run(_update_listener(hass, entry))
+    assert hass.config_entries.reloaded == []
+
+    for options in ({CONF_DEVICE_TYPE: "door"}, {CONF_PREFIX: "rtl_433/other"}):
+        hass.config_entries.reloaded.clear()
+        entry.options = options
+        asyncio.run(_update_listener(hass, entry))
+        assert hass.config_entries.reloaded == [entry.entry_id]
+
+
+def test_receiver_applies_shared_options_to_every_hub(hass):
+    entry = ConfigEntry(
+        data={CONF_ENTRY_TYPE: ENTRY_TYPE_RECEIVER, CONF_NAME: "Rx", CONF_PREFIX: DEFAULT_PREFIX},
+        options={CONF_SENSORS: [
+            {CONF_SENSOR_ID: "1"},
+            {CONF_SENSOR_ID: "2", CONF_SENSOR_SOURCE: SENSOR_SOURCE_EXTERNAL},
+        ]},
+        entry_id="rx",
+    )
+    receiver = ReceiverHub(hass, entry)
+    asyncio.run(receiver.async_setup())
+    hass.data[DOMAIN] = {entry.entry_id: receiver}
+
+    entry.options = {**entry.options, CONF_SENSOR_SOURCE: SENSOR_SOURCE_INTERNAL}
+    asyncio.run(_update_listener(hass, entry))
+    assert hass.config_entries.reloaded == []
+    # A sensor's own setting still overrides the shared one
+    assert [hub.sensor_source for hub in receiver.hubs] == [
+        SENSOR_SOURCE_INTERNAL, SENSOR_SOURCE_EXTERNAL,
+    ]
+
+    # So is a source changed in the sensor list
+    entry.options = {**entry.options, CONF_SENSORS: [
+        {CONF_SENSOR_ID: "1"},
+        {CONF_SENSOR_ID: "2", CONF_SENSOR_SOURCE: SENSOR_SOURCE_INTERNAL},
+    ]}
+    asyncio.run(_update_listener(hass, entry))
+    assert hass.config_entries.reloaded == []
+    assert receiver.hubs[1].sensor_source == SENSOR_SOURCE_INTERNAL
+
+    entry.options = {**entry.options, CONF_SENSORS: [{CONF_SENSOR_ID: "1"}]}
+    asyncio.run(_update_listener(hass, entry))
+    assert hass.config_entries.reloaded == [entry.entry_id]
+
+
+def test_policy_reconfigure_closes_open_window(hass):
+    written = []
+    policy = WritePolicy(aggregate=AGGREGATE_MAX, window=60)
+    policy.async_start(hass, lambda: written.append(policy.value), None)
+    policy.async_offer(-50)
+    policy.async_offer(-40)
+    policy.async_configure(deadband=5)
+    assert written == [-40]
+    policy.async_offer(-38)
+    assert written == [-40]
+    hass.loop.advance(60)
+    assert written == [-40]
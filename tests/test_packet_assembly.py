@@ -0,0 +1,189 @@
+import asyncio
+import threading
+
+import pytest
+
+from custom_components.ha_mqtt_sensors.binary_sensor import ContactEntity, TamperEntity
+from custom_components.ha_mqtt_sensors.sensor import IntTopicSensor
+from custom_components.ha_mqtt_sensors.const import (
+    DEFAULT_PREFIX,
+    PACKET_QUIET_SECONDS,
+    CONF_DEDUP_WINDOW,
+    CONF_DIRECT_DISPATCH,
+)
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.mqtt import subscriptions
+
+@pytest.fixture
+def hub_entities(make_hub, add_entity, counting):
+    hub = make_hub()
+    entry = hub.entry
+    entities = [
+        ContactEntity(hub, entry, DeviceInfo(), "Door", BinarySensorDeviceClass.DOOR),
+        TamperEntity(hub, entry, DeviceInfo(), "Tamper"),
+        IntTopicSensor(hub, entry, DeviceInfo(), "Channel", "channel"),
+    ]
+    for entity in entities:
+        counting(add_entity(entity))
+    return hub, entities
+
+
+def test_burst_commits_after_quiet_window(hass, hub_entities, send_burst):
+    hub, (contact, tamper, channel) = hub_entities
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+
+    send_burst(callback)
+    assert hub.record.time is None
+    assert contact.is_on is False
+    assert contact.writes == 0
+
+    hass.loop.advance(PACKET_QUIET_SECONDS / 2)
+    assert contact.writes == 0
+
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert hub.record.event == 160
+    assert contact.is_on is True
+    assert (contact.writes, tamper.writes, channel.writes) == (1, 1, 1)
+
+
+def test_time_field_closes_previous_packet(hass, hub_entities, send_burst):
+    hub, (contact, _tamper, _channel) = hub_entities
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+
+    send_burst(callback)
+    send_burst(callback, [("time", "2025-08-16 01:10:20")])
+
+    assert hub.record.event == 160
+    assert hub.record.time == "2025-08-16 01:10:15"
+    assert contact.writes == 1
+
+    hass.loop.advance(1)
+    assert hub.record.time == "2025-08-16 01:10:20"
+    assert contact.writes == 1
+
+
+def test_unload_discards_pending_packet(hass, hub_entities, send_burst):
+    hub, (contact, _tamper, _channel) = hub_entities
+    send_burst(subscriptions[f"{DEFAULT_PREFIX}/+/+"])
+
+    asyncio.run(hub.async_unload())
+    hass.loop.advance(1)
+    assert hub.record.time is None
+    assert contact.writes == 0
+
+
+def test_retransmissions_are_suppressed(hass, hub_entities, send_burst, burst):
+    hub, (contact, _tamper, _channel) = hub_entities
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+
+    send_burst(callback)
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    first_seen = hub.last_seen_utc
+    # Repeats arrive within the same second as the original; only rssi differs
+    repeat = [(s, "-47") if s == "rssi" else (s, p) for s, p in burst]
+    for _ in range(3):
+        send_burst(callback, repeat)
+        hass.loop.advance(PACKET_QUIET_SECONDS)
+
+    assert (hub.packets_accepted, hub.packets_suppressed) == (1, 3)
+    assert hub.record.rssi == -42
+    assert hub.last_seen_utc >= first_seen
+    assert contact.writes == 1
+
+    # The same content in a later second, outside the window, is a new packet
+    hass.loop.advance(5)
+    repeat[0] = ("time", "2025-08-16 01:10:21")
+    send_burst(callback, repeat)
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert (hub.packets_accepted, hub.packets_suppressed) == (2, 3)
+    assert hub.record.rssi == -47
+
+
+def test_dedup_window_zero_disables_suppression(hass, make_hub, send_burst):
+    hub = make_hub({CONF_DEDUP_WINDOW: 0})
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+    for _ in range(2):
+        send_burst(callback)
+        hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert (hub.packets_accepted, hub.packets_suppressed) == (2, 0)
+
+
+def test_only_entities_with_changed_values_are_written(hass, hub_entities, send_burst, burst):
+    hub, (contact, tamper, channel) = hub_entities
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+
+    send_burst(callback)
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert (contact.writes, tamper.writes, channel.writes) == (1, 1, 1)
+
+    # A later packet repeating every value (e.g. a retained replay) writes nothing
+    hass.loop.advance(10)
+    send_burst(callback)
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert (contact.writes, tamper.writes, channel.writes) == (1, 1, 1)
+
+    hass.loop.advance(10)
+    send_burst(callback, [(s, "1") if s == "tamper" else (s, p) for s, p in burst])
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert (contact.writes, tamper.writes, channel.writes) == (1, 2, 1)
+    assert (hub.packets_accepted, hub.packets_replayed) == (2, 1)
+
+
+def test_loop_thread_messages_are_handled_inline(hass, hub_entities, send_burst):
+    hub, (contact, _tamper, _channel) = hub_entities
+    hops = []
+    hass.loop.call_soon_threadsafe = lambda func, *args: hops.append(func)
+
+    send_burst(subscriptions[f"{DEFAULT_PREFIX}/+/+"])
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert hops == []
+    assert contact.writes == 1
+
+
+def test_off_loop_burst_uses_one_thread_hop(hass, hub_entities, send_burst):
+    hub, (contact, _tamper, _channel) = hub_entities
+    hops = []
+    hass.loop.call_soon_threadsafe = lambda func, *args: hops.append(func)
+
+    worker = threading.Thread(target=send_burst, args=(subscriptions[f"{DEFAULT_PREFIX}/+/+"],))
+    worker.start()
+    worker.join()
+    assert len(hops) == 1
+    assert hub.record.time is None
+
+    hops[0]()
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert hub.record.event == 160
+    assert contact.writes == 1
+
+
+def test_hub_has_one_update_signal(hub_entities):
+    hub, _entities = hub_entities
+    assert hub._update_signal == "ha_mqtt_sensors_update_entry1_packet"
+
+
+def test_direct_dispatch_bypasses_dispatcher(
+    hass, monkeypatch, make_hub, add_entity, counting, send_burst
+):
+    import custom_components.ha_mqtt_sensors as integration
+
+    sent = []
+    monkeypatch.setattr(integration, "async_dispatcher_send", lambda *args: sent.append(args))
+    hub = make_hub({CONF_DIRECT_DISPATCH: True})
+    entry = hub.entry
+    contact = counting(add_entity(
+        ContactEntity(hub, entry, DeviceInfo(), "Door", BinarySensorDeviceClass.DOOR)
+    ))
+    channel = counting(add_entity(IntTopicSensor(hub, entry, DeviceInfo(), "Channel", "channel")))
+
+    send_burst(subscriptions[f"{DEFAULT_PREFIX}/+/+"])
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert (contact.writes, channel.writes) == (1, 1)
+    assert sent == []
+
+    asyncio.run(contact.async_will_remove_from_hass())
+    hass.loop.advance(10)
+    send_burst(subscriptions[f"{DEFAULT_PREFIX}/+/+"], [("event", "128"), ("channel", "11")])
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert (contact.writes, channel.writes) == (1, 2)
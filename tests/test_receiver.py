@@ -0,0 +1,202 @@
+import asyncio
+
+import pytest
+
+from custom_components.ha_mqtt_sensors import ReceiverHub, async_entry_hubs
+from custom_components.ha_mqtt_sensors import binary_sensor, config_flow, sensor
+from custom_components.ha_mqtt_sensors.binary_sensor import ContactEntity
+from custom_components.ha_mqtt_sensors.const import (
+    DOMAIN,
+    CONF_SENSOR_ID,
+    CONF_NAME,
+    CONF_PREFIX,
+    DEFAULT_PREFIX,
+    CONF_DEVICE_TYPE,
+    CONF_SENSOR_SOURCE,
+    CONF_ENTRY_TYPE,
+    ENTRY_TYPE_RECEIVER,
+    CONF_SENSORS,
+    CONF_SENSOR_LIST,
+    SENSOR_SOURCE_EXTERNAL,
+    SENSOR_SOURCE_INTERNAL,
+)
+from homeassistant.config_entries import AbortFlow, ConfigEntry
+from homeassistant.components.mqtt import subscriptions
+
+CSV = """id,name,device_type,sensor_source
+502442,Front Door,door,external
+702442,Kitchen Window
+"""
+
+
+class Msg:
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = payload
+
+
+def _receiver_entry(sensors):
+    return ConfigEntry(
+        data={CONF_ENTRY_TYPE: ENTRY_TYPE_RECEIVER, CONF_NAME: "Garage", CONF_PREFIX: DEFAULT_PREFIX},
+        options={CONF_PREFIX: DEFAULT_PREFIX, CONF_SENSORS: sensors},
+        entry_id="receiver1",
+    )
+
+
+def test_parse_sensor_list_accepts_ids_and_csv():
+    sensors = config_flow.parse_sensor_list("111 222\n333\n\n", "door", SENSOR_SOURCE_EXTERNAL)
+    assert [s[CONF_SENSOR_ID] for s in sensors] == ["111", "222", "333"]
+    assert all(s[CONF_DEVICE_TYPE] == "door" for s in sensors)
+    assert sensors[0][CONF_NAME] == "Sensor 111"
+
+    front, kitchen = config_flow.parse_sensor_list(CSV)
+    assert front == {
+        CONF_SENSOR_ID: "502442",
+        CONF_NAME: "Front Door",
+        CONF_DEVICE_TYPE: "door",
+        CONF_SENSOR_SOURCE: SENSOR_SOURCE_EXTERNAL,
+    }
+    assert kitchen[CONF_DEVICE_TYPE] == "window"
+    assert kitchen[CONF_SENSOR_SOURCE] == SENSOR_SOURCE_INTERNAL
+
+    assert config_flow.parse_sensor_list(config_flow.format_sensor_list([front, kitchen])) == [front, kitchen]
+
+
+@pytest.mark.parametrize("text", ["111,Door,garage", "111,Door,door,both", "111\n111"])
+def test_parse_sensor_list_rejects_bad_rows(text):
+    with pytest.raises(ValueError):
+        config_flow.parse_sensor_list(text)
+
+
+def test_receiver_step_creates_entry():
+    flow = config_flow.ConfigFlow()
+    menu = asyncio.run(flow.async_step_user())
+    assert menu["menu_options"] == ["sensor", "receiver"]
+
+    result = asyncio.run(flow.async_step_receiver({CONF_NAME: "Garage", CONF_SENSOR_LIST: CSV}))
+    assert result["type"] == "create_entry"
+    assert result["data"][CONF_ENTRY_TYPE] == ENTRY_TYPE_RECEIVER
+    assert [s[CONF_SENSOR_ID] for s in result["options"][CONF_SENSORS]] == ["502442", "702442"]
+    assert flow.unique_id == f"{DEFAULT_PREFIX}_receiver"
+
+
+def test_receiver_step_reports_errors(monkeypatch):
+    flow = config_flow.ConfigFlow()
+    result = asyncio.run(flow.async_step_receiver({CONF_SENSOR_LIST: "111,x,garage"}))
+    assert result["errors"] == {CONF_SENSOR_LIST: "invalid_sensor_list"}
+
+    result = asyncio.run(flow.async_step_receiver({CONF_SENSOR_LIST: " \n"}))
+    assert result["errors"] == {CONF_SENSOR_LIST: "no_sensors"}
+
+    single = ConfigEntry(data={}, options={}, unique_id=f"{DEFAULT_PREFIX}_502442")
+    monkeypatch.setattr(flow, "current_entries", [single])
+    result = asyncio.run(flow.async_step_receiver({CONF_SENSOR_LIST: CSV}))
+    assert result["errors"] == {CONF_SENSOR_LIST: "sensor_already_configured"}
+
+    receiver = ConfigEntry(data={}, options={}, unique_id=f"{DEFAULT_PREFIX}_receiver")
+    monkeypatch.setattr(flow, "current_entries", [receiver])
+    with pytest.raises(AbortFlow):
+        asyncio.run(flow.async_step_receiver({CONF_SENSOR_LIST: CSV}))
+
+
+def test_receiver_options_flow_edits_sensor_list(hass):
+    entry = _receiver_entry(config_flow.parse_sensor_list(CSV))
+    handler = config_flow.OptionsFlowHandler(entry)
+    handler.hass = hass
+
+    result = asyncio.run(handler.async_step_init())
+    assert result["step_id"] == "receiver"
+    assert CONF_SENSOR_LIST in result["data_schema"].schema
+
+    result = asyncio.run(handler.async_step_receiver({CONF_SENSOR_LIST: CSV + "902442\n"}))
+    assert result["type"] == "create_entry"
+    assert [s[CONF_SENSOR_ID] for s in result["data"][CONF_SENSORS]] == ["502442", "702442", "902442"]
+
+
+def test_receiver_sets_up_all_sensors_on_one_subscription(hass):
+    subscriptions.clear()
+    entry = _receiver_entry(config_flow.parse_sensor_list(CSV + "\n".join(str(i) for i in range(10))))
+    receiver = ReceiverHub(hass, entry)
+    asyncio.run(receiver.async_setup())
+    hass.data[DOMAIN] = {entry.entry_id: receiver}
+
+    assert list(subscriptions) == [f"{DEFAULT_PREFIX}/+/+"]
+    assert len(async_entry_hubs(hass, entry)) == 12
+
+    calls = []
+    asyncio.run(binary_sensor.async_setup_entry(hass, entry, calls.append))
+    asyncio.run(sensor.async_setup_entry(hass, entry, calls.append))
+    assert [len(entities) for entities in calls] == [12 * 5, 12 * 13]
+
+    front = next(e for e in calls[0] if isinstance(e, ContactEntity))
+    assert front._attr_name == "Front Door Door"
+    assert front._attr_unique_id == f"{DEFAULT_PREFIX}_502442_contact"
+    front.hass = hass
+    asyncio.run(front.async_added_to_hass())
+
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+    callback(Msg(f"{DEFAULT_PREFIX}/502442/contact_open", "1"))
+    callback(Msg(f"{DEFAULT_PREFIX}/702442/rssi", "-51"))
+    hass.loop.advance(1)
+    front_hub, kitchen_hub = receiver.hubs[:2]
+    assert front.is_on is True
+    assert kitchen_hub.record.rssi == -51 and front_hub.record.rssi is None
+    assert front_hub._update_signal != kitchen_hub._update_signal
+
+    asyncio.run(receiver.async_unload())
+    assert subscriptions == {}
+
+
+def test_receiver_options_flow_rejects_ids_with_own_entry(hass):
+    entry = _receiver_entry(config_flow.parse_sensor_list(CSV))
+    single = ConfigEntry(data={}, options={}, entry_id="single", unique_id=f"{DEFAULT_PREFIX}_902442")
+    hass.config_entries.entries = [entry, single]
+    handler = config_flow.OptionsFlowHandler(entry)
+    handler.hass = hass
+
+    result = asyncio.run(handler.async_step_receiver({CONF_SENSOR_LIST: CSV + "902442\n"}))
+    assert result["errors"] == {CONF_SENSOR_LIST: "sensor_already_configured"}
+    # The same id under another prefix is a different sensor
+    result = asyncio.run(handler.async_step_receiver(
+        {CONF_PREFIX: "other", CONF_SENSOR_LIST: CSV + "902442\n"}
+    ))
+    assert result["type"] == "create_entry"
+
+
+def test_receiver_options_flow_rejects_ids_of_another_receiver(hass):
+    entry = _receiver_entry(config_flow.parse_sensor_list(CSV))
+    other = ConfigEntry(
+        data={CONF_ENTRY_TYPE: ENTRY_TYPE_RECEIVER, CONF_NAME: "Attic", CONF_PREFIX: "attic"},
+        options={CONF_PREFIX: "attic", CONF_SENSORS: config_flow.parse_sensor_list("502442")},
+        entry_id="receiver2",
+    )
+    hass.config_entries.entries = [entry, other]
+    handler = config_flow.OptionsFlowHandler(entry)
+    handler.hass = hass
+
+    # The entry's own list is not a conflict
+    result = asyncio.run(handler.async_step_receiver({CONF_SENSOR_LIST: CSV}))
+    assert result["type"] == "create_entry"
+    # Moving to the other receiver's prefix is, for the ids it serves
+    result = asyncio.run(handler.async_step_receiver(
+        {CONF_PREFIX: "attic", CONF_SENSOR_LIST: CSV}
+    ))
+    assert result["errors"] == {CONF_SENSOR_LIST: "sensor_already_configured"}
+
+
+def test_sensor_step_rejects_ids_of_a_receiver(monkeypatch):
+    flow = config_flow.ConfigFlow()
+    receiver = _receiver_entry(config_flow.parse_sensor_list(CSV + "902442\n"))
+    receiver.unique_id = f"{DEFAULT_PREFIX}_receiver"
+    monkeypatch.setattr(flow, "current_entries", [receiver])
+    user_input = {
+        CONF_SENSOR_ID: "902442",
+        CONF_PREFIX: DEFAULT_PREFIX,
+        CONF_SENSOR_SOURCE: SENSOR_SOURCE_INTERNAL,
+    }
+
+    result = asyncio.run(flow.async_step_sensor(user_input))
+    assert result["errors"] == {CONF_SENSOR_ID: "sensor_already_configured"}
+    # The same id under another prefix is a different sensor
+    result = asyncio.run(flow.async_step_sensor({**user_input, CONF_PREFIX: "other"}))
+    assert result["type"] == "create_entry"
@@ -0,0 +1,110 @@
+import asyncio
+
+from custom_components.ha_mqtt_sensors.const import (
+    DEFAULT_PREFIX,
+    DATA_ROUTERS,
+    SUBSCRIBE_RETRY_SECONDS,
+)
+from homeassistant.components import mqtt
+from homeassistant.components.mqtt import subscriptions
+from homeassistant.exceptions import HomeAssistantError
+
+
+def test_hubs_share_one_subscription_per_prefix(hass, make_hub, message):
+    subscriptions.clear()
+    hubs = [make_hub(sensor_id=f"id{i}", entry_id=f"entry{i}") for i in range(5)]
+    other = make_hub(sensor_id="id0", entry_id="entry_other", prefix="other")
+
+    assert sorted(subscriptions) == sorted([f"{DEFAULT_PREFIX}/+/+", "other/+/+"])
+
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+    callback(message(f"{DEFAULT_PREFIX}/id3/rssi", "-40"))
+    hass.loop.advance(1)
+    callback(message(f"{DEFAULT_PREFIX}/unknown/rssi", "-10"))
+    hass.loop.advance(1)
+
+    assert hubs[3].record.rssi == -40
+    assert all(h.record.rssi is None for i, h in enumerate(hubs) if i != 3)
+    assert other.record.rssi is None
+
+
+def test_router_unsubscribes_after_last_hub(hass, make_hub):
+    subscriptions.clear()
+    first = make_hub(sensor_id="a", entry_id="entry_a")
+    second = make_hub(sensor_id="b", entry_id="entry_b")
+
+    asyncio.run(first.async_unload())
+    assert f"{DEFAULT_PREFIX}/+/+" in subscriptions
+
+    asyncio.run(second.async_unload())
+    assert f"{DEFAULT_PREFIX}/+/+" not in subscriptions
+    assert f"{DEFAULT_PREFIX}/+/+" not in hass.data[DATA_ROUTERS]
+
+
+def test_prefix_with_slashes_routes_by_sensor_id(hass, make_hub, message):
+    subscriptions.clear()
+    hub = make_hub(sensor_id="502442", entry_id="entry1", prefix="rtl_433/sensors")
+
+    subscriptions["rtl_433/sensors/+/+"](message("rtl_433/sensors/502442/event", "160"))
+    hass.loop.advance(1)
+    assert hub.record.event == 160
+
+
+def test_setup_does_not_wait_for_subscription(hass, make_hub):
+    subscriptions.clear()
+    pending = []
+    hass.async_create_background_task = lambda coro, name, eager_start=False: pending.append(coro)
+
+    hubs = [make_hub(sensor_id=sensor_id, entry_id=f"entry_{sensor_id}") for sensor_id in "ab"]
+    assert len(pending) == 1
+    assert subscriptions == {}
+
+    # A subscription completing after every hub unloaded is dropped again
+    for hub in hubs:
+        asyncio.run(hub.async_unload())
+    asyncio.run(pending[0])
+    assert subscriptions == {}
+
+
+def test_subscription_is_retried_until_mqtt_is_available(hass, monkeypatch, make_hub):
+    subscriptions.clear()
+    available = [False]
+
+    async def _wait(hass):
+        return available[0]
+    monkeypatch.setattr(mqtt, "async_wait_for_mqtt_client", _wait)
+
+    hub = make_hub(sensor_id="id0", entry_id="entry0")
+    assert subscriptions == {}
+    available[0] = True
+    hass.loop.advance(SUBSCRIBE_RETRY_SECONDS)
+    assert list(subscriptions) == [f"{DEFAULT_PREFIX}/+/+"]
+
+    asyncio.run(hub.async_unload())
+    assert subscriptions == {}
+
+
+def test_failed_subscribe_is_retried(hass, monkeypatch, make_hub):
+    subscriptions.clear()
+    subscribe = mqtt.async_subscribe
+
+    async def _failing(*args, **kwargs):
+        raise HomeAssistantError("not connected")
+    monkeypatch.setattr(mqtt, "async_subscribe", _failing)
+
+    hub = make_hub(sensor_id="id0", entry_id="entry0")
+    router = hass.data[DATA_ROUTERS][f"{DEFAULT_PREFIX}/+/+"]
+    assert router._subscribed is False
+    monkeypatch.setattr(mqtt, "async_subscribe", subscribe)
+    hass.loop.advance(SUBSCRIBE_RETRY_SECONDS)
+    assert list(subscriptions) == [f"{DEFAULT_PREFIX}/+/+"]
+    assert router._subscribed is True
+
+    # No retry is left behind once the last hub is gone
+    asyncio.run(hub.async_unload())
+    monkeypatch.setattr(mqtt, "async_subscribe", _failing)
+    hub = make_hub(sensor_id="id1", entry_id="entry1")
+    asyncio.run(hub.async_unload())
+    monkeypatch.setattr(mqtt, "async_subscribe", subscribe)
+    hass.loop.advance(SUBSCRIBE_RETRY_SECONDS)
+    assert subscriptions == {}
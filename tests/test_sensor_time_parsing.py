@@ -1,7 +1,10 @@
 from datetime import datetime, timezone, timedelta
 
+import pytest
+
 from custom_components.ha_mqtt_sensors.sensor import LastSeenSensor
 from custom_components.ha_mqtt_sensors.const import TOPIC_TIME
+from custom_components.ha_mqtt_sensors.util import parse_datetime_utc
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.util import dt as dt_util
@@ -16,14 +19,14 @@ def _make_sensor(hass, hub):
 
 def test_iso_format_parsed(hass, stub_hub):
     hub = stub_hub
-    hub.states[TOPIC_TIME] = "2023-03-10T12:34:56+00:00"
+    hub.record.set(TOPIC_TIME, "2023-03-10T12:34:56+00:00")
     sensor = _make_sensor(hass, hub)
     assert sensor.native_value == datetime(2023, 3, 10, 12, 34, 56, tzinfo=timezone.utc)
 
 
 def test_manual_strptime_fallback(hass, stub_hub):
     hub = stub_hub
-    hub.states[TOPIC_TIME] = "2023-03-10 12:34:56"
+    hub.record.set(TOPIC_TIME, "2023-03-10 12:34:56")
     sensor = _make_sensor(hass, hub)
     assert sensor.native_value == datetime(2023, 3, 10, 12, 34, 56, tzinfo=timezone.utc)
 
@@ -31,7 +34,7 @@ def test_manual_strptime_fallback(hass, stub_hub):
 def test_dst_nonexistent_time_returns_none(hass, stub_hub):
     hass.config.time_zone = "America/New_York"
     hub = stub_hub
-    hub.states[TOPIC_TIME] = "2023-03-12 02:30:00"
+    hub.record.set(TOPIC_TIME, "2023-03-12 02:30:00")
     sensor = _make_sensor(hass, hub)
     assert sensor.native_value is None
 
@@ -39,7 +42,7 @@ def test_dst_nonexistent_time_returns_none(hass, stub_hub):
 def test_future_timestamp_returns_now(hass, stub_hub):
     hub = stub_hub
     future = dt_util.utcnow() + timedelta(hours=1)
-    hub.states[TOPIC_TIME] = future.isoformat()
+    hub.record.set(TOPIC_TIME, future.isoformat())
     sensor = _make_sensor(hass, hub)
     value = sensor.native_value
     assert value <= dt_util.as_utc(dt_util.utcnow())
@@ -47,7 +50,37 @@ def test_future_timestamp_returns_now(hass, stub_hub):
 
 def test_zoneinfo_timezone_parsed(hass, stub_hub, monkeypatch):
     hub = stub_hub
-    hub.states[TOPIC_TIME] = "2023-03-10 12:34:56"
+    hub.record.set(TOPIC_TIME, "2023-03-10 12:34:56")
     monkeypatch.setattr(dt_util, "get_time_zone", lambda name: timezone.utc)
     sensor = _make_sensor(hass, hub)
     assert sensor.native_value == datetime(2023, 3, 10, 12, 34, 56, tzinfo=timezone.utc)
+
+
+def test_parsed_time_is_memoized(hass, stub_hub, monkeypatch):
+    hub = stub_hub
+    sensor = _make_sensor(hass, hub)
+    calls = []
+    real_get_time_zone = dt_util.get_time_zone
+    monkeypatch.setattr(
+        dt_util, "get_time_zone", lambda name: calls.append(name) or real_get_time_zone(name)
+    )
+
+    hub.record.set(TOPIC_TIME, "2023-03-10 12:34:56")
+    first = sensor.native_value
+    assert sensor.native_value is first
+    hub.record.set(TOPIC_TIME, "2023-03-10 12:35:56")
+    assert sensor.native_value == first + timedelta(minutes=1)
+    # The time zone is resolved once for both timestamps
+    assert calls == ["UTC"]
+
+
+def test_fast_path_rejects_malformed_fixed_width(hass):
+    assert parse_datetime_utc(hass, "2023-13-10 12:34:56") is None
+    assert parse_datetime_utc(hass, "2023/03/10 12:34:56") is None
+
+
+def test_iso_offset_is_converted_without_time_zone(hass, monkeypatch):
+    monkeypatch.setattr(dt_util, "get_time_zone", lambda name: pytest.fail("time zone resolved"))
+    assert parse_datetime_utc(hass, "2025-08-15T21:10:15-04:00") == datetime(
+        2025, 8, 16, 1, 10, 15, tzinfo=timezone.utc
+    )
@@ -0,0 +1,117 @@
+import asyncio
+
+from custom_components.ha_mqtt_sensors import async_remove_entry
+from custom_components.ha_mqtt_sensors.binary_sensor import ContactEntity
+from custom_components.ha_mqtt_sensors.const import (
+    DEFAULT_PREFIX,
+    PACKET_QUIET_SECONDS,
+    SNAPSHOT_STORAGE_KEY,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import storage
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.mqtt import subscriptions, status_callbacks
+
+
+def _restart():
+    """A fresh Home Assistant instance sharing the storage written so far."""
+    subscriptions.clear()
+    return HomeAssistant()
+
+
+def test_snapshot_warm_start(hass, make_hub, send_burst, sensor_id):
+    hub = make_hub()
+    make_hub(sensor_id="other", entry_id="entry2")
+    send_burst(subscriptions[f"{DEFAULT_PREFIX}/+/+"])
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert SNAPSHOT_STORAGE_KEY in storage.pending
+    storage.flush()
+    assert set(storage.saved[SNAPSHOT_STORAGE_KEY]["sensors"]) == {
+        f"{DEFAULT_PREFIX}_{sensor_id}", f"{DEFAULT_PREFIX}_other"
+    }
+
+    hass2 = _restart()
+    reads = storage.reads
+    warm = make_hub(hass=hass2)
+    make_hub(sensor_id="other", entry_id="entry2", hass=hass2)
+    assert storage.reads == reads + 1
+
+    for name in ("time", "event", "channel", "contact_open", "battery_ok", "rssi", "mic"):
+        assert getattr(warm.record, name) == getattr(hub.record, name)
+    assert warm.record.event_flags == hub.record.event_flags
+    assert warm.record.state_open is True
+    assert warm.event_seen is True
+    assert warm.last_seen_utc == hub.last_seen_utc
+
+
+def test_retained_flood_is_deduplicated_against_snapshot(
+    hass, make_hub, add_entity, counting, send_burst, burst
+):
+    make_hub()
+    send_burst(subscriptions[f"{DEFAULT_PREFIX}/+/+"])
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    storage.flush()
+
+    hass2 = _restart()
+    hub = make_hub(hass=hass2)
+    contact = counting(add_entity(
+        ContactEntity(hub, hub.entry, DeviceInfo(), "Door", BinarySensorDeviceClass.DOOR), hass=hass2
+    ))
+    last_seen = hub.last_seen_utc
+
+    # The broker replays the retained fields once MQTT connects
+    hass2.loop.advance(30)
+    send_burst(subscriptions[f"{DEFAULT_PREFIX}/+/+"])
+    hass2.loop.advance(PACKET_QUIET_SECONDS)
+    assert (hub.packets_accepted, hub.packets_replayed) == (0, 1)
+    assert hub.last_seen_utc == last_seen
+    assert contact.writes == 0
+
+    # A new transmission with the same content is still a packet
+    send_burst(
+        subscriptions[f"{DEFAULT_PREFIX}/+/+"],
+        [("time", "2025-08-16 01:20:15")] + burst[1:],
+    )
+    hass2.loop.advance(PACKET_QUIET_SECONDS)
+    assert hub.packets_accepted == 1
+    assert hub.last_seen_utc > last_seen
+
+
+def test_same_second_retransmissions_are_suppressed_not_replayed(hass, make_hub, send_burst):
+    hub = make_hub()
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+    # rtl_433 stamps every repeat of a transmission with the same second
+    for _ in range(3):
+        send_burst(callback)
+        hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert (hub.packets_accepted, hub.packets_suppressed, hub.packets_replayed) == (1, 2, 0)
+
+
+def test_reconnect_replay_is_not_a_retransmission(hass, make_hub, send_burst):
+    hub = make_hub()
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+    send_burst(callback)
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    last_seen = hub.last_seen_utc
+
+    # MQTT reconnects within the window and the broker resends the retained fields
+    for status in status_callbacks:
+        status(True)
+    send_burst(callback)
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert (hub.packets_accepted, hub.packets_suppressed, hub.packets_replayed) == (1, 0, 1)
+    assert hub.last_seen_utc == last_seen
+
+
+def test_unload_keeps_snapshot_and_remove_entry_drops_it(hass, make_hub, sensor_id):
+    hub = make_hub()
+    hub.record.set("rssi", "-40")
+    asyncio.run(hub.async_unload())
+    storage.flush()
+    saved = storage.saved[SNAPSHOT_STORAGE_KEY]["sensors"]
+    assert saved[f"{DEFAULT_PREFIX}_{sensor_id}"]["fields"]["rssi"] == -40
+
+    asyncio.run(async_remove_entry(hass, hub.entry))
+    storage.flush()
+    assert storage.saved[SNAPSHOT_STORAGE_KEY]["sensors"] == {}
@@ -0,0 +1,68 @@
+from statistics import mean, pstdev
+
+import pytest
+
+from custom_components.ha_mqtt_sensors.sensor import LinkStatSensor, _LINK_STATS
+from custom_components.ha_mqtt_sensors.stats import LinkStats, RingStats
+from custom_components.ha_mqtt_sensors.const import (
+    DEFAULT_PREFIX,
+    PACKET_QUIET_SECONDS,
+    STATS_PUSH_SECONDS,
+)
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.components.mqtt import subscriptions
+
+
+def test_ring_keeps_last_capacity_values():
+    ring = RingStats(4)
+    assert (ring.mean, ring.stddev, ring.percentile(10)) == (None, None, None)
+    values = [-40.0, -50.0, -45.0, -60.0, -41.0, -70.0, -55.0]
+    for value in values:
+        ring.push(value)
+    window = values[-4:]
+    assert ring.count == 4
+    assert ring.mean == pytest.approx(mean(window))
+    assert ring.stddev == pytest.approx(pstdev(window))
+    assert ring.percentile(10) == -70.0
+    assert ring.percentile(50) == -60.0
+
+
+def test_ring_sums_do_not_drift():
+    ring = RingStats(8)
+    for i in range(10_000):
+        ring.push(1e9 if i < 8 else 0.1 * (i % 8))
+    assert ring.mean == pytest.approx(0.35)
+    assert ring.stddev == pytest.approx(pstdev([0.1 * i for i in range(8)]))
+
+
+def test_packet_rate_and_heartbeat_loss():
+    stats = LinkStats(heartbeat_interval=3600)
+    assert (stats.packets_per_hour, stats.packet_loss) == (None, None)
+    # Heartbeats at 0 h, 1 h, 3 h (one missed) and 4 h, plus an event in between
+    for now, heartbeat in ((0, True), (1800, False), (3600, True), (10800, True), (14400, True)):
+        stats.add_packet(now, -50, heartbeat)
+    assert stats.packets_per_hour == pytest.approx(4 * 3600 / 14400)
+    assert stats.packet_loss == pytest.approx(25.0)
+
+
+def test_stat_sensors_update_on_throttled_signal(
+    hass, make_hub, add_entity, counting, send_burst, burst
+):
+    hub = make_hub()
+    label, *stat = _LINK_STATS[0]
+    rssi_mean = counting(add_entity(LinkStatSensor(hub, hub.entry, DeviceInfo(), label, *stat)))
+    assert rssi_mean.native_value is None
+
+    callback = subscriptions[f"{DEFAULT_PREFIX}/+/+"]
+    for i, rssi in enumerate(("-42", "-50", "-46")):
+        send_burst(callback, [("time", f"2025-08-16 01:1{i}:15")] + burst[1:-1] + [("rssi", rssi)])
+        hass.loop.advance(PACKET_QUIET_SECONDS + 10)
+    assert hub.packets_accepted == 3
+    assert rssi_mean.writes == 1
+    assert rssi_mean.native_value == -46.0
+
+    hass.loop.advance(STATS_PUSH_SECONDS)
+    send_burst(callback, [("time", "2025-08-16 01:20:15"), ("rssi", "-30")])
+    hass.loop.advance(PACKET_QUIET_SECONDS)
+    assert rssi_mean.writes == 2
+    assert rssi_mean.native_value == -42.0
@@ -0,0 +1,89 @@
+import asyncio
+
+from custom_components.ha_mqtt_sensors import MqttHub, config_flow
+from custom_components.ha_mqtt_sensors.policy import WritePolicy
+from custom_components.ha_mqtt_sensors.sensor import IntTopicSensor, SignalStrengthSensor
+from custom_components.ha_mqtt_sensors.const import (
+    CONF_SENSOR_ID,
+    CONF_NAME,
+    CONF_PREFIX,
+    DEFAULT_PREFIX,
+    CONF_RSSI_DEADBAND,
+    CONF_RSSI_AGGREGATE,
+    AGGREGATE_MEAN,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.components.mqtt import subscriptions
+
+SENSOR_ID = "abc123"
+
+
+class Msg:
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = payload
+
+
+def _setup(hass, entity_cls, suffix, policy=None):
+    entry = ConfigEntry(
+        data={CONF_SENSOR_ID: SENSOR_ID, CONF_NAME: "Test", CONF_PREFIX: DEFAULT_PREFIX},
+        options={},
+        entry_id="entry1",
+    )
+    hub = MqttHub(hass, entry)
+    asyncio.run(hub.async_setup())
+    entity = entity_cls(hub, entry, DeviceInfo(), "Test", suffix, policy)
+    entity.hass = hass
+    entity.writes = []
+    entity.async_write_ha_state = lambda: entity.writes.append(entity.native_value)
+    asyncio.run(entity.async_added_to_hass())
+
+    def send(payload, wait=5):
+        subscriptions[f"{DEFAULT_PREFIX}/+/+"](Msg(f"{DEFAULT_PREFIX}/{SENSOR_ID}/{suffix}", payload))
+        hass.loop.advance(wait)
+
+    return entity, send
+
+
+def test_rssi_defaults_to_deadband(hass):
+    entity, send = _setup(hass, SignalStrengthSensor, "rssi")
+    for rssi in ("-42", "-43", "-44", "-40", "-46", "-45"):
+        send(rssi)
+    assert entity.writes == [-42, -46]
+    assert entity.native_value == -46
+
+
+def test_min_interval_writes_latest_value_when_it_expires(hass):
+    entity, send = _setup(hass, IntTopicSensor, "heartbeat", WritePolicy(min_interval=60))
+    send("1", wait=1)
+    send("0", wait=1)
+    send("1", wait=1)
+    send("0", wait=1)
+    assert entity.writes == [1]
+
+    hass.loop.advance(60)
+    assert entity.writes == [1, 0]
+
+
+def test_windowed_mean(hass):
+    policy = WritePolicy(deadband=2, aggregate=AGGREGATE_MEAN, window=30)
+    entity, send = _setup(hass, SignalStrengthSensor, "rssi", policy)
+    for rssi in ("-40", "-44", "-45"):
+        send(rssi, wait=5)
+    assert entity.writes == []
+
+    hass.loop.advance(30)
+    assert entity.writes == [-43.0]
+
+    # A window whose mean stays inside the deadband is not written
+    send("-43", wait=31)
+    send("-42", wait=31)
+    assert entity.writes == [-43.0]
+
+
+def test_options_flow_offers_write_policy():
+    handler = config_flow.OptionsFlowHandler(ConfigEntry(data={}, options={}))
+    result = asyncio.run(handler.async_step_init())
+    assert CONF_RSSI_DEADBAND in result["data_schema"].schema
+    assert CONF_RSSI_AGGREGATE in result["data_schema"].schema